@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Command Line - Chainage of a vector file without QGIS Desktop.
+
+Usage: python -m qchainage INPUT OUTPUT --distance 100 [options]
+
+Starts a QgsApplication without GUI, reads the line layer from INPUT and
+streams the chainage points to OUTPUT (.gpkg, .fgb or .shp). Exits with a
+non-zero status on failure. Set QGIS_PREFIX_PATH to the QGIS installation
+prefix if it is not /usr.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import argparse
+import os
+import sys
+
+# QgsUnitTypes members for the --units choices. QGIS is only imported in
+# main(): worker processes of the parallel mode re-import this module.
+UNIT_CHOICES = {
+    'meters': 'DistanceMeters',
+    'kilometers': 'DistanceKilometers',
+    'feet': 'DistanceFeet',
+    'nautical-miles': 'DistanceNauticalMiles',
+    'yards': 'DistanceYards',
+    'miles': 'DistanceMiles',
+    'degrees': 'DistanceDegrees',
+    'centimeters': 'DistanceCentimeters',
+    'millimeters': 'DistanceMillimeters',
+}
+
+
+def parse_args(argv=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(
+        prog='python -m qchainage',
+        description='Create points at specified intervals along line features.'
+    )
+    parser.add_argument('input', help='input vector file (or any OGR data source)')
+    parser.add_argument('output', help='output file (.gpkg, .fgb or .shp)')
+    parser.add_argument('--layer', help='layer name inside the input data source')
+    parser.add_argument('--output-layer', help='name of the output layer '
+                        '(default: chain_<input layer name>)')
+    parser.add_argument('--distance', type=float, default=0.0,
+                        help='interval distance between points')
+    parser.add_argument('--start', type=float, default=0.0,
+                        help='starting distance along each line')
+    parser.add_argument('--end', type=float, default=0.0,
+                        help='ending distance along each line (0 = end of line)')
+    parser.add_argument('--divide', type=int, default=0,
+                        help='divide each line into N equal parts')
+    parser.add_argument('--force-last', action='store_true',
+                        help='always add a point at the end')
+    parser.add_argument('--force-first-last', action='store_true',
+                        help='only create start and end points')
+    parser.add_argument('--reverse', action='store_true',
+                        help='reverse the chainage direction (start from end)')
+    parser.add_argument('--cartesian', action='store_true',
+                        help='use planar instead of ellipsoidal distances')
+    parser.add_argument('--ellipsoid', default='WGS84',
+                        help='ellipsoid for ellipsoidal distances (default: WGS84)')
+    parser.add_argument('--units', choices=sorted(UNIT_CHOICES),
+                        help='units of the distances (default: layer units)')
+    parser.add_argument('--attributes', nargs='+', default=[], metavar='NAME',
+                        help='attributes copied from the source features')
+    parser.add_argument('--where', help='QGIS expression selecting the source features')
+    parser.add_argument('--extent', nargs=4, type=float,
+                        metavar=('XMIN', 'YMIN', 'XMAX', 'YMAX'),
+                        help='only create points inside this extent (layer CRS)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='number of worker processes (default: 1)')
+    parser.add_argument('--chunk-size', type=int, default=None,
+                        help='number of points written to the output at once')
+    parser.add_argument('--stats-json', metavar='PATH',
+                        help='write the run statistics (counters, timings) as JSON')
+
+    args = parser.parse_args(argv)
+    if args.distance <= 0 and not args.force_first_last and args.divide == 0:
+        parser.error('--distance must be greater than zero unless --divide or '
+                     '--force-first-last is used')
+    return args
+
+
+def run(args):
+    """Run the chainage described by args; QGIS must be initialized."""
+    from qgis.core import QgsRectangle, QgsUnitTypes, QgsVectorLayer, QgsWkbTypes
+    from .chainagetool import (
+        DEFAULT_CHUNK_SIZE,
+        ChainageContext,
+        iter_chainage_stations,
+        source_feature_request,
+        write_chainage_file,
+    )
+
+    uri = f"{args.input}|layername={args.layer}" if args.layer else args.input
+    name = args.layer or os.path.splitext(os.path.basename(args.input))[0]
+    layer = QgsVectorLayer(uri, name, 'ogr')
+    if not layer.isValid():
+        raise ValueError(f"Cannot open input layer: {uri}")
+    if layer.geometryType() != QgsWkbTypes.LineGeometry:
+        raise ValueError(f"Input layer has no line geometries: {uri}")
+
+    distance_units = (getattr(QgsUnitTypes, UNIT_CHOICES[args.units])
+                      if args.units else None)
+    clip = QgsRectangle(*args.extent) if args.extent else None
+    context = ChainageContext(layer.crs(), layer.fields(), not args.cartesian,
+                              distance_units, args.attributes, args.ellipsoid, clip=clip)
+    request, feature_count = source_feature_request(layer, False, args.attributes,
+                                                    args.where, context.clip)
+
+    written = write_chainage_file(
+        iter_chainage_stations(
+            layer.getFeatures(request), layer.crs(),
+            args.start, args.end, args.distance,
+            args.force_last, args.force_first_last, args.divide,
+            reverse=args.reverse, feature_count=feature_count,
+            workers=args.workers, context=context
+        ),
+        args.output, args.output_layer or f"chain_{layer.name()}",
+        context, args.chunk_size or DEFAULT_CHUNK_SIZE
+    )
+    if args.stats_json:
+        context.result.to_json(args.stats_json)
+    print(f"{written} points written to {args.output}")
+
+
+def main(argv=None):
+    """Command line entry point, returns the process exit status."""
+    args = parse_args(argv)
+
+    from qgis.core import QgsApplication
+    # Outside the QGIS launcher the providers are only found via the prefix
+    QgsApplication.setPrefixPath(os.environ.get('QGIS_PREFIX_PATH', '/usr'), True)
+    qgs = QgsApplication([], False)
+    qgs.initQgis()
+    try:
+        run(args)
+    except Exception as e:
+        print(f"qchainage: error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        qgs.exitQgis()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
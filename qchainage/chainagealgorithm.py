@@ -0,0 +1,438 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Processing Algorithm - Chainage without the dialog, for batch
+processing, models and qgis_process.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+from qgis.PyQt.QtCore import QCoreApplication
+from qgis.core import (
+    QgsCoordinateTransform,
+    QgsFeatureRequest,
+    QgsFeatureSink,
+    QgsProcessing,
+    QgsProcessingAlgorithm,
+    QgsProcessingException,
+    QgsProcessingParameterBoolean,
+    QgsProcessingParameterDefinition,
+    QgsProcessingParameterEnum,
+    QgsProcessingParameterFeatureSink,
+    QgsProcessingParameterFeatureSource,
+    QgsProcessingParameterField,
+    QgsProcessingParameterNumber,
+    QgsUnitTypes,
+    QgsWkbTypes,
+)
+
+try:
+    from .chainagetool import (
+        DEFAULT_BATCH_SIZE,
+        ChainageContext,
+        SegmentIndex,
+        iter_chainage_features,
+        locate_events,
+        locate_fields,
+        locate_points,
+        source_feature_request,
+    )
+except ImportError:
+    # Loaded as a top-level module (e.g. from the test suite)
+    from chainagetool import (
+        DEFAULT_BATCH_SIZE,
+        ChainageContext,
+        SegmentIndex,
+        iter_chainage_features,
+        locate_events,
+        locate_fields,
+        locate_points,
+        source_feature_request,
+    )
+
+# Distance units offered by the algorithm; None stands for the layer units
+DISTANCE_UNITS = [
+    None,
+    QgsUnitTypes.DistanceMeters,
+    QgsUnitTypes.DistanceKilometers,
+    QgsUnitTypes.DistanceFeet,
+    QgsUnitTypes.DistanceNauticalMiles,
+    QgsUnitTypes.DistanceYards,
+    QgsUnitTypes.DistanceMiles,
+    QgsUnitTypes.DistanceDegrees,
+    QgsUnitTypes.DistanceCentimeters,
+    QgsUnitTypes.DistanceMillimeters,
+]
+
+
+class QChainageAlgorithm(QgsProcessingAlgorithm):
+    """Create points at specified intervals along line features."""
+
+    INPUT = 'INPUT'
+    DISTANCE = 'DISTANCE'
+    UNITS = 'UNITS'
+    START = 'START'
+    END = 'END'
+    DIVIDE = 'DIVIDE'
+    FORCE_LAST = 'FORCE_LAST'
+    FORCE_FIRST_LAST = 'FORCE_FIRST_LAST'
+    REVERSE = 'REVERSE'
+    ELLIPSOIDAL = 'ELLIPSOIDAL'
+    COPY_ATTRIBUTES = 'COPY_ATTRIBUTES'
+    WORKERS = 'WORKERS'
+    OUTPUT = 'OUTPUT'
+
+    def tr(self, string):
+        return QCoreApplication.translate('QChainageAlgorithm', string)
+
+    def createInstance(self):
+        return QChainageAlgorithm()
+
+    def name(self):
+        return 'chainage'
+
+    def displayName(self):
+        return self.tr('Chainage (points along lines)')
+
+    def shortHelpString(self):
+        return self.tr(
+            "Creates points at a fixed interval along line features, between an "
+            "optional start and end distance, or divides every line into a number "
+            "of equal parts. Each point stores its chainage (distance from the start "
+            "of the line, or from its end for reverse chainage) and optionally "
+            "attributes of its source line.\n\n"
+            "Distances are given in the selected units. With ellipsoidal distances "
+            "the line lengths are measured on the ellipsoid of the processing context."
+        )
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Input line layer'),
+            [QgsProcessing.TypeVectorLine]
+        ))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.DISTANCE, self.tr('Interval distance'),
+            QgsProcessingParameterNumber.Double, 100.0, minValue=0.0
+        ))
+        self.addParameter(QgsProcessingParameterEnum(
+            self.UNITS, self.tr('Distance units'),
+            [self.tr('Layer units') if unit is None else QgsUnitTypes.toString(unit)
+             for unit in DISTANCE_UNITS],
+            defaultValue=0
+        ))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.START, self.tr('Start distance'),
+            QgsProcessingParameterNumber.Double, 0.0, minValue=0.0
+        ))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.END, self.tr('End distance (0 = end of line)'),
+            QgsProcessingParameterNumber.Double, 0.0, minValue=0.0
+        ))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.DIVIDE, self.tr('Divide into equal parts (0 = use interval)'),
+            QgsProcessingParameterNumber.Integer, 0, minValue=0
+        ))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.FORCE_LAST, self.tr('Force last point'), False
+        ))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.FORCE_FIRST_LAST, self.tr('Only first and last point'), False
+        ))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.REVERSE, self.tr('Reverse chainage direction'), False
+        ))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.ELLIPSOIDAL, self.tr('Use ellipsoidal distances'), True
+        ))
+        self.addParameter(QgsProcessingParameterField(
+            self.COPY_ATTRIBUTES, self.tr('Attributes to copy'),
+            parentLayerParameterName=self.INPUT, allowMultiple=True, optional=True
+        ))
+
+        workers = QgsProcessingParameterNumber(
+            self.WORKERS, self.tr('Worker processes'),
+            QgsProcessingParameterNumber.Integer, 1, minValue=1
+        )
+        workers.setFlags(workers.flags() | QgsProcessingParameterDefinition.FlagAdvanced)
+        self.addParameter(workers)
+
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Chainage'), QgsProcessing.TypeVectorPoint
+        ))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        source = self.parameterAsSource(parameters, self.INPUT, context)
+        if source is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+
+        distance = self.parameterAsDouble(parameters, self.DISTANCE, context)
+        divide = self.parameterAsInt(parameters, self.DIVIDE, context)
+        force_first_last = self.parameterAsBool(parameters, self.FORCE_FIRST_LAST, context)
+        if distance <= 0 and not force_first_last and divide == 0:
+            raise QgsProcessingException(
+                self.tr('Distance must be greater than zero unless dividing or '
+                        'creating only first and last points.')
+            )
+
+        crs = source.sourceCrs()
+        distance_units = DISTANCE_UNITS[self.parameterAsEnum(parameters, self.UNITS, context)]
+        copy_attributes = self.parameterAsFields(parameters, self.COPY_ATTRIBUTES, context)
+
+        # Resolve units, ellipsoid and output fields once for the whole run
+        chainage_context = ChainageContext(
+            crs, source.fields(),
+            self.parameterAsBool(parameters, self.ELLIPSOIDAL, context),
+            distance_units, copy_attributes,
+            context.ellipsoid(), context.transformContext()
+        )
+
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, chainage_context.fields,
+            QgsWkbTypes.Point, crs
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        request, feature_count = source_feature_request(source, False, copy_attributes)
+        for point_features in iter_chainage_features(
+                source.getFeatures(request), crs,
+                self.parameterAsDouble(parameters, self.START, context),
+                self.parameterAsDouble(parameters, self.END, context),
+                distance,
+                self.parameterAsBool(parameters, self.FORCE_LAST, context),
+                force_first_last, divide,
+                reverse=self.parameterAsBool(parameters, self.REVERSE, context),
+                feedback=feedback, feature_count=feature_count,
+                workers=self.parameterAsInt(parameters, self.WORKERS, context),
+                batch_size=DEFAULT_BATCH_SIZE, context=chainage_context):
+            sink.addFeatures(point_features, QgsFeatureSink.FastInsert)
+
+        return {self.OUTPUT: dest_id}
+
+
+class QChainageLocateAlgorithm(QgsProcessingAlgorithm):
+    """Locate points along line features: route id, chainage and offset."""
+
+    INPUT = 'INPUT'
+    LINES = 'LINES'
+    ROUTE_FIELD = 'ROUTE_FIELD'
+    MAX_DISTANCE = 'MAX_DISTANCE'
+    REVERSE = 'REVERSE'
+    OUTPUT = 'OUTPUT'
+
+    def tr(self, string):
+        return QCoreApplication.translate('QChainageLocateAlgorithm', string)
+
+    def createInstance(self):
+        return QChainageLocateAlgorithm()
+
+    def name(self):
+        return 'locate'
+
+    def displayName(self):
+        return self.tr('Locate points along lines (chainage and offset)')
+
+    def shortHelpString(self):
+        return self.tr(
+            "Projects every point onto the nearest line and adds the route id "
+            "(a line attribute or the line feature id), the chainage along that "
+            "line and the signed offset from it, positive to the right of the "
+            "chainage direction.\n\n"
+            "Chainage and offset are planar distances in the units of the line "
+            "layer. Points farther than the maximum distance from every line get "
+            "empty values. The line segments are held in a spatial index, so "
+            "large point layers are located in a single streaming pass."
+        )
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Input point layer'),
+            [QgsProcessing.TypeVectorPoint]
+        ))
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.LINES, self.tr('Line layer'),
+            [QgsProcessing.TypeVectorLine]
+        ))
+        self.addParameter(QgsProcessingParameterField(
+            self.ROUTE_FIELD, self.tr('Route id field (empty = feature id)'),
+            parentLayerParameterName=self.LINES, optional=True
+        ))
+        self.addParameter(QgsProcessingParameterNumber(
+            self.MAX_DISTANCE, self.tr('Maximum distance (0 = no limit)'),
+            QgsProcessingParameterNumber.Double, 0.0, minValue=0.0
+        ))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.REVERSE, self.tr('Reverse chainage direction'), False
+        ))
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Located points'), QgsProcessing.TypeVectorPoint
+        ))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        points = self.parameterAsSource(parameters, self.INPUT, context)
+        if points is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+        lines = self.parameterAsSource(parameters, self.LINES, context)
+        if lines is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.LINES))
+
+        route_field = self.parameterAsString(parameters, self.ROUTE_FIELD, context) or None
+        line_request = QgsFeatureRequest()
+        line_request.setSubsetOfAttributes([route_field] if route_field else [],
+                                           lines.fields())
+
+        feedback.pushInfo(self.tr('Indexing line segments'))
+        segment_index = SegmentIndex(lines.getFeatures(line_request), route_field, feedback)
+        if feedback.isCanceled():
+            return {}
+
+        fields = locate_fields(points.fields(), lines.fields(), route_field,
+                               lines.sourceCrs().mapUnits())
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, fields, points.wkbType(), points.sourceCrs()
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        transform = None
+        if points.sourceCrs() != lines.sourceCrs():
+            transform = QgsCoordinateTransform(points.sourceCrs(), lines.sourceCrs(),
+                                               context.transformContext())
+
+        counts = locate_points(
+            points.getFeatures(), segment_index, fields, sink,
+            self.parameterAsDouble(parameters, self.MAX_DISTANCE, context),
+            self.parameterAsBool(parameters, self.REVERSE, context),
+            transform, feedback, points.featureCount()
+        )
+        if counts is not None:
+            feedback.pushInfo(self.tr('{} points located, {} without a line in reach')
+                              .format(*counts))
+        return {self.OUTPUT: dest_id}
+
+
+class QChainageEventsAlgorithm(QgsProcessingAlgorithm):
+    """Place events of a table along line features by route id and chainage."""
+
+    INPUT = 'INPUT'
+    ROUTE_FIELD = 'ROUTE_FIELD'
+    MEASURE_FIELD = 'MEASURE_FIELD'
+    LINES = 'LINES'
+    LINE_ROUTE_FIELD = 'LINE_ROUTE_FIELD'
+    UNITS = 'UNITS'
+    REVERSE = 'REVERSE'
+    ELLIPSOIDAL = 'ELLIPSOIDAL'
+    OUTPUT = 'OUTPUT'
+
+    def tr(self, string):
+        return QCoreApplication.translate('QChainageEventsAlgorithm', string)
+
+    def createInstance(self):
+        return QChainageEventsAlgorithm()
+
+    def name(self):
+        return 'events'
+
+    def displayName(self):
+        return self.tr('Place events along lines (dynamic segmentation)')
+
+    def shortHelpString(self):
+        return self.tr(
+            "Creates a point for every row of an event table (route id and "
+            "chainage, no geometry needed) on the line with the same route id "
+            "(a line attribute or the line feature id). The events keep all their "
+            "attributes.\n\n"
+            "Chainage is given in the selected units and measured like in the "
+            "chainage algorithm. Events are grouped per route and sorted once, so "
+            "every line is walked a single time. Events without a matching line "
+            "or beyond its end are written without a geometry."
+        )
+
+    def initAlgorithm(self, config=None):
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.INPUT, self.tr('Event table'),
+            [QgsProcessing.TypeVector]
+        ))
+        self.addParameter(QgsProcessingParameterField(
+            self.ROUTE_FIELD, self.tr('Route id field'),
+            parentLayerParameterName=self.INPUT
+        ))
+        self.addParameter(QgsProcessingParameterField(
+            self.MEASURE_FIELD, self.tr('Chainage field'),
+            parentLayerParameterName=self.INPUT,
+            type=QgsProcessingParameterField.Numeric
+        ))
+        self.addParameter(QgsProcessingParameterFeatureSource(
+            self.LINES, self.tr('Line layer'),
+            [QgsProcessing.TypeVectorLine]
+        ))
+        self.addParameter(QgsProcessingParameterField(
+            self.LINE_ROUTE_FIELD, self.tr('Line route id field (empty = feature id)'),
+            parentLayerParameterName=self.LINES, optional=True
+        ))
+        self.addParameter(QgsProcessingParameterEnum(
+            self.UNITS, self.tr('Chainage units'),
+            [self.tr('Layer units') if unit is None else QgsUnitTypes.toString(unit)
+             for unit in DISTANCE_UNITS],
+            defaultValue=0
+        ))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.REVERSE, self.tr('Reverse chainage direction'), False
+        ))
+        self.addParameter(QgsProcessingParameterBoolean(
+            self.ELLIPSOIDAL, self.tr('Use ellipsoidal distances'), True
+        ))
+        self.addParameter(QgsProcessingParameterFeatureSink(
+            self.OUTPUT, self.tr('Events'), QgsProcessing.TypeVectorPoint
+        ))
+
+    def processAlgorithm(self, parameters, context, feedback):
+        events = self.parameterAsSource(parameters, self.INPUT, context)
+        if events is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.INPUT))
+        lines = self.parameterAsSource(parameters, self.LINES, context)
+        if lines is None:
+            raise QgsProcessingException(self.invalidSourceError(parameters, self.LINES))
+
+        route_field = self.parameterAsString(parameters, self.ROUTE_FIELD, context)
+        measure_field = self.parameterAsString(parameters, self.MEASURE_FIELD, context)
+        for name in (route_field, measure_field):
+            if events.fields().indexFromName(name) < 0:
+                raise QgsProcessingException(
+                    self.tr('The event table has no field "{}".').format(name)
+                )
+
+        crs = lines.sourceCrs()
+        chainage_context = ChainageContext(
+            crs, None,
+            self.parameterAsBool(parameters, self.ELLIPSOIDAL, context),
+            DISTANCE_UNITS[self.parameterAsEnum(parameters, self.UNITS, context)],
+            None, context.ellipsoid(), context.transformContext()
+        )
+
+        sink, dest_id = self.parameterAsSink(
+            parameters, self.OUTPUT, context, events.fields(), QgsWkbTypes.Point, crs
+        )
+        if sink is None:
+            raise QgsProcessingException(self.invalidSinkError(parameters, self.OUTPUT))
+
+        # Events are joined on attributes only
+        event_request = QgsFeatureRequest()
+        event_request.setFlags(QgsFeatureRequest.NoGeometry)
+        line_route_field = self.parameterAsString(parameters, self.LINE_ROUTE_FIELD,
+                                                  context) or None
+        line_request = QgsFeatureRequest()
+        line_request.setSubsetOfAttributes([line_route_field] if line_route_field else [],
+                                           lines.fields())
+
+        counts = locate_events(
+            events.getFeatures(event_request), lines.getFeatures(line_request),
+            route_field, measure_field, chainage_context, events.fields(), sink,
+            line_route_field,
+            self.parameterAsBool(parameters, self.REVERSE, context),
+            feedback=feedback, feature_count=events.featureCount()
+        )
+        if counts is not None:
+            feedback.pushInfo(self.tr('{} events placed, {} without a route or beyond its end')
+                              .format(*counts))
+        return {self.OUTPUT: dest_id}
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Cache - Result caches for incremental and on-the-fly chainage.
+
+This module does not depend on QGIS.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import hashlib
+import math
+from array import array
+from collections import OrderedDict
+
+# Tiles per side of a requested extent (see tile_level)
+TILES_PER_EXTENT = 4
+
+# Stations of one source feature are numbered in the low bits of their id;
+# the source feature id takes the remaining bits of a 64 bit feature id
+STATION_ID_BITS = 32
+SOURCE_ID_BITS = 63 - STATION_ID_BITS
+
+
+def feature_key(wkb, attributes=()):
+    """Return the cache key of a source feature.
+
+    A 16 byte BLAKE2 digest of its geometry WKB and the values of its copied
+    attributes, so editing either makes the feature's stations stale.
+    """
+    digest = hashlib.blake2b(bytes(wkb), digest_size=16)
+    if attributes:
+        digest.update(repr(list(attributes)).encode('utf-8'))
+    return digest.digest()
+
+
+class ChainageCache:
+    """Cache of an incremental chainage run, kept between runs by the caller.
+
+    For every source feature id it stores the feature key (see feature_key)
+    and the ids of the point features created for it in the output layer,
+    so a later run with the same parameters only recomputes new or changed
+    features and deletes the points of changed and deleted ones.
+
+    Source feature ids reported by edit signals (see
+    chainagetool.watch_layer) are collected in dirty; while watched is set
+    and no full scan is required, a run only reads those features instead of
+    hashing the whole layer.
+
+    Attributes:
+        params: Chainage parameters of the cached results (None = empty)
+        output_layer: Output layer updated by the runs (set by the caller)
+        watched: True once edit signals invalidate the cache
+        scan_required: The next run has to compare the keys of all features
+    """
+
+    def __init__(self):
+        self.params = None
+        self.output_layer = None
+        self.watched = False
+        self.scan_required = True
+        self.dirty = set()
+        self._keys = {}
+        self._outputs = {}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, fid):
+        return fid in self._keys
+
+    def fids(self):
+        """Return the cached source feature ids."""
+        return list(self._keys)
+
+    def reset(self, params):
+        """Drop all entries and cache results for params from now on.
+
+        Returns the output ids of the dropped entries.
+        """
+        output_fids = [fid for outputs in self._outputs.values() for fid in outputs]
+        self.params = params
+        self.scan_required = True
+        self.dirty.clear()
+        self._keys.clear()
+        self._outputs.clear()
+        return output_fids
+
+    def invalidate(self, fid):
+        """Mark the source feature fid as changed, added or deleted."""
+        self.dirty.add(fid)
+
+    def require_scan(self):
+        """Make the next run compare the keys of all source features."""
+        self.scan_required = True
+
+    def is_current(self, fid, key):
+        """Return True if the cached results of fid are still valid for key.
+
+        A dirty feature whose key did not change (e.g. after editing an
+        attribute that is not copied) is still current.
+        """
+        return self._keys.get(fid) == key
+
+    def store(self, fid, key, output_fids=()):
+        """Cache the key and the output ids of the points of source feature fid."""
+        self._keys[fid] = key
+        self._outputs[fid] = array('q', output_fids)
+
+    def pop(self, fid):
+        """Remove the entry of fid and return its output ids (empty if none)."""
+        self._keys.pop(fid, None)
+        return self._outputs.pop(fid, array('q'))
+
+    def mark_clean(self):
+        """Record that the output reflects every change seen so far."""
+        self.dirty.clear()
+        self.scan_required = False
+
+
+def station_id(source_fid, index):
+    """Return the feature id of station index of source feature source_fid.
+
+    Raises ValueError if the id does not fit a 64 bit feature id, i.e. for
+    more than 2**STATION_ID_BITS stations on one line or a source feature
+    id outside the signed SOURCE_ID_BITS range.
+    """
+    if not 0 <= index < (1 << STATION_ID_BITS):
+        raise ValueError(f"Station index {index} of feature {source_fid} exceeds "
+                         f"{STATION_ID_BITS} bits")
+    if not -(1 << SOURCE_ID_BITS) <= source_fid < (1 << SOURCE_ID_BITS):
+        raise ValueError(f"Feature id {source_fid} exceeds {SOURCE_ID_BITS} bits")
+    return (source_fid << STATION_ID_BITS) + index
+
+
+def split_station_id(fid):
+    """Return (source fid, station index) of a station feature id."""
+    return fid >> STATION_ID_BITS, fid & ((1 << STATION_ID_BITS) - 1)
+
+
+def tile_level(width, height, tiles_per_extent=TILES_PER_EXTENT):
+    """Return the level of the tile grid used for an extent of width x height.
+
+    Tiles of level n are 2**n map units wide, chosen so that an extent is
+    covered by about tiles_per_extent tiles per side; tiles cached while
+    panning at one scale are reused.
+    """
+    size = max(width, height) / tiles_per_extent
+    if size <= 0:
+        return 0
+    return math.ceil(math.log2(size))
+
+
+def tile_keys(xmin, ymin, xmax, ymax, level):
+    """Return the (level, column, row) keys of the tiles covering an extent."""
+    size = 2.0 ** level
+    return [(level, column, row)
+            for column in range(math.floor(xmin / size), math.floor(xmax / size) + 1)
+            for row in range(math.floor(ymin / size), math.floor(ymax / size) + 1)]
+
+
+def tile_bounds(key):
+    """Return (xmin, ymin, xmax, ymax) of a tile; xmax and ymax are exclusive."""
+    level, column, row = key
+    size = 2.0 ** level
+    return column * size, row * size, (column + 1) * size, (row + 1) * size
+
+
+class LruCache:
+    """Mapping that keeps the maxsize most recently used entries."""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Return the value of key (marking it as recently used) or default."""
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            return default
+        return self._entries[key]
+
+    def put(self, key, value):
+        """Store value for key, dropping the least recently used entry if full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        self._entries.clear()
@@ -0,0 +1,719 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Plugin - Chainage Kernel
+Pure-Python geometry helpers used by the chainage tool. This module does not
+import QGIS so it can be reused outside of a running QGIS session.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import math
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Same absolute tolerance as qgsDoubleNear() uses for segment lookups
+NEAR_EPSILON = 4 * sys.float_info.epsilon
+
+# Station placement engines (see make_line_index)
+ENGINE_AUTO = 'auto'
+ENGINE_PYTHON = 'python'
+ENGINE_NUMPY = 'numpy'
+
+# Below this many vertices the per-feature NumPy overhead outweighs its gain
+NUMPY_MIN_VERTICES = 64
+
+# How the line length used for chainage is obtained in chainage_batch()
+LENGTH_PLANAR = 'planar'        # planar length of the parts
+LENGTH_VERTEX_CHAIN = 'chain'   # planar length over all vertices, parts joined
+LENGTH_MEASURED = 'measured'    # length measured by the caller (e.g. ellipsoidal)
+
+# WKB geometry type codes
+WKB_LINESTRING = 2
+WKB_MULTILINESTRING = 5
+
+
+def segment_length(x0, y0, x1, y1):
+    """Return the planar length of a segment (same formula as QgsLineString)."""
+    dx = x1 - x0
+    dy = y1 - y0
+    return math.sqrt(dx * dx + dy * dy)
+
+
+def polyline_length(coords):
+    """Return the planar length of a sequence of (x, y) tuples."""
+    total = 0.0
+    for i in range(1, len(coords)):
+        total += segment_length(*coords[i - 1], *coords[i])
+    return total
+
+
+def chain_length(parts):
+    """Return the planar length over all vertices of parts, parts joined.
+
+    Parts are lists of (x, y) tuples or NumPy (n, 2|3|4) coordinate arrays
+    (see decode_wkb_arrays); this is the length of the vertex chain that
+    QgsGeometry.vertices() walks.
+    """
+    if HAS_NUMPY and parts and isinstance(parts[0], np.ndarray):
+        coords = np.concatenate([_xy_array(part) for part in parts])
+        if len(coords) < 2:
+            return 0.0
+        deltas = np.diff(coords, axis=0)
+        return float(np.sqrt((deltas * deltas).sum(axis=1)).sum())
+    return polyline_length([xy for part in parts for xy in part])
+
+
+def coordinate_list(part):
+    """Return a line part as a list of (x, y) pairs.
+
+    NumPy coordinate arrays are converted in one tolist() call; lists of
+    tuples are returned unchanged.
+    """
+    if HAS_NUMPY and isinstance(part, np.ndarray):
+        return part[:, :2].tolist()
+    return part
+
+
+def _xy_array(part):
+    """Return the (n, 2) float array of the x and y columns of a part."""
+    coords = np.asarray(part, dtype=float)
+    return coords[:, :2] if coords.ndim == 2 else coords.reshape(-1, 2)
+
+
+class LineWalker:
+    """Cursor that resolves distances along a polyline in a single pass.
+
+    The line is given as a list of parts, each a list of (x, y) tuples (see
+    coordinate_list for NumPy coordinate arrays). Parts are chained without
+    a connecting segment, like QgsGeometry.interpolate() does for multi-part
+    lines. When distances are requested in non-decreasing order the walker
+    never revisits a segment, so placing all stations of a line costs
+    O(vertices + stations) instead of O(vertices * stations).
+    """
+
+    def __init__(self, parts):
+        self._parts = [part for part in parts if len(part) >= 2]
+        # Accumulated segment by segment like the walk, so the end of the
+        # last part is found exactly at self.length
+        self.length = 0.0
+        for part in self._parts:
+            for i in range(1, len(part)):
+                self.length += segment_length(*part[i - 1], *part[i])
+        self.rewind()
+
+    def rewind(self):
+        """Move the cursor back to the first segment of the line."""
+        self._part = 0
+        self._vertex = 1
+        self._offset = 0.0
+        self._seg_length = self._segment_length() if self._parts else 0.0
+
+    def _segment(self):
+        part = self._parts[self._part]
+        return part[self._vertex - 1], part[self._vertex]
+
+    def _segment_length(self):
+        (x0, y0), (x1, y1) = self._segment()
+        return segment_length(x0, y0, x1, y1)
+
+    def _advance(self):
+        """Step to the next segment, return False at the end of the line."""
+        if self._vertex + 1 < len(self._parts[self._part]):
+            self._vertex += 1
+        elif self._part + 1 < len(self._parts):
+            self._part += 1
+            self._vertex = 1
+        else:
+            return False
+        self._offset += self._seg_length
+        self._seg_length = self._segment_length()
+        return True
+
+    def point_at(self, distance):
+        """Return the (x, y) tuple at distance along the line.
+
+        Returns None if the distance is negative or beyond the end of the
+        line, mirroring the null geometry QgsGeometry.interpolate() returns.
+        """
+        if distance < 0 or not self._parts:
+            return None
+        if distance < self._offset:
+            self.rewind()
+
+        while distance > self._offset + self._seg_length:
+            if abs(distance - self._offset - self._seg_length) <= NEAR_EPSILON:
+                break
+            if not self._advance():
+                return None
+
+        (x0, y0), (x1, y1) = self._segment()
+        if self._seg_length <= 0:
+            return x0, y0
+        ratio = min(distance - self._offset, self._seg_length) / self._seg_length
+        return x0 + (x1 - x0) * ratio, y0 + (y1 - y0) * ratio
+
+    def points_at(self, distances):
+        """Return the (x, y) tuple (or None) for each distance in order."""
+        return [self.point_at(distance) for distance in distances]
+
+
+class NumpyLine:
+    """Vectorized counterpart of LineWalker backed by NumPy arrays.
+
+    Segment lengths are accumulated once with np.cumsum; all stations of a
+    line are then located with one np.searchsorted call and interpolated in
+    a single vectorized step. Parts are lists of (x, y) tuples or (n, 2|3|4)
+    coordinate arrays; Z and M columns are ignored. Requires NumPy (see
+    HAS_NUMPY).
+    """
+
+    def __init__(self, parts):
+        arrays = [_xy_array(part) for part in parts]
+        arrays = [coords for coords in arrays if len(coords) >= 2]
+        if arrays:
+            self._starts = np.concatenate([coords[:-1] for coords in arrays])
+            self._deltas = np.concatenate([np.diff(coords, axis=0) for coords in arrays])
+        else:
+            self._starts = np.empty((0, 2))
+            self._deltas = np.empty((0, 2))
+        dx = self._deltas[:, 0]
+        dy = self._deltas[:, 1]
+        self._lengths = np.sqrt(dx * dx + dy * dy)
+        self._ends = np.cumsum(self._lengths)
+        self.length = float(self._ends[-1]) if len(self._ends) else 0.0
+
+    def points_at(self, distances):
+        """Return the (x, y) tuple (or None) for each distance in order.
+
+        Distances do not need to be sorted. Like LineWalker.point_at(), a
+        distance that is negative or beyond the end of the line gives None.
+        """
+        distances = np.asarray(distances, dtype=float)
+        if not len(self._lengths):
+            return [None] * len(distances)
+
+        index = np.searchsorted(self._ends, distances - NEAR_EPSILON, side='left')
+        valid = (distances >= 0) & (index < len(self._ends))
+        index = np.minimum(index, len(self._ends) - 1)
+
+        lengths = self._lengths[index]
+        along = np.minimum(distances - (self._ends[index] - lengths), lengths)
+        ratio = np.divide(along, lengths, out=np.zeros_like(along), where=lengths > 0)
+        points = self._starts[index] + self._deltas[index] * ratio[:, np.newaxis]
+
+        return [tuple(point) if ok else None
+                for point, ok in zip(points.tolist(), valid.tolist())]
+
+
+class DistanceMap:
+    """Monotonic distance map stored as two parallel array('d') columns.
+
+    meters[i] is the accumulated real-world length and degrees[i] the
+    accumulated planar (layer unit) length at vertex i. Lookups use
+    bisection, so resolving a station costs O(log vertices).
+    """
+
+    def __init__(self, meters=(), degrees=()):
+        self.meters = array('d', meters)
+        self.degrees = array('d', degrees)
+
+    @classmethod
+    def from_pairs(cls, pairs):
+        """Build a map from a sequence of (meters, degrees) tuples."""
+        distance_map = cls()
+        for meters, degrees in pairs:
+            distance_map.append(meters, degrees)
+        return distance_map
+
+    def append(self, meters, degrees):
+        """Append the accumulated lengths of the next vertex."""
+        self.meters.append(meters)
+        self.degrees.append(degrees)
+
+    def __len__(self):
+        return len(self.meters)
+
+    @property
+    def total_meters(self):
+        """Accumulated meters at the last vertex (0.0 for an empty map)."""
+        return self.meters[-1] if self.meters else 0.0
+
+    def segment_indices(self, targets):
+        """Return the index of the segment containing each target meter distance.
+
+        Segment i runs from vertex i to vertex i + 1; a target on a vertex
+        resolves to the segment ending there. Targets before the first or
+        after the last vertex are clamped to the first or last segment.
+        """
+        last_segment = max(len(self.meters) - 2, 0)
+        if HAS_NUMPY and len(targets) > 1:
+            meters = np.frombuffer(self.meters, dtype=float)
+            index = np.searchsorted(meters, np.asarray(targets, dtype=float), side='left') - 1
+            return np.clip(index, 0, last_segment).tolist()
+
+        indices = []
+        lo = 0
+        previous = None
+        for target in targets:
+            if previous is not None and target < previous:
+                lo = 0
+            lo = bisect_left(self.meters, target, lo)
+            indices.append(min(max(lo - 1, 0), last_segment))
+            previous = target
+        return indices
+
+    def interpolate_many(self, targets):
+        """Return the planar distance for each target meter distance."""
+        if not self.meters:
+            return [None] * len(targets)
+        if len(self.meters) == 1:
+            return [self.degrees[0]] * len(targets)
+
+        results = []
+        for target, i in zip(targets, self.segment_indices(targets)):
+            meters1, meters2 = self.meters[i], self.meters[i + 1]
+            degrees1, degrees2 = self.degrees[i], self.degrees[i + 1]
+            if target >= meters2:
+                results.append(degrees2)
+            elif target <= meters1 or meters2 - meters1 <= 0:
+                results.append(degrees1)
+            else:
+                ratio = (target - meters1) / (meters2 - meters1)
+                results.append(degrees1 + ratio * (degrees2 - degrees1))
+        return results
+
+
+class ReversedIndex:
+    """Station index measuring distances from the end of a line.
+
+    Wraps a forward index (LineWalker, NumpyLine, ...) and resolves distance
+    d at length - d on the original line, so reverse chainage needs neither
+    a reversed copy of the geometry nor a second pass over its vertices.
+    Mirrored distances are resolved in ascending order to keep the single
+    pass of LineWalker.
+    """
+
+    def __init__(self, index):
+        self._index = index
+        self.length = index.length
+
+    def points_at(self, distances):
+        """Return the (x, y) tuple (or None) for each distance from the end."""
+        mirrored = [self.length - distance for distance in distances]
+        order = sorted(range(len(mirrored)), key=mirrored.__getitem__)
+        points = [None] * len(mirrored)
+        for i, point in zip(order, self._index.points_at([mirrored[i] for i in order])):
+            points[i] = point
+        return points
+
+
+class StationBuffer:
+    """Columnar buffer of placed stations.
+
+    Stations are kept in array('d') columns dist, x and y and an array('q')
+    column fid with the id of their source feature, 8 bytes per value
+    instead of a feature object per station. Data shared by all stations of
+    a source feature (such as its copied attribute values) is stored once
+    in sources and referenced by index from the source column.
+    """
+
+    def __init__(self):
+        self.dist = array('d')
+        self.x = array('d')
+        self.y = array('d')
+        self.fid = array('q')
+        self.source = array('q')
+        self.sources = []
+
+    def __len__(self):
+        return len(self.dist)
+
+    def _columns(self):
+        return self.dist, self.x, self.y, self.fid, self.source
+
+    @property
+    def nbytes(self):
+        """Memory used by the station columns in bytes."""
+        return sum(column.itemsize * len(column) for column in self._columns())
+
+    def add_source(self, values):
+        """Store the data of a source feature and return its index.
+
+        Consecutive sources with equal values share one entry.
+        """
+        if not self.sources or self.sources[-1] != values:
+            self.sources.append(values)
+        return len(self.sources) - 1
+
+    def extend(self, stations, fid=-1, source=0):
+        """Append (dist, x, y) stations of the source feature fid."""
+        if not stations:
+            return
+        dists, xs, ys = zip(*stations)
+        self.dist.extend(dists)
+        self.x.extend(xs)
+        self.y.extend(ys)
+        self.fid.extend([fid] * len(dists))
+        self.source.extend([source] * len(dists))
+
+    def rows(self, start=0, stop=None):
+        """Yield (dist, x, y, fid, source values) for stations start:stop."""
+        stop = len(self) if stop is None else min(stop, len(self))
+        sources = self.sources
+        for i in range(start, stop):
+            yield (self.dist[i], self.x[i], self.y[i], self.fid[i],
+                   sources[self.source[i]] if sources else None)
+
+    def chunks(self, size):
+        """Yield (start, stop) ranges of at most size stations."""
+        size = max(1, size)
+        for start in range(0, len(self), size):
+            yield start, min(start + size, len(self))
+
+    def clear(self):
+        """Remove all stations and sources."""
+        for column in self._columns():
+            del column[:]
+        self.sources = []
+
+
+def locate_on_segment(x, y, x0, y0, x1, y1):
+    """Project the point (x, y) onto the segment (x0, y0)-(x1, y1).
+
+    Returns (along, offset): the distance from (x0, y0) to the closest
+    point of the segment and the distance of (x, y) from it, positive to
+    the right of the segment direction and negative to its left.
+    """
+    dx = x1 - x0
+    dy = y1 - y0
+    length_sq = dx * dx + dy * dy
+    ratio = 0.0
+    if length_sq > 0:
+        ratio = min(max(((x - x0) * dx + (y - y0) * dy) / length_sq, 0.0), 1.0)
+    foot_x = x0 + dx * ratio
+    foot_y = y0 + dy * ratio
+    offset = math.sqrt((x - foot_x) ** 2 + (y - foot_y) ** 2)
+    if dx * (y - y0) - dy * (x - x0) > 0:
+        offset = -offset
+    return ratio * math.sqrt(length_sq), offset
+
+
+class SegmentTable:
+    """Segments of a set of routes in compact columns, for locating points.
+
+    Every segment stores its end points, the measure (planar distance along
+    its route) at its start and the number of its route, in array('d') and
+    array('q') columns, so a point is located on a segment found by a
+    spatial index without walking its route again. Parts of multi-part
+    routes are chained without a connecting segment, like LineWalker.
+    """
+
+    def __init__(self):
+        self.x0 = array('d')
+        self.y0 = array('d')
+        self.x1 = array('d')
+        self.y1 = array('d')
+        self.start = array('d')
+        self.route = array('q')
+        self.lengths = array('d')
+
+    def __len__(self):
+        return len(self.x0)
+
+    def add_route(self, parts):
+        """Append the segments of a route and return the route number.
+
+        Parts are lists of (x, y) tuples or NumPy coordinate arrays. The
+        route's segments are numbered from len(self) before the call.
+        """
+        route = len(self.lengths)
+        measure = 0.0
+        for part in parts:
+            if len(part) < 2:
+                continue
+            if HAS_NUMPY and isinstance(part, np.ndarray):
+                measure = self._add_array(route, _xy_array(part), measure)
+                continue
+            for (x0, y0), (x1, y1) in zip(part, part[1:]):
+                self.x0.append(x0)
+                self.y0.append(y0)
+                self.x1.append(x1)
+                self.y1.append(y1)
+                self.start.append(measure)
+                self.route.append(route)
+                measure += segment_length(x0, y0, x1, y1)
+        self.lengths.append(measure)
+        return route
+
+    def _add_array(self, route, coords, measure):
+        """Append the segments of an (n, 2) array, return the measure at its end."""
+        starts, ends = coords[:-1], coords[1:]
+        deltas = ends - starts
+        lengths = np.sqrt((deltas * deltas).sum(axis=1))
+        measures = measure + np.concatenate(([0.0], np.cumsum(lengths)[:-1]))
+        for column, values in ((self.x0, starts[:, 0]), (self.y0, starts[:, 1]),
+                               (self.x1, ends[:, 0]), (self.y1, ends[:, 1]),
+                               (self.start, measures)):
+            column.frombytes(np.ascontiguousarray(values, dtype=float).tobytes())
+        self.route.extend([route] * len(lengths))
+        return measure + float(lengths.sum())
+
+    def bounds(self, segment):
+        """Return (xmin, ymin, xmax, ymax) of a segment."""
+        x0, y0 = self.x0[segment], self.y0[segment]
+        x1, y1 = self.x1[segment], self.y1[segment]
+        return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+    def locate(self, segment, x, y):
+        """Return (measure, offset) of the point (x, y) projected onto a segment.
+
+        The measure is the distance along the route of the segment, the
+        offset is signed as in locate_on_segment().
+        """
+        along, offset = locate_on_segment(x, y, self.x0[segment], self.y0[segment],
+                                          self.x1[segment], self.y1[segment])
+        return self.start[segment] + along, offset
+
+
+def make_line_index(parts, engine=ENGINE_AUTO):
+    """Build the station index for a line given as lists of (x, y) tuples
+    or NumPy coordinate arrays.
+
+    ENGINE_NUMPY (or ENGINE_AUTO on lines with many vertices) returns a
+    vectorized NumpyLine when NumPy is installed; otherwise the pure-Python
+    LineWalker is used.
+    """
+    if HAS_NUMPY and (engine == ENGINE_NUMPY or (
+            engine == ENGINE_AUTO and
+            sum(len(part) for part in parts) >= NUMPY_MIN_VERTICES)):
+        return NumpyLine(parts)
+    return LineWalker([coordinate_list(part) for part in parts])
+
+
+def place_stations(index, length, startpoint, endpoint, distance,
+                   force_last=False, force_first_last=False, divide=0):
+    """Return the (dist, x, y) stations along a line in chainage order.
+
+    Args:
+        index: Point locator for the line (LineWalker, NumpyLine or any
+            object with a length attribute and a points_at() method)
+        length: Length of the line in the units of the distances below. It
+            may differ from index.length (e.g. when measured on the
+            ellipsoid); stations are scaled to index.length for placement.
+        startpoint: Starting distance along line
+        endpoint: Ending distance along line (0 = end of line)
+        distance: Interval distance between points
+        force_last: Force inclusion of endpoint
+        force_first_last: Create only start and end points
+        divide: Divide line into N equal parts
+    """
+    geom_length = index.length
+
+    # Calculate distance if needed (for force_first_last mode)
+    if force_first_last:
+        # For force_first_last, distance should be from start to end
+        distance = length  # Will be adjusted below after endpoint validation
+    elif distance <= 0:
+        distance = length
+
+    # Validate and adjust parameters
+    startpoint = max(0, min(startpoint, length))
+    endpoint = min(endpoint if endpoint > 0 else length, length)
+
+    if startpoint > length:
+        return []
+
+    # Scale endpoint to geometry length for interpolation
+    # (measured length vs geometry length can differ slightly)
+    if length > 0:
+        endpoint_geom = (endpoint / length) * geom_length
+    else:
+        endpoint_geom = geom_length
+
+    # Recalculate distance for force_first_last after endpoint is set
+    if force_first_last:
+        distance = endpoint - startpoint
+        if distance <= 0:
+            distance = 1  # Avoid zero distance
+
+    # Calculate distance for division mode
+    if divide > 0:
+        distance = (endpoint - startpoint) / divide
+
+    def resolve(stations):
+        """Locate (reported distance, geometry distance) pairs in one batch."""
+        points = index.points_at([geom_distance for _, geom_distance in stations])
+        return [(dist, xy[0], xy[1])
+                for (dist, _), xy in zip(stations, points) if xy is not None]
+
+    # For divide mode or force_first_last, use exact calculation
+    if divide > 0 or force_first_last:
+        # Treat force_first_last as divide=1 (2 points: start and end)
+        num_divisions = divide if divide > 0 else 1
+
+        stations = [(startpoint, startpoint)]
+        for i in range(1, num_divisions + 1):
+            point_distance = startpoint + (distance * i)
+            # Ensure we use exact endpoint for the last point
+            if i == num_divisions:
+                point_distance = endpoint
+                point_distance_geom = endpoint_geom  # Use geometry-based endpoint for interpolation
+            else:
+                point_distance_geom = point_distance
+            stations.append((point_distance, point_distance_geom))
+        return resolve(stations)
+
+    # Create points along the line using distance intervals
+    stations = []
+    current_distance = startpoint
+    while current_distance <= endpoint:
+        # Scale current_distance to geometry length for interpolation
+        if length > 0:
+            current_distance_geom = (current_distance / length) * geom_length
+        else:
+            current_distance_geom = current_distance
+
+        stations.append((current_distance, current_distance_geom))
+
+        # Move to next distance
+        current_distance += distance
+
+        # Safety check to prevent infinite loop
+        if distance <= 0:
+            break
+
+    placed = resolve(stations)
+
+    # Add last point if requested or in force_first_last mode
+    if force_last or force_first_last:
+        # Don't add if we already have a point very close to the endpoint
+        # Use relative tolerance: 0.1% of the distance or 0.001, whichever is larger
+        tolerance = max(0.001, abs(endpoint) * 0.001)
+        if not placed or abs(placed[-1][0] - endpoint) >= tolerance:
+            placed.extend(resolve([(endpoint, endpoint_geom)]))
+
+    return placed
+
+
+def _wkb_line_parts(wkb):
+    """Return (offset, vertex count, dimensions, little endian) per line part.
+
+    Walks the headers of a (Multi)LineString WKB blob, handling both byte
+    orders and ISO as well as EWKB Z/M variants. Raises ValueError for any
+    other geometry type.
+    """
+    wkb = memoryview(wkb)
+    parts = []
+
+    def read_geometry(offset):
+        little_endian = wkb[offset] == 1
+        order = '<' if little_endian else '>'
+        (wkb_type,) = struct.unpack_from(order + 'I', wkb, offset + 1)
+        offset += 5
+
+        # EWKB flags, then ISO thousands for Z (1000), M (2000) and ZM (3000)
+        has_z = bool(wkb_type & 0x80000000)
+        has_m = bool(wkb_type & 0x40000000)
+        wkb_type &= 0x0FFFFFFF
+        has_z = has_z or (wkb_type // 1000) in (1, 3)
+        has_m = has_m or (wkb_type // 1000) in (2, 3)
+        base_type = wkb_type % 1000
+
+        (count,) = struct.unpack_from(order + 'I', wkb, offset)
+        offset += 4
+
+        if base_type == WKB_MULTILINESTRING:
+            for _ in range(count):
+                offset = read_geometry(offset)
+            return offset
+        if base_type != WKB_LINESTRING:
+            raise ValueError(f"Unsupported WKB geometry type {wkb_type}")
+
+        dims = 2 + has_z + has_m
+        parts.append((offset, count, dims, little_endian))
+        return offset + count * dims * 8
+
+    read_geometry(0)
+    return parts
+
+
+def decode_wkb_lines(wkb):
+    """Decode a (Multi)LineString WKB blob into a list of (x, y) tuple lists.
+
+    Handles both byte orders and ISO as well as EWKB Z/M variants; Z and M
+    values are dropped. Raises ValueError for any other geometry type.
+    """
+    view = memoryview(wkb)
+    parts = []
+    for offset, count, dims, little_endian in _wkb_line_parts(view):
+        coords = array('d', view[offset:offset + count * dims * 8].tobytes())
+        if little_endian != (sys.byteorder == 'little'):
+            coords.byteswap()
+        parts.append(list(zip(coords[0::dims], coords[1::dims])))
+    return parts
+
+
+def decode_wkb_arrays(wkb):
+    """Decode a (Multi)LineString WKB blob into NumPy coordinate arrays.
+
+    Returns one read-only (n, 2|3|4) float array per part with the x, y and
+    any Z and M columns. The arrays are views on the WKB buffer created with
+    np.frombuffer, so no per-vertex Python objects are allocated; keep the
+    buffer alive as long as the arrays are used. Big-endian blobs give
+    arrays with a big-endian dtype. Requires NumPy (see HAS_NUMPY); raises
+    ValueError for geometry types other than (Multi)LineString.
+    """
+    parts = []
+    for offset, count, dims, little_endian in _wkb_line_parts(wkb):
+        dtype = np.dtype('<f8' if little_endian else '>f8')
+        coords = np.frombuffer(wkb, dtype=dtype, count=count * dims, offset=offset)
+        parts.append(coords.reshape(count, dims))
+    return parts
+
+
+def chainage_batch(items, params):
+    """Compute the stations of a batch of WKB lines.
+
+    This is the process pool entry point of the parallel chainage mode and
+    only depends on this module.
+
+    Args:
+        items: List of (wkb, measured length) tuples; the measured length is
+            only used with LENGTH_MEASURED
+        params: Dict with the place_stations() keywords (startpoint,
+            endpoint, distance, force_last, force_first_last, divide) and
+            reverse, engine and length_mode
+
+    Returns a list with the (dist, x, y) stations of each item.
+    """
+    params = dict(params)
+    reverse = params.pop('reverse', False)
+    engine = params.pop('engine', ENGINE_AUTO)
+    length_mode = params.pop('length_mode', LENGTH_PLANAR)
+
+    results = []
+    for wkb, measured_length in items:
+        parts = decode_wkb_arrays(wkb) if HAS_NUMPY else decode_wkb_lines(wkb)
+        index = make_line_index(parts, engine)
+        if length_mode == LENGTH_MEASURED:
+            length = measured_length
+        elif length_mode == LENGTH_VERTEX_CHAIN:
+            length = chain_length(parts)
+        else:
+            length = index.length
+
+        if reverse:
+            index = ReversedIndex(index)
+
+        results.append(place_stations(index, length, **params))
+    return results
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Live Link - Chainage output that follows edits of its source layer.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+from time import perf_counter
+
+from qgis.PyQt.QtCore import QObject, QTimer
+from qgis.core import QgsFeatureRequest, QgsMessageLog
+
+try:
+    from .chainagecache import ChainageCache
+    from .chainagetool import (
+        ENGINE_AUTO,
+        ChainageContext,
+        points_along_line,
+        update_chainage_output,
+        watch_layer,
+    )
+except ImportError:
+    # Loaded as a top-level module (e.g. from the test suite)
+    from chainagecache import ChainageCache
+    from chainagetool import (
+        ENGINE_AUTO,
+        ChainageContext,
+        points_along_line,
+        update_chainage_output,
+        watch_layer,
+    )
+
+# Edits arriving within this many milliseconds are applied in one update
+DEFAULT_DEBOUNCE_MS = 150
+
+
+class LiveChainage(QObject):
+    """Chainage output layer kept linked to its source line layer.
+
+    start() creates the output memory layer with an incremental run over all
+    features of the source layer. From then on every edit of the source
+    layer marks its feature dirty (see chainagetool.watch_layer) and
+    restarts a single-shot timer, so a burst of edits (e.g. dragging a
+    vertex) results in one update. update() only reads the dirty features,
+    regenerates their stations and applies them to the memory provider as
+    one delete/add batch (see chainagetool.update_chainage_output).
+
+    The link ends with stop(), or when the source or the output layer is
+    deleted.
+    """
+
+    # Keep Python references to active links so they are not garbage collected
+    _active = set()
+
+    def __init__(self, layerout, startpoint, endpoint, distance, layer,
+                 force_last=False, force_first_last=False, divide=0,
+                 use_ellipsoidal=True, distance_units=None, copy_attributes=None,
+                 reverse=False, engine=ENGINE_AUTO, debounce_ms=DEFAULT_DEBOUNCE_MS):
+        super().__init__()
+
+        self.layerout = layerout
+        self.layer = layer
+        self.startpoint = startpoint
+        self.endpoint = endpoint
+        self.distance = distance
+        self.force_last = force_last
+        self.force_first_last = force_first_last
+        self.divide = divide
+        self.use_ellipsoidal = use_ellipsoidal
+        self.distance_units = (distance_units if distance_units is not None
+                               else layer.crs().mapUnits())
+        self.copy_attributes = copy_attributes
+        self.reverse = reverse
+        self.engine = engine
+
+        self.cache = ChainageCache()
+        self.context = None
+        self.output_layer = None
+        self.last_update_seconds = 0.0
+        self._unwatch = None
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self.update)
+
+    @property
+    def active(self):
+        """True while the output layer follows the source layer."""
+        return self._unwatch is not None
+
+    def start(self):
+        """Create the output layer and start following edits of the source layer.
+
+        Returns the ChainageResult of the initial run.
+        """
+        result = points_along_line(
+            self.layerout, self.startpoint, self.endpoint, self.distance, self.layer,
+            selected_only=False, force_last=self.force_last,
+            force_first_last=self.force_first_last, divide=self.divide,
+            use_ellipsoidal=self.use_ellipsoidal, distance_units=self.distance_units,
+            copy_attributes=self.copy_attributes, reverse=self.reverse,
+            engine=self.engine, cache=self.cache
+        )
+        self.output_layer = result.layer
+
+        # Resolved once, so an update only costs the edited features
+        self.context = ChainageContext(self.layer.crs(), self.layer.fields(),
+                                       self.use_ellipsoidal, self.distance_units,
+                                       self.copy_attributes)
+
+        self._unwatch = watch_layer(self.cache, self.layer, self._timer.start)
+        self.layer.willBeDeleted.connect(self.stop)
+        self.output_layer.willBeDeleted.connect(self.stop)
+        LiveChainage._active.add(self)
+        return result
+
+    def update(self):
+        """Apply the pending edits of the source layer to the output layer."""
+        if not self.active or not (self.cache.dirty or self.cache.scan_required):
+            return
+        start = perf_counter()
+
+        request = QgsFeatureRequest()
+        request.setSubsetOfAttributes(list(self.copy_attributes or []), self.layer.fields())
+        if self.cache.scan_required:
+            # After a rollback every feature may have changed
+            candidates = self.cache.fids()
+        else:
+            candidates = set(self.cache.dirty)
+            request.setFilterFids(list(candidates))
+
+        update_chainage_output(
+            self.cache, self.output_layer, self.context, self.layer.getFeatures(request),
+            candidates, self.startpoint, self.endpoint, self.distance, self.force_last,
+            self.force_first_last, self.divide, self.reverse, self.engine
+        )
+        self.output_layer.triggerRepaint()
+        self.last_update_seconds = perf_counter() - start
+
+    def stop(self):
+        """Stop following the source layer; the output layer is kept."""
+        if not self.active:
+            return
+        self._timer.stop()
+        self._unwatch()
+        self._unwatch = None
+        for layer in (self.layer, self.output_layer):
+            try:
+                layer.willBeDeleted.disconnect(self.stop)
+            except (RuntimeError, TypeError):
+                # The layer is already being deleted
+                pass
+        LiveChainage._active.discard(self)
+        QgsMessageLog.logMessage(
+            f"Live chainage {self.layerout} is no longer linked to its source layer.",
+            "QChainage"
+        )
+
+    @classmethod
+    def stop_all(cls):
+        """Stop every active link (e.g. when the plugin is unloaded)."""
+        for link in list(cls._active):
+            link.stop()
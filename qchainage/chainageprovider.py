@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Processing Provider - Registers the chainage, locate and
+events algorithms with the QGIS processing framework.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import os
+from qgis.PyQt.QtGui import QIcon
+from qgis.core import QgsProcessingProvider
+
+from .chainagealgorithm import (
+    QChainageAlgorithm,
+    QChainageEventsAlgorithm,
+    QChainageLocateAlgorithm,
+)
+
+
+class QChainageProvider(QgsProcessingProvider):
+    """Processing provider for the QChainage algorithms."""
+
+    def id(self):
+        return 'qchainage'
+
+    def name(self):
+        return 'QChainage'
+
+    def icon(self):
+        return QIcon(os.path.join(os.path.dirname(__file__), 'img', 'qchainage.svg'))
+
+    def loadAlgorithms(self):
+        self.addAlgorithm(QChainageAlgorithm())
+        self.addAlgorithm(QChainageLocateAlgorithm())
+        self.addAlgorithm(QChainageEventsAlgorithm())
@@ -0,0 +1,192 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Stats - Run statistics, phase timing and profiling of chainage runs.
+
+This module does not depend on QGIS.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import cProfile
+import json
+import os
+import time
+from contextlib import contextmanager
+
+# Phases of a chainage run, in pipeline order
+PHASE_READ = 'read'
+PHASE_LENGTH = 'length'
+PHASE_DISTANCE_MAP = 'distance_map'
+PHASE_INTERPOLATION = 'interpolation'
+PHASE_FEATURES = 'features'
+PHASE_WRITE = 'write'
+PHASE_PROJECT = 'project'
+PHASES = (PHASE_READ, PHASE_LENGTH, PHASE_DISTANCE_MAP, PHASE_INTERPOLATION,
+          PHASE_FEATURES, PHASE_WRITE, PHASE_PROJECT)
+
+# Station placement code paths (see chainagetool.uses_meter_based_placement)
+PLACEMENT_LAYER_UNITS = 'layer_units'
+PLACEMENT_METER_BASED = 'meter_based'
+
+# Environment variable naming a .prof file (or a directory for it); when
+# set, chainage runs are profiled with cProfile
+PROFILE_ENV = 'QCHAINAGE_PROFILE'
+
+
+class PhaseTimer:
+    """Accumulates wall time per phase of a chainage run.
+
+    Hot loops add measured durations with add(); coarse steps can use the
+    measure() context manager.
+    """
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+
+    def add(self, phase, seconds):
+        """Add seconds of wall time to phase."""
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, phase):
+        """Context manager adding the wall time of its block to phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, time.perf_counter() - start)
+
+    @property
+    def total(self):
+        """Sum of all phases in seconds."""
+        return sum(self.seconds.values())
+
+    def summary(self):
+        """Return a one-line description of the phase times."""
+        phases = ", ".join(f"{phase} {seconds:.3f} s"
+                           for phase, seconds in self.seconds.items())
+        return f"{phases}; total {self.total:.3f} s"
+
+
+class ChainageResult:
+    """Outcome and statistics of a chainage run.
+
+    Returned by points_along_line(). Holds the created layer (None if the
+    run was canceled), feature and point counters, the placement code path
+    and the phase timings of the run.
+    """
+
+    def __init__(self, placement=PLACEMENT_LAYER_UNITS, workers=1):
+        self.layer = None
+        self.canceled = False
+        self.placement = placement
+        self.workers = workers
+        self.features_processed = 0
+        self.features_skipped = 0
+        self.features_without_stations = 0
+        self.features_reused = 0
+        self.features_removed = 0
+        self.points_created = 0
+        self.points_written = 0
+        self.points_clipped = 0
+        self.peak_points_per_feature = 0
+        self.peak_points_buffered = 0
+        self.timer = PhaseTimer()
+
+    def add_feature(self, point_count):
+        """Count a processed line feature that produced point_count points."""
+        self.features_processed += 1
+        self.points_created += point_count
+        if point_count == 0:
+            self.features_without_stations += 1
+        self.peak_points_per_feature = max(self.peak_points_per_feature, point_count)
+
+    def skip_feature(self):
+        """Count a feature without a usable line (null, empty or not a line)."""
+        self.features_processed += 1
+        self.features_skipped += 1
+
+    def reuse_feature(self):
+        """Count a feature whose cached points are still valid (incremental run)."""
+        self.features_reused += 1
+
+    def remove_feature(self):
+        """Count a deleted source feature whose points were removed."""
+        self.features_removed += 1
+
+    def clip_points(self, point_count):
+        """Count point_count stations dropped outside the clip region."""
+        self.points_clipped += point_count
+
+    def buffered(self, point_count):
+        """Record the number of points held in memory before a write."""
+        self.peak_points_buffered = max(self.peak_points_buffered, point_count)
+
+    def to_dict(self):
+        """Return the statistics as a JSON-serializable dict."""
+        return {
+            'layer_id': self.layer.id() if self.layer is not None else None,
+            'canceled': self.canceled,
+            'placement': self.placement,
+            'workers': self.workers,
+            'features_processed': self.features_processed,
+            'features_skipped': self.features_skipped,
+            'features_without_stations': self.features_without_stations,
+            'features_reused': self.features_reused,
+            'features_removed': self.features_removed,
+            'points_created': self.points_created,
+            'points_written': self.points_written,
+            'points_clipped': self.points_clipped,
+            'peak_points_per_feature': self.peak_points_per_feature,
+            'peak_points_buffered': self.peak_points_buffered,
+            'timings': dict(self.timer.seconds),
+            'total_seconds': self.timer.total,
+        }
+
+    def to_json(self, path=None, indent=2):
+        """Return the statistics as JSON text, also written to path if given."""
+        text = json.dumps(self.to_dict(), indent=indent)
+        if path:
+            with open(path, 'w') as f:
+                f.write(text)
+        return text
+
+    def summary(self):
+        """Return a one-line description of the counters."""
+        text = (f"{self.features_processed} features ({self.features_skipped} skipped, "
+                f"{self.features_without_stations} without stations), "
+                f"{self.points_written} points written, {self.placement} placement")
+        if self.features_reused or self.features_removed:
+            text += (f", {self.features_reused} features reused, "
+                     f"{self.features_removed} removed")
+        if self.points_clipped:
+            text += f", {self.points_clipped} points outside the clip region"
+        return text
+
+
+@contextmanager
+def profile_run(name='qchainage'):
+    """Profile the block with cProfile if QCHAINAGE_PROFILE is set.
+
+    The variable names the .prof file to write, or an existing directory
+    that receives '<name>_<timestamp>.prof'. The context value is the path
+    of the profile (None when profiling is off). Only the calling thread is
+    profiled.
+    """
+    target = os.environ.get(PROFILE_ENV)
+    if not target:
+        yield None
+        return
+
+    path = target
+    if os.path.isdir(target):
+        path = os.path.join(target, f"{name}_{time.strftime('%Y%m%d_%H%M%S')}.prof")
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield path
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
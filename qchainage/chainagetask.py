@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Task - Runs chainage creation in the background.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+from qgis.core import (
+    QgsApplication,
+    QgsMessageLog,
+    QgsProject,
+    QgsTask,
+    QgsVectorLayerFeatureSource,
+)
+
+from .qt_compat import QSettings
+from .chainagestats import PHASE_PROJECT, profile_run
+from .chainagetool import (
+    ENGINE_AUTO,
+    DEFAULT_CHUNK_SIZE,
+    ChainageContext,
+    add_output_layer,
+    collect_chainage_stations,
+    create_output_layer,
+    iter_chainage_stations,
+    load_output_file,
+    log_result,
+    source_feature_request,
+    write_chainage_file,
+)
+
+
+class ChainageTask(QgsTask):
+    """Background task creating chainage points for a line layer.
+
+    Features are read from a QgsVectorLayerFeatureSource snapshot taken when
+    the task is created, so the source layer may be edited while the task
+    runs. The output layer is only created and added to the project once the
+    task has finished successfully; a canceled run discards its results.
+
+    With an output_path the points are streamed to that file while the task
+    runs instead of being collected in memory (see write_chainage_file);
+    otherwise they are collected in a compact StationBuffer and turned into
+    features once the task has finished.
+    
+    Counters and phase times of the run are available from chainage_result
+    (a ChainageResult) once the task has finished.
+    """
+
+    # Keep Python references to running tasks so they are not garbage collected
+    _running = set()
+
+    def __init__(self, layerout, startpoint, endpoint, distance, layer,
+                 selected_only=True, force_last=False, force_first_last=False,
+                 divide=0, use_ellipsoidal=True, distance_units=None,
+                 copy_attributes=None, reverse=False, engine=ENGINE_AUTO,
+                 workers=1, output_path=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                 filter_expression=None, clip=None):
+        super().__init__(f"QChainage: {layerout}", QgsTask.CanCancel)
+
+        self.layerout = layerout
+        self.startpoint = startpoint
+        self.endpoint = endpoint
+        self.distance = distance
+        self.force_last = force_last
+        self.force_first_last = force_first_last
+        self.divide = divide
+        self.use_ellipsoidal = use_ellipsoidal
+        self.copy_attributes = copy_attributes
+        self.reverse = reverse
+        self.engine = engine
+        self.workers = workers
+        self.output_path = output_path
+        self.chunk_size = chunk_size
+
+        # Everything touching the layer happens here, on the main thread
+        self.crs = layer.crs()
+        self.fields = layer.fields()
+        self.distance_units = (distance_units if distance_units is not None
+                               else self.crs.mapUnits())
+        self.source = QgsVectorLayerFeatureSource(layer)
+        self.context = ChainageContext(self.crs, self.fields, use_ellipsoidal,
+                                       self.distance_units, copy_attributes, clip=clip)
+        self.chainage_result = self.context.result
+
+        self.request, self.feature_count = source_feature_request(
+            layer, selected_only, copy_attributes, filter_expression, self.context.clip
+        )
+
+        self.stations = None
+        self.exception = None
+        self.profile_path = None
+
+    def start(self):
+        """Hand the task to the QGIS task manager."""
+        ChainageTask._running.add(self)
+        QgsApplication.taskManager().addTask(self)
+
+    def run(self):
+        """Create the point features (runs in a worker thread)."""
+        args = (
+            self.source.getFeatures(self.request), self.crs,
+            self.startpoint, self.endpoint, self.distance,
+            self.force_last, self.force_first_last, self.divide,
+            self.use_ellipsoidal, self.distance_units, self.copy_attributes,
+            self.reverse, self.engine, self, self.feature_count,
+            self.workers
+        )
+        try:
+            with profile_run(self.layerout) as self.profile_path:
+                if self.output_path:
+                    written = write_chainage_file(
+                        iter_chainage_stations(*args, context=self.context),
+                        self.output_path, self.layerout, self.context,
+                        self.chunk_size, self
+                    )
+                    return written is not None
+                self.stations = collect_chainage_stations(*args, context=self.context)
+        except Exception as e:
+            self.exception = e
+            return False
+        return self.stations is not None
+
+    def finished(self, result):
+        """Add the output layer to the project (runs on the main thread)."""
+        ChainageTask._running.discard(self)
+
+        if result and self.output_path:
+            with self.context.timer.measure(PHASE_PROJECT):
+                self.chainage_result.layer = load_output_file(self.output_path, self.layerout)
+                QgsProject.instance().addMapLayers([self.chainage_result.layer])
+        elif result:
+            # Temporarily set projection behavior while creating the layer
+            settings = QSettings()
+            projection_key = "Projections/defaultBehaviour"
+            old_setting = settings.value(projection_key)
+            settings.setValue(projection_key, "useGlobal")
+            try:
+                virt_layer = create_output_layer(
+                    self.layerout, self.crs, self.fields,
+                    self.distance_units, self.copy_attributes
+                )
+                add_output_layer(virt_layer, self.stations, self.context, self.chunk_size)
+                self.chainage_result.layer = virt_layer
+            finally:
+                settings.setValue(projection_key, old_setting)
+
+        if result:
+            log_result(self.layerout, self.chainage_result, self.profile_path)
+        elif self.exception is not None:
+            QgsMessageLog.logMessage(
+                f"Chainage creation failed: {self.exception}", "QChainage"
+            )
+        elif self.isCanceled():
+            self.chainage_result.canceled = True
+            QgsMessageLog.logMessage(
+                "Chainage creation canceled, no output layer created.", "QChainage"
+            )
+
+        # Drop partial or delivered results either way
+        self.stations = None
@@ -8,6 +8,15 @@ Licensed under GNU GPL v3.0
 """
 
 import math
+import multiprocessing
+import os
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+from time import perf_counter
 from qgis.PyQt.QtCore import QVariant
 from qgis.core import (
     QgsVectorLayer,
@@ -19,62 +28,340 @@ from qgis.core import (
     QgsUnitTypes,
     QgsDistanceArea,
     QgsWkbTypes,
+    QgsPoint,
     QgsPointXY,
+    QgsRectangle,
+    QgsVectorFileWriter,
+    QgsCoordinateTransform,
+    QgsCoordinateTransformContext,
+    QgsFeatureRequest,
+    QgsMessageLog,
+    QgsSpatialIndex,
+    QgsAbstractFeatureIterator,
+    QgsFeatureIterator,
+    NULL,
 )
 
+try:
+    from . import chainagekernel
+    from .chainagecache import feature_key
+    from .chainagekernel import (
+        ENGINE_AUTO, ENGINE_NUMPY, ENGINE_PYTHON, LENGTH_MEASURED, LENGTH_PLANAR,
+        LENGTH_VERTEX_CHAIN, NEAR_EPSILON, DistanceMap, ReversedIndex, SegmentTable,
+        StationBuffer, chain_length, coordinate_list, decode_wkb_arrays, make_line_index,
+        place_stations, polyline_length, segment_length,
+    )
+    from .chainagestats import (
+        PHASE_DISTANCE_MAP, PHASE_FEATURES, PHASE_INTERPOLATION, PHASE_LENGTH,
+        PHASE_PROJECT, PHASE_READ, PHASE_WRITE, PLACEMENT_LAYER_UNITS,
+        PLACEMENT_METER_BASED, ChainageResult, PhaseTimer, profile_run,
+    )
+except ImportError:
+    # Loaded as a top-level module (e.g. from the test suite)
+    import chainagekernel
+    from chainagecache import feature_key
+    from chainagekernel import (
+        ENGINE_AUTO, ENGINE_NUMPY, ENGINE_PYTHON, LENGTH_MEASURED, LENGTH_PLANAR,
+        LENGTH_VERTEX_CHAIN, NEAR_EPSILON, DistanceMap, ReversedIndex, SegmentTable,
+        StationBuffer, chain_length, coordinate_list, decode_wkb_arrays, make_line_index,
+        place_stations, polyline_length, segment_length,
+    )
+    from chainagestats import (
+        PHASE_DISTANCE_MAP, PHASE_FEATURES, PHASE_INTERPOLATION, PHASE_LENGTH,
+        PHASE_PROJECT, PHASE_READ, PHASE_WRITE, PLACEMENT_LAYER_UNITS,
+        PLACEMENT_METER_BASED, ChainageResult, PhaseTimer, profile_run,
+    )
 
-def _extract_coordinates(geometry):
-    """Extract coordinates from geometry using the most reliable method."""
-    # Try vertices() iterator first (most direct access)
-    try:
-        coords = list(geometry.vertices())
-        if len(coords) >= 2:
-            return coords
-    except:
-        pass
+# Number of source features sent to a worker process at once (parallel mode)
+DEFAULT_BATCH_SIZE = 256
+
+# Index of the 'dist' field in station features (see _station_fields)
+DIST_FIELD_INDEX = 0
+
+# Number of point features written to an output file at once
+DEFAULT_CHUNK_SIZE = 50000
+
+# Fields added to located points (see locate_fields)
+ROUTE_FIELD = "route_id"
+OFFSET_FIELD = "offset"
+
+# OGR drivers for the supported output file extensions
+OUTPUT_DRIVERS = {
+    '.gpkg': 'GPKG',
+    '.fgb': 'FlatGeobuf',
+    '.shp': 'ESRI Shapefile',
+}
+
+
+def _line_parts(geometry):
+    """Return the parts of a line geometry.
     
-    # Fallback to asPolyline()
-    try:
-        if geometry.isMultipart():
-            parts = geometry.asMultiPolyline()
-            return parts[0] if parts else []
-        return geometry.asPolyline()
-    except:
-        return []
+    With NumPy, straight lines are decoded from their WKB into (n, 2|3|4)
+    coordinate arrays without creating per-vertex Python objects (see
+    chainagekernel.decode_wkb_arrays). Otherwise, and for curved lines
+    (which asPolyline() segmentizes), the parts are lists of (x, y) tuples.
+    """
+    if chainagekernel.HAS_NUMPY and not QgsWkbTypes.isCurvedType(geometry.wkbType()):
+        return decode_wkb_arrays(bytes(geometry.asWkb()))
+    if geometry.isMultipart():
+        polylines = geometry.asMultiPolyline()
+    else:
+        polylines = [geometry.asPolyline()]
+    return [[(pt.x(), pt.y()) for pt in polyline] for polyline in polylines]
 
 
-def calculate_cartesian_distance(geometry):
-    """Calculate cartesian distance using raw coordinates (Euclidean distance)."""
-    coords = _extract_coordinates(geometry)
+class _InterpolatingIndex:
+    """Station index for curved lines, delegating to QgsGeometry.interpolate()."""
+
+    def __init__(self, geometry):
+        self._geometry = geometry
+        self.length = geometry.length()
+
+    def points_at(self, distances):
+        points = []
+        for distance in distances:
+            point = self._geometry.interpolate(distance)
+            points.append(None if point.isNull() or point.isEmpty()
+                          else (point.asPoint().x(), point.asPoint().y()))
+        return points
+
+
+def _is_line(geometry):
+    """Return True for a non-empty line geometry."""
+    return bool(geometry and not geometry.isNull() and not geometry.isEmpty() and
+                geometry.type() == QgsWkbTypes.LineGeometry)
+
+
+def _line_index(geometry, engine=ENGINE_AUTO):
+    """Build the station index of a line geometry (see make_line_index).
     
-    if len(coords) < 2:
-        return 0.0
+    Curved geometries keep using QgsGeometry.interpolate() to stay exact on
+    arcs.
+    """
+    if QgsWkbTypes.isCurvedType(geometry.wkbType()):
+        return _InterpolatingIndex(geometry)
+    return make_line_index(_line_parts(geometry), engine)
+
+
+def _locate_stations(stations, locate, timer=None):
+    """Resolve (distance value, geometry distance) stations to (dist, x, y).
     
-    total_distance = 0.0
-    for i in range(len(coords) - 1):
-        dx = coords[i + 1].x() - coords[i].x()
-        dy = coords[i + 1].y() - coords[i].y()
-        total_distance += math.sqrt(dx * dx + dy * dy)
+    All stations are located with a single call to locate, which returns an
+    (x, y) tuple or None per geometry distance; stations that fall outside
+    the line are skipped. Time is added to timer (a PhaseTimer).
+    """
+    if timer is None:
+        timer = PhaseTimer()
+    start = perf_counter()
+    points = locate([geom_distance for _, geom_distance in stations])
+    timer.add(PHASE_INTERPOLATION, perf_counter() - start)
+    return [(distance_value, *point)
+            for (distance_value, _), point in zip(stations, points)
+            if point is not None]
+
+
+def calculate_cartesian_distance(geometry):
+    """Calculate cartesian distance using raw coordinates (Euclidean distance).
     
-    return total_distance
+    Sums the segments between all vertices, parts of a multi-line joined.
+    """
+    if QgsWkbTypes.isCurvedType(geometry.wkbType()):
+        # Arcs count with their control points, as vertices() returns them
+        return polyline_length([(vertex.x(), vertex.y()) for vertex in geometry.vertices()])
+    return chain_length(_line_parts(geometry))
 
 
-def setup_distance_calculator(layer_crs, use_ellipsoidal):
-    """Set up distance calculator based on calculation mode."""
+def setup_distance_calculator(layer_crs, use_ellipsoidal, ellipsoid=None,
+                              transform_context=None):
+    """Set up distance calculator based on calculation mode.
+    
+    The ellipsoid and transform context default to those of the current
+    project (a processing run passes the ones of its context).
+    """
     if not use_ellipsoidal:
         return None
     
     distance_area = QgsDistanceArea()
     
     if layer_crs:
-        distance_area.setSourceCrs(layer_crs, QgsProject.instance().transformContext())
+        if transform_context is None:
+            transform_context = QgsProject.instance().transformContext()
+        distance_area.setSourceCrs(layer_crs, transform_context)
     
-    ellipsoid = QgsProject.instance().ellipsoid()
-    distance_area.setEllipsoid(ellipsoid if ellipsoid != "NONE" else "WGS84")
+    if ellipsoid is None:
+        ellipsoid = QgsProject.instance().ellipsoid()
+    distance_area.setEllipsoid(ellipsoid if ellipsoid and ellipsoid != "NONE" else "WGS84")
     
     return distance_area
 
 
+class ChainageClip:
+    """Region limiting a chainage run, in the CRS of the source layer.
+    
+    Only source features whose bounding box intersects the bounding box of
+    the region are read (see source_feature_request), and stations outside
+    the region are dropped before any point feature is created. Polygons
+    are tested with a prepared geometry engine.
+    
+    Args:
+        region: QgsRectangle or polygon QgsGeometry
+    """
+    
+    def __init__(self, region):
+        if isinstance(region, QgsRectangle):
+            self.rect = QgsRectangle(region)
+            self.geometry = None
+            self._engine = None
+        else:
+            self.geometry = QgsGeometry(region)
+            self.rect = self.geometry.boundingBox()
+            self._engine = QgsGeometry.createGeometryEngine(self.geometry.constGet())
+            self._engine.prepareGeometry()
+    
+    def key(self):
+        """Return the region as WKT, e.g. to compare the clips of two runs."""
+        if self.geometry is not None:
+            return self.geometry.asWkt()
+        return self.rect.asWktPolygon()
+    
+    def filter(self, stations):
+        """Return the (dist, x, y) stations inside the region."""
+        rect = self.rect
+        xmin, ymin = rect.xMinimum(), rect.yMinimum()
+        xmax, ymax = rect.xMaximum(), rect.yMaximum()
+        inside = [station for station in stations
+                  if xmin <= station[1] <= xmax and ymin <= station[2] <= ymax]
+        if self._engine is None:
+            return inside
+        engine = self._engine
+        return [station for station in inside
+                if engine.intersects(QgsPoint(station[1], station[2]))]
+
+
+def clip_region_from_extent(extent, extent_crs, layer_crs, transform_context=None):
+    """Return a QgsRectangle in layer_crs covering extent (e.g. the map canvas)."""
+    if extent_crs == layer_crs:
+        return QgsRectangle(extent)
+    if transform_context is None:
+        transform_context = QgsProject.instance().transformContext()
+    transform = QgsCoordinateTransform(extent_crs, layer_crs, transform_context)
+    return transform.transformBoundingBox(extent)
+
+
+def clip_region_from_layer(polygon_layer, layer_crs, selected_only=False,
+                           transform_context=None):
+    """Return the union of the polygons of polygon_layer in layer_crs.
+    
+    Returns None if the layer (or its selection) has no polygons.
+    """
+    request = QgsFeatureRequest().setNoAttributes()
+    if selected_only:
+        request.setFilterFids(polygon_layer.selectedFeatureIds())
+    geometries = [feature.geometry() for feature in polygon_layer.getFeatures(request)
+                  if feature.hasGeometry()]
+    if not geometries:
+        return None
+    region = QgsGeometry.unaryUnion(geometries)
+    if polygon_layer.crs() != layer_crs:
+        if transform_context is None:
+            transform_context = QgsProject.instance().transformContext()
+        region.transform(QgsCoordinateTransform(polygon_layer.crs(), layer_crs,
+                                                transform_context))
+    return region
+
+
+class ChainageContext:
+    """Per-run chainage settings, resolved once and shared by all features.
+    
+    Holds everything that only depends on the layer and the dialog options:
+    the distance calculator, layer and distance units, unit conversion
+    factors, output fields and the source indexes of copied attributes.
+    Build it on the main thread, since it reads the project ellipsoid and
+    transform context. Counters of the run are collected in its result (a
+    ChainageResult) and the time spent in each phase in its timer.
+    
+    Args:
+        layer_crs: CRS of the source layer
+        source_fields: QgsFields of the source layer (None = no attributes)
+        use_ellipsoidal: Use ellipsoidal (geodesic) distances
+        distance_units: Units for distance measurements (None = layer units)
+        copy_attributes: List of attribute names to copy from source features
+        ellipsoid: Ellipsoid acronym (None = project ellipsoid)
+        transform_context: QgsCoordinateTransformContext (None = project's)
+        clip: Optional QgsRectangle or polygon QgsGeometry in layer_crs;
+            stations outside it are dropped (see ChainageClip)
+    """
+    
+    def __init__(self, layer_crs, source_fields=None, use_ellipsoidal=True,
+                 distance_units=None, copy_attributes=None, ellipsoid=None,
+                 transform_context=None, clip=None):
+        self.layer_crs = layer_crs
+        self.use_ellipsoidal = use_ellipsoidal
+        self.copy_attributes = copy_attributes
+        self.clip = ChainageClip(clip) if clip is not None else None
+        self.layer_units = (layer_crs.mapUnits() if layer_crs
+                            else QgsUnitTypes.DistanceMeters)
+        self.distance_units = (distance_units if distance_units is not None
+                               else self.layer_units)
+        self.is_geographic = self.layer_units == QgsUnitTypes.DistanceDegrees
+        self.meter_based = uses_meter_based_placement(self.layer_units,
+                                                      self.distance_units)
+        
+        # Counters and phase times of the run
+        self.result = ChainageResult(
+            PLACEMENT_METER_BASED if self.meter_based else PLACEMENT_LAYER_UNITS
+        )
+        self.timer = self.result.timer
+        
+        # Meter-based placement needs real-world distances even in cartesian mode
+        self.distance_area = setup_distance_calculator(
+            layer_crs, use_ellipsoidal or self.meter_based, ellipsoid,
+            transform_context
+        )
+        
+        self.to_meters = QgsUnitTypes.fromUnitToUnitFactor(
+            self.distance_units, QgsUnitTypes.DistanceMeters
+        )
+        self.conversion_factor = None
+        if self.distance_units != self.layer_units:
+            factor = QgsUnitTypes.fromUnitToUnitFactor(self.distance_units,
+                                                       self.layer_units)
+            if factor > 0:
+                self.conversion_factor = factor
+        
+        # Fields of station features and of the output layer
+        self.station_fields = _station_fields(source_fields, copy_attributes)
+        self.fields = output_fields(source_fields, self.distance_units,
+                                    copy_attributes)
+        
+        # (output index, source index) of every copied attribute
+        self.attribute_map = []
+        if source_fields is not None and copy_attributes:
+            for attr_name in copy_attributes:
+                source_index = source_fields.indexFromName(attr_name)
+                if source_index >= 0:
+                    self.attribute_map.append(
+                        (self.station_fields.indexFromName(attr_name), source_index)
+                    )
+    
+    def clip_stations(self, stations):
+        """Return the stations inside the clip region (all without a clip)."""
+        if self.clip is None or not stations:
+            return stations
+        inside = self.clip.filter(stations)
+        self.result.clip_points(len(stations) - len(inside))
+        return inside
+    
+    def to_layer_units(self, startpoint, endpoint, distance):
+        """Convert (startpoint, endpoint, distance) to layer units."""
+        if self.conversion_factor is not None and distance > 0:
+            distance *= self.conversion_factor
+            startpoint *= self.conversion_factor
+            if endpoint > 0:
+                endpoint *= self.conversion_factor
+        return startpoint, endpoint, distance
+
+
 def get_line_length(geometry, distance_area, use_ellipsoidal):
     """Calculate line length using ellipsoidal or cartesian method."""
     return (distance_area.measureLength(geometry) if use_ellipsoidal 
@@ -83,9 +370,14 @@ def get_line_length(geometry, distance_area, use_ellipsoidal):
 
 def create_points_by_distance(startpoint, endpoint, distance, geom, force_last,
                               force_first_last, divide, distance_area, distance_units=None,
-                              source_feature=None, copy_attributes=None, reverse=False):
+                              source_feature=None, copy_attributes=None, reverse=False,
+                              context=None):
     """Create points at real-world distance intervals along a line (for geographic CRS).
     
+    Geodesic segment lengths are accumulated once per feature (see
+    build_distance_map) and each station is placed by a geodesic direct
+    computation inside the segment that contains it.
+    
     Args:
         startpoint: Starting distance along line
         endpoint: Ending distance along line
@@ -99,28 +391,42 @@ def create_points_by_distance(startpoint, endpoint, distance, geom, force_last,
         source_feature: Source feature to copy attributes from
         copy_attributes: List of attribute names to copy
         reverse: Reverse the chainage direction (start from end)
+        context: Optional ChainageContext of the run; it replaces
+            distance_area, distance_units and copy_attributes
     """
-    # Reverse geometry if requested - create a copy and reverse it
-    if reverse:
-        geom = QgsGeometry(geom)  # Create a copy
-        coords = _extract_coordinates(geom)
-        if coords:
-            coords.reverse()
-            # Convert QgsPoint to QgsPointXY if needed
-            coords_xy = [QgsPointXY(pt.x(), pt.y()) if hasattr(pt, 'x') else pt for pt in coords]
-            geom = QgsGeometry.fromPolylineXY(coords_xy)
+    if context is None:
+        context = ChainageContext(
+            None, source_feature.fields() if source_feature else None,
+            True, distance_units if distance_units is not None
+            else QgsUnitTypes.DistanceMeters, copy_attributes
+        )
+        context.distance_area = distance_area
     
-    # Convert input distances to meters for measurement
-    if distance_units is None:
-        distance_units = QgsUnitTypes.DistanceMeters
+    stations = _stations_by_distance(startpoint, endpoint, distance, geom, force_last,
+                                     force_first_last, divide, reverse, context)
+    start = perf_counter()
+    features = _station_features(context.station_fields, stations, source_feature,
+                                 context.attribute_map)
+    context.timer.add(PHASE_FEATURES, perf_counter() - start)
+    return features
+
+
+def _stations_by_distance(startpoint, endpoint, distance, geom, force_last,
+                          force_first_last, divide, reverse, context):
+    """Return the (dist, x, y) stations of create_points_by_distance()."""
+    distance_area = context.distance_area
     
-    to_meters = QgsUnitTypes.fromUnitToUnitFactor(distance_units, QgsUnitTypes.DistanceMeters)
+    # Convert input distances to meters for measurement
+    to_meters = context.to_meters
     distance_in_meters = distance * to_meters
     startpoint_in_meters = startpoint * to_meters
     endpoint_in_meters = endpoint * to_meters if endpoint > 0 else 0
     
-    # Measure total line length in meters
-    total_length_meters = distance_area.measureLength(geom)
+    # Build the exact per-vertex distance map and take the total line length
+    # in meters from it (same geodesic segment lengths as measureLength())
+    with context.timer.measure(PHASE_DISTANCE_MAP):
+        vertices, distance_map = build_distance_map(geom, distance_area)
+    total_length_meters = distance_map.total_meters
     
     # Adjust endpoint
     if endpoint_in_meters <= 0 or endpoint_in_meters > total_length_meters:
@@ -136,142 +442,157 @@ def create_points_by_distance(startpoint, endpoint, distance, geom, force_last,
     if distance_in_meters <= 0:
         return []
     
-    # Prepare feature fields
-    fields = QgsFields()
-    fields.append(QgsField("dist", QVariant.Double))
-    
-    # Add selected attributes from source feature
-    if source_feature and copy_attributes:
-        source_fields = source_feature.fields()
-        for attr_name in copy_attributes:
-            field_index = source_fields.indexFromName(attr_name)
-            if field_index >= 0:
-                field = source_fields.field(attr_name)
-                fields.append(QgsField(field.name(), field.type()))
-    
-    features = []
-    
-    # We need to walk along the line in degrees and measure distance in meters
-    # Sample the line to create a distance-to-position mapping
-    cartesian_length = calculate_cartesian_distance(geom)
-    num_samples = max(100, int(cartesian_length / 0.0001))  # Sample every ~0.0001 degrees
-    
-    # Build distance map: accumulated meter distance -> degree distance
-    geom_length = geom.length()
-    distance_map = [(0.0, 0.0)]  # (meters, degrees)
-    accumulated_meters = 0.0
-    last_point = geom.interpolate(0)
-    
-    for i in range(1, num_samples + 1):
-        degree_dist = (cartesian_length * i) / num_samples
-        if degree_dist > geom_length:
-            break
-        current_point = geom.interpolate(degree_dist)
-        
-        # Measure segment in meters
-        segment_geom = QgsGeometry.fromPolylineXY([
-            last_point.asPoint(),
-            current_point.asPoint()
-        ])
-        segment_meters = distance_area.measureLength(segment_geom)
-        accumulated_meters += segment_meters
-        
-        distance_map.append((accumulated_meters, degree_dist))
-        last_point = current_point
-    
     # Now create points at the requested meter intervals
     current_meter_distance = startpoint_in_meters
+    forward_locate = _geodesic_locator(distance_area, vertices, distance_map)
+    
+    def locate(targets):
+        """Locate meter distances, measured from the end of the line if reversed."""
+        if reverse:
+            # Measure from the end of the original line instead of reversing it
+            targets = [total_length_meters - target for target in targets]
+        return forward_locate(targets)
+    
+    def station(meter_distance):
+        """Return (distance in original units, meter distance used for placement)."""
+        return (meter_distance / to_meters, meter_distance)
     
     # For divide mode or force_first_last, use exact calculation
     if divide > 0 or force_first_last:
         # Treat force_first_last as divide=1 (2 points: start and end)
         num_divisions = divide if divide > 0 else 1
         
-        # Create start point
-        degree_dist = interpolate_from_map(distance_map, startpoint_in_meters)
-        if degree_dist is not None:
-            point = geom.interpolate(degree_dist)
-            distance_in_original_units = startpoint_in_meters / to_meters
-            feature = create_feature_with_point(fields, point, distance_in_original_units,
-                                               source_feature, copy_attributes)
-            if feature:
-                features.append(feature)
-        
-        # Create intermediate and end points
+        # Start point, intermediate points and end point
+        stations = [station(startpoint_in_meters)]
         for i in range(1, num_divisions + 1):
             point_meter_distance = startpoint_in_meters + (distance_in_meters * i)
             # Ensure we use exact endpoint for the last point
             if i == num_divisions:
                 point_meter_distance = endpoint_in_meters
-            degree_dist = interpolate_from_map(distance_map, point_meter_distance)
-            
-            if degree_dist is not None:
-                point = geom.interpolate(degree_dist)
-                distance_in_original_units = point_meter_distance / to_meters
-                feature = create_feature_with_point(fields, point, distance_in_original_units,
-                                                   source_feature, copy_attributes)
-                if feature:
-                    features.append(feature)
+            stations.append(station(point_meter_distance))
+        
+        placed = _locate_stations(stations, locate, context.timer)
     else:
         # Standard distance-based point creation
+        stations = []
         while current_meter_distance <= endpoint_in_meters:
-            # Find the corresponding degree distance
-            degree_dist = interpolate_from_map(distance_map, current_meter_distance)
-            
-            if degree_dist is not None:
-                point = geom.interpolate(degree_dist)
-                # Store distance in original units
-                distance_in_original_units = current_meter_distance / to_meters
-                feature = create_feature_with_point(fields, point, distance_in_original_units,
-                                                   source_feature, copy_attributes)
-                if feature:
-                    features.append(feature)
-            
+            stations.append(station(current_meter_distance))
             current_meter_distance += distance_in_meters
             
             if distance_in_meters <= 0:
                 break
         
+        placed = _locate_stations(stations, locate, context.timer)
+        
         # Add last point if requested or in force_first_last mode
         if force_last or force_first_last:
             should_add_endpoint = True
-            if features:
+            if placed:
                 # Don't add if we already have a point very close to the endpoint
-                if abs(features[-1]['dist'] * to_meters - endpoint_in_meters) < 0.01:
+                if abs(placed[-1][0] * to_meters - endpoint_in_meters) < 0.01:
                     should_add_endpoint = False
             
             if should_add_endpoint:
-                degree_dist = interpolate_from_map(distance_map, endpoint_in_meters)
-                if degree_dist is not None:
-                    point = geom.interpolate(degree_dist)
-                    distance_in_original_units = endpoint_in_meters / to_meters
-                    feature = create_feature_with_point(fields, point, distance_in_original_units,
-                                                       source_feature, copy_attributes)
-                    if feature:
-                        features.append(feature)
+                placed.extend(_locate_stations(
+                    [station(endpoint_in_meters)], locate, context.timer
+                ))
     
-    return features
+    return placed
 
 
-def interpolate_from_map(distance_map, target_meters):
-    """Interpolate degree distance from meter distance using the distance map."""
-    if not distance_map:
-        return None
+def build_distance_map(geom, distance_area):
+    """Build the exact per-vertex distance map of a line in a geographic CRS.
+    
+    Returns (vertices, distance_map): every vertex of the line as QgsPointXY
+    and a DistanceMap holding the accumulated meters and degrees per vertex.
+    Meters are geodesic lengths measured once per segment with distance_area.
+    Parts of a multi-line are chained without a connecting segment.
+    """
+    vertices = []
+    distance_map = DistanceMap()
+    meters = 0.0
+    degrees = 0.0
+    for part in _line_parts(geom):
+        previous = None
+        for x, y in coordinate_list(part):
+            point = QgsPointXY(x, y)
+            if previous is not None:
+                meters += distance_area.measureLine(previous, point)
+                degrees += segment_length(previous.x(), previous.y(), x, y)
+            vertices.append(point)
+            distance_map.append(meters, degrees)
+            previous = point
+    return vertices, distance_map
+
+
+def _geodesic_point(distance_area, start, end, along, segment_meters):
+    """Return the point along meters from start on the geodesic towards end."""
+    if along <= 0 or segment_meters <= 0:
+        return start
+    if along >= segment_meters:
+        return end
+    azimuth = distance_area.bearing(start, end)
+    return distance_area.computeSpheroidProject(start, along, azimuth)
+
+
+def _geodesic_locator(distance_area, vertices, distance_map):
+    """Return a callable mapping meter distances to (x, y) tuples.
     
-    # Find the two points to interpolate between
-    for i in range(len(distance_map) - 1):
-        meters1, degrees1 = distance_map[i]
-        meters2, degrees2 = distance_map[i + 1]
+    The containing segments of all stations are resolved with one batched
+    DistanceMap.segment_indices() lookup. Distances beyond the line are
+    clamped to its end.
+    """
+    def locate(targets):
+        if not vertices:
+            return [None for _ in targets]
+        if len(vertices) == 1:
+            return [(vertices[0].x(), vertices[0].y()) for _ in targets]
         
-        if meters1 <= target_meters <= meters2:
-            if meters2 - meters1 > 0:
-                ratio = (target_meters - meters1) / (meters2 - meters1)
-                return degrees1 + ratio * (degrees2 - degrees1)
-            else:
-                return degrees1
+        meters = distance_map.meters
+        points = []
+        for target, i in zip(targets, distance_map.segment_indices(targets)):
+            point = _geodesic_point(distance_area, vertices[i], vertices[i + 1],
+                                    target - meters[i], meters[i + 1] - meters[i])
+            points.append((point.x(), point.y()))
+        return points
+    
+    return locate
+
+
+def interpolate_from_map(distance_map, target_meters):
+    """Interpolate degree distance from meter distance using the distance map.
+    
+    distance_map is a DistanceMap (a list of (meters, degrees) tuples is
+    also accepted). The containing segment is found by bisection.
+    """
+    return interpolate_from_map_batch(distance_map, [target_meters])[0]
+
+
+def interpolate_from_map_batch(distance_map, targets_meters):
+    """Interpolate the degree distances of all stations of a feature at once.
+    
+    Returns one degree distance per target (None if the map is empty).
+    Targets beyond the end of the map resolve to its last value.
+    """
+    if not isinstance(distance_map, DistanceMap):
+        distance_map = DistanceMap.from_pairs(distance_map)
+    return distance_map.interpolate_many(targets_meters)
+
+
+def _attribute_values(fields, source_feature=None, attribute_map=None):
+    """Return the attribute list shared by all stations of a source feature.
     
-    # If beyond the end, return the last value
-    return distance_map[-1][1]
+    Copied attributes are read from the source feature once, following the
+    (output index, source index) plan of ChainageContext.attribute_map. The
+    'dist' value at DIST_FIELD_INDEX is filled in per station; setAttributes()
+    copies the list, so it can be reused for every station.
+    """
+    values = [None] * fields.count()
+    if source_feature is not None and attribute_map:
+        source_values = source_feature.attributes()
+        for output_index, source_index in attribute_map:
+            values[output_index] = source_values[source_index]
+    return values
 
 
 def create_feature_with_point(fields, point_geometry, distance_value,
@@ -284,26 +605,39 @@ def create_feature_with_point(fields, point_geometry, distance_value,
         distance_value: Distance value for the 'dist' field
         source_feature: Source feature to copy attributes from (optional)
         copy_attributes: List of attribute names to copy (optional)
+        
+    Raises KeyError if fields has no 'dist' field.
     """
     if point_geometry.isNull() or point_geometry.isEmpty():
         return None
     
-    feature = QgsFeature(fields)
-    feature.setGeometry(QgsGeometry.fromPointXY(point_geometry.asPoint()))
-    feature['dist'] = distance_value
-    
-    # Copy selected attributes from source feature
+    # Resolve the copied attributes to (output index, source index) pairs
+    attribute_map = []
     if source_feature and copy_attributes:
+        source_fields = source_feature.fields()
         for attr_name in copy_attributes:
-            if attr_name in source_feature.fields().names():
-                feature[attr_name] = source_feature[attr_name]
+            source_index = source_fields.indexFromName(attr_name)
+            output_index = fields.indexFromName(attr_name)
+            if source_index >= 0 and output_index >= 0:
+                attribute_map.append((output_index, source_index))
+    
+    dist_index = fields.indexFromName('dist')
+    if dist_index < 0:
+        # Same error as the feature['dist'] assignment this replaces
+        raise KeyError("The fields have no 'dist' field")
+    attributes = _attribute_values(fields, source_feature, attribute_map)
+    attributes[dist_index] = distance_value
     
+    feature = QgsFeature(fields)
+    feature.setGeometry(QgsGeometry.fromPointXY(point_geometry.asPoint()))
+    feature.setAttributes(attributes)
     return feature
 
 
 def create_points(startpoint, endpoint, distance, geom, force_last, 
                   force_first_last, divide, layer_crs=None, use_ellipsoidal=True,
-                  distance_units=None, source_feature=None, copy_attributes=None, reverse=False):
+                  distance_units=None, source_feature=None, copy_attributes=None, reverse=False,
+                  engine=ENGINE_AUTO, context=None):
     """Create points at specified intervals along a line geometry.
     
     Args:
@@ -320,266 +654,1656 @@ def create_points(startpoint, endpoint, distance, geom, force_last,
         source_feature: Source feature to copy attributes from
         copy_attributes: List of attribute names to copy
         reverse: Reverse the chainage direction (start from end)
+        engine: Station placement engine (ENGINE_AUTO, ENGINE_PYTHON or ENGINE_NUMPY)
+        context: Optional ChainageContext shared by all features of a run; it
+            replaces layer_crs, use_ellipsoidal, distance_units and
+            copy_attributes. Built from those arguments if not given.
     """
     # Validate geometry
-    if not geom or geom.isNull() or geom.isEmpty() or geom.type() != QgsWkbTypes.LineGeometry:
+    if not _is_line(geom):
         return []
     
-    # Set up distance calculation
-    distance_area = setup_distance_calculator(layer_crs, use_ellipsoidal)
+    if context is None:
+        context = ChainageContext(
+            layer_crs, source_feature.fields() if source_feature else None,
+            use_ellipsoidal, distance_units, copy_attributes
+        )
     
-    # Get layer units
-    layer_units = layer_crs.mapUnits() if layer_crs else QgsUnitTypes.DistanceMeters
+    stations = create_stations(context, startpoint, endpoint, distance, geom,
+                               force_last, force_first_last, divide, reverse, engine)
+    start = perf_counter()
+    features = _station_features(context.station_fields, stations, source_feature,
+                                 context.attribute_map)
+    context.timer.add(PHASE_FEATURES, perf_counter() - start)
+    return features
+
+
+def create_stations(context, startpoint, endpoint, distance, geom, force_last=False,
+                    force_first_last=False, divide=0, reverse=False, engine=ENGINE_AUTO):
+    """Return the (dist, x, y) stations along a line geometry in chainage order.
     
-    # If no distance units provided, use layer units
-    if distance_units is None:
-        distance_units = layer_units
+    Takes the arguments of create_points() with the ChainageContext of the
+    run, but no point features are created (see StationBuffer).
+    """
+    if not _is_line(geom):
+        return []
+    distance_area = context.distance_area
     
     # For geographic CRS with any linear unit input (meters, centimeters, feet, etc.),
     # we need to use a different approach because geom.interpolate() works in degrees
-    is_geographic = layer_units == QgsUnitTypes.DistanceDegrees
-    is_linear_unit = distance_units != QgsUnitTypes.DistanceDegrees
-    use_meter_based_placement = is_geographic and is_linear_unit
-    
-    if use_meter_based_placement:
-        # For linear unit placement on geographic CRS, we MUST use ellipsoidal measurements
-        # even if user selected cartesian mode, because we need real-world distances
-        if distance_area is None:
-            distance_area = setup_distance_calculator(layer_crs, True)
-        
+    if context.meter_based:
         # Use distance mapping for real-world distance placement
-        # Note: reverse is handled inside create_points_by_distance
-        return create_points_by_distance(
-            startpoint, endpoint, distance, geom, force_last,
-            force_first_last, divide, distance_area, distance_units,
-            source_feature, copy_attributes, reverse
-        )
+        # Note: reverse is handled inside _stations_by_distance
+        return _stations_by_distance(startpoint, endpoint, distance, geom, force_last,
+                                     force_first_last, divide, reverse, context)
     
     # Standard approach: work in layer units
-    # Reverse geometry if requested (only for non-geographic paths)
-    if reverse:
-        geom = QgsGeometry(geom)  # Create a copy
-        coords = _extract_coordinates(geom)
-        if coords:
-            coords.reverse()
-            # Convert QgsPoint to QgsPointXY if needed
-            coords_xy = [QgsPointXY(pt.x(), pt.y()) if hasattr(pt, 'x') else pt for pt in coords]
-            geom = QgsGeometry.fromPolylineXY(coords_xy)
+    timer = context.timer
+    start = perf_counter()
+    index = _line_index(geom, engine)
     
     # Get total line length in layer units
-    if is_geographic:
+    if context.is_geographic:
         length = calculate_cartesian_distance(geom)
     else:
         # For projected CRS
-        if use_ellipsoidal and distance_area:
+        if context.use_ellipsoidal and distance_area:
             # Use ellipsoidal (geodesic) measurement
             length = distance_area.measureLength(geom)
         else:
             # Use cartesian (planar) measurement - same as geom.length()
-            length = geom.length()
-    
-    # For geom.interpolate(), we need the actual geometry length, not measured length
-    # This is the distance parameter that interpolate() expects
-    geom_length = geom.length()
+            length = index.length
+    measured = perf_counter()
+    timer.add(PHASE_LENGTH, measured - start)
     
     # Convert distance from user units to layer units if needed
-    if distance_units != layer_units and distance > 0:
-        conversion_factor = QgsUnitTypes.fromUnitToUnitFactor(distance_units, layer_units)
-        if conversion_factor > 0:
-            distance *= conversion_factor
-            startpoint *= conversion_factor
-            if endpoint > 0:
-                endpoint *= conversion_factor
+    startpoint, endpoint, distance = context.to_layer_units(startpoint, endpoint, distance)
     
-    # Calculate distance if needed (for force_first_last mode)
-    if force_first_last:
-        # For force_first_last, distance should be from start to end
-        distance = length  # Will be adjusted below after endpoint validation
-    elif distance <= 0:
-        distance = length
-    
-    # Validate and adjust parameters
-    startpoint = max(0, min(startpoint, length))
-    endpoint = min(endpoint if endpoint > 0 else length, length)
-    
-    if startpoint > length:
-        return []
-    
-    # Scale endpoint to geometry length for interpolation
-    # (measured length vs geometry length can differ slightly)
-    if length > 0:
-        endpoint_geom = (endpoint / length) * geom_length
-    else:
-        endpoint_geom = geom_length
-    
-    # Recalculate distance for force_first_last after endpoint is set
-    if force_first_last:
-        distance = endpoint - startpoint
-        if distance <= 0:
-            distance = 1  # Avoid zero distance
+    # Reverse chainage places stations at length - d on the original line
+    if reverse:
+        index = ReversedIndex(index)
     
-    # Calculate distance for division mode
-    if divide > 0:
-        distance = (endpoint - startpoint) / divide
+    stations = place_stations(index, length, startpoint, endpoint, distance,
+                              force_last, force_first_last, divide)
+    timer.add(PHASE_INTERPOLATION, perf_counter() - measured)
+    return stations
+
+
+def _station_fields(source_fields, copy_attributes=None):
+    """Build the fields of station features ('dist' plus copied attributes).
     
-    # Prepare feature fields
+    'dist' is always the first field (DIST_FIELD_INDEX).
+    """
     fields = QgsFields()
     fields.append(QgsField("dist", QVariant.Double))
     
     # Add selected attributes from source feature
-    if source_feature and copy_attributes:
-        source_fields = source_feature.fields()
+    if source_fields is not None and copy_attributes:
         for attr_name in copy_attributes:
             field_index = source_fields.indexFromName(attr_name)
             if field_index >= 0:
                 field = source_fields.field(attr_name)
                 fields.append(QgsField(field.name(), field.type()))
+    return fields
+
+
+def _station_features(fields, stations, source_feature=None, attribute_map=None):
+    """Create point features for (dist, x, y) stations.
     
+    Every feature is filled with a single setAttributes() call from the
+    attribute list prepared once for the source feature.
+    """
+    attributes = _attribute_values(fields, source_feature, attribute_map)
     features = []
-    current_distance = startpoint
-    
-    # For divide mode or force_first_last, use exact calculation
-    if divide > 0 or force_first_last:
-        # Treat force_first_last as divide=1 (2 points: start and end)
-        num_divisions = divide if divide > 0 else 1
-        
-        # Create start point
-        point = geom.interpolate(startpoint)
-        feature = create_feature_with_point(fields, point, startpoint,
-                                           source_feature, copy_attributes)
-        if feature:
-            features.append(feature)
-        
-        # Create intermediate and end points
-        for i in range(1, num_divisions + 1):
-            point_distance = startpoint + (distance * i)
-            # Ensure we use exact endpoint for the last point
-            if i == num_divisions:
-                point_distance = endpoint
-                point_distance_geom = endpoint_geom  # Use geometry-based endpoint for interpolation
-            else:
-                point_distance_geom = point_distance
-            point = geom.interpolate(point_distance_geom)
-            feature = create_feature_with_point(fields, point, point_distance,
-                                               source_feature, copy_attributes)
-            if feature:
-                features.append(feature)
-    else:
-        # Create points along the line using distance intervals
-        while current_distance <= endpoint:
-            # Scale current_distance to geometry length for interpolation
-            if length > 0:
-                current_distance_geom = (current_distance / length) * geom_length
-            else:
-                current_distance_geom = current_distance
-            
-            point = geom.interpolate(current_distance_geom)
-            feature = create_feature_with_point(fields, point, current_distance,
-                                               source_feature, copy_attributes)
-            if feature:
-                features.append(feature)
-            
-            # Move to next distance
-            current_distance += distance
-            
-            # Safety check to prevent infinite loop
-            if distance <= 0:
-                break
-        
-        # Add last point if requested or in force_first_last mode
-        if force_last or force_first_last:
-            # Check if we need to add the endpoint
-            should_add_endpoint = True
-            if features:
-                # Don't add if we already have a point very close to the endpoint
-                # Use relative tolerance: 0.1% of the distance or 0.001, whichever is larger
-                last_dist = features[-1]['dist']
-                tolerance = max(0.001, abs(endpoint) * 0.001)
-                if abs(last_dist - endpoint) < tolerance:
-                    should_add_endpoint = False
-            
-            if should_add_endpoint:
-                # Use geometry-scaled endpoint for interpolation
-                point = geom.interpolate(endpoint_geom)
-                feature = create_feature_with_point(fields, point, endpoint,
-                                                   source_feature, copy_attributes)
-                if feature:
-                    features.append(feature)
-    
+    for dist, x, y in stations:
+        feature = QgsFeature(fields)
+        feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(x, y)))
+        attributes[DIST_FIELD_INDEX] = dist
+        feature.setAttributes(attributes)
+        features.append(feature)
     return features
 
 
-def points_along_line(layerout, startpoint, endpoint, distance, layer,
-                      selected_only=True, force_last=False, force_first_last=False,
-                      divide=0, use_ellipsoidal=True, distance_units=None, copy_attributes=None,
-                      reverse=False):
-    """Create a memory layer with points at specified intervals along line features.
+def uses_meter_based_placement(layer_units, distance_units):
+    """Return True if stations must be placed by real-world distance.
     
-    Args:
-        layerout: Name for the output layer
-        startpoint: Starting distance along line
-        endpoint: Ending distance along line
-        distance: Interval distance between points
-        layer: Source line layer
-        selected_only: Process only selected features
-        force_last: Force inclusion of endpoint
-        force_first_last: Create only start and end points
-        divide: Divide line into N equal parts
-        use_ellipsoidal: Use ellipsoidal (geodesic) distances
-        distance_units: Units for distance measurements
-        copy_attributes: List of attribute names to copy from source features (None = no copy)
-        reverse: Reverse the chainage direction (start from end)
+    This is the case for linear distance units on a layer in a geographic
+    CRS, see create_points_by_distance().
     """
-    # Create output layer
-    virt_layer = QgsVectorLayer(
-        f"Point?crs={layer.crs().authid()}", 
-        layerout, 
-        "memory"
-    )
-    provider = virt_layer.dataProvider()
-    
-    # If no distance units provided, use layer units
-    if distance_units is None:
-        distance_units = layer.crs().mapUnits()
+    return (layer_units == QgsUnitTypes.DistanceDegrees and
+            distance_units != QgsUnitTypes.DistanceDegrees)
+
+
+def output_fields(source_fields, distance_units, copy_attributes=None):
+    """Build the fields of the chainage output layer.
     
+    Args:
+        source_fields: QgsFields of the source layer
+        distance_units: Units used for the chainage field name
+        copy_attributes: List of attribute names copied from the source layer
+    """
     # Set up layer attributes - use the selected distance units for field name
     unitname = QgsUnitTypes.toString(distance_units)
     
     # Start with standard chainage attribute
-    attributes = [
-        QgsField(f"cng_{unitname}", QVariant.Double)
-    ]
+    fields = QgsFields()
+    fields.append(QgsField(f"cng_{unitname}", QVariant.Double))
     
     # Add selected attributes from source layer
     if copy_attributes:
-        source_fields = layer.fields()
         for attr_name in copy_attributes:
             field = source_fields.field(attr_name)
             if field:
-                attributes.append(QgsField(field.name(), field.type()))
+                fields.append(QgsField(field.name(), field.type()))
+    return fields
+
+
+def create_output_layer(layerout, crs, source_fields, distance_units,
+                        copy_attributes=None):
+    """Create an empty memory point layer for chainage output.
     
-    provider.addAttributes(attributes)
+    Args:
+        layerout: Name for the output layer
+        crs: CRS of the output layer (same as the source layer)
+        source_fields: QgsFields of the source layer
+        distance_units: Units used for the chainage field name
+        copy_attributes: List of attribute names copied from the source layer
+    """
+    virt_layer = QgsVectorLayer(
+        f"Point?crs={crs.authid()}", 
+        layerout, 
+        "memory"
+    )
+    provider = virt_layer.dataProvider()
+    provider.addAttributes(
+        output_fields(source_fields, distance_units, copy_attributes).toList()
+    )
     virt_layer.updateFields()
+    return virt_layer
+
+
+def iter_chainage_features(features, layer_crs, startpoint, endpoint, distance,
+                           force_last=False, force_first_last=False, divide=0,
+                           use_ellipsoidal=True, distance_units=None,
+                           copy_attributes=None, reverse=False, engine=ENGINE_AUTO,
+                           feedback=None, feature_count=0, workers=1,
+                           batch_size=DEFAULT_BATCH_SIZE, context=None):
+    """Yield lists of chainage point features for an iterable of line features.
     
-    # Process features
-    features_to_process = (layer.selectedFeatures() if selected_only 
-                          else layer.getFeatures())
+    Point features are yielded in source feature order, then station order,
+    one list per source feature with stations (see iter_chainage_stations).
+    Iteration stops early when feedback is canceled.
     
-    all_point_features = []
-    for feature in features_to_process:
-        geom = feature.geometry()
-        if geom:
-            point_features = create_points(
-                startpoint, endpoint, distance, geom,
-                force_last, force_first_last, divide, layer.crs(), use_ellipsoidal,
-                distance_units, feature, copy_attributes, reverse
-            )
-            all_point_features.extend(point_features)
+    Args:
+        features: Iterable of source line features
+        layer_crs: CRS of the source layer
+        feedback: Optional object with isCanceled() and setProgress(), such as
+            a QgsFeedback or a QgsTask
+        feature_count: Number of features, used to report progress
+        workers: Number of worker processes; more than 1 enables the parallel
+            mode (see _iter_chainage_stations_parallel)
+        batch_size: Number of features sent to a worker process at once
+        context: ChainageContext of the run; built from layer_crs,
+            use_ellipsoidal, distance_units and copy_attributes if not given
+        
+    The remaining arguments are passed on to create_points().
+    """
+    if context is None:
+        features, context = _first_feature_context(features, layer_crs, use_ellipsoidal,
+                                                   distance_units, copy_attributes)
+        if context is None:
+            return
+    
+    fields = context.station_fields
+    attribute_map = context.attribute_map
+    timer = context.timer
+    for source_feature, stations in iter_chainage_stations(
+            features, layer_crs, startpoint, endpoint, distance,
+            force_last, force_first_last, divide, use_ellipsoidal, distance_units,
+            copy_attributes, reverse, engine, feedback, feature_count,
+            workers, batch_size, context):
+        start = perf_counter()
+        point_features = _station_features(fields, stations, source_feature, attribute_map)
+        timer.add(PHASE_FEATURES, perf_counter() - start)
+        yield point_features
+
+
+def iter_chainage_stations(features, layer_crs, startpoint, endpoint, distance,
+                           force_last=False, force_first_last=False, divide=0,
+                           use_ellipsoidal=True, distance_units=None,
+                           copy_attributes=None, reverse=False, engine=ENGINE_AUTO,
+                           feedback=None, feature_count=0, workers=1,
+                           batch_size=DEFAULT_BATCH_SIZE, context=None):
+    """Yield (source feature, stations) for an iterable of line features.
+    
+    Takes the same arguments as iter_chainage_features(), but yields the
+    (dist, x, y) stations of each line feature instead of point features,
+    in source feature order. Features without a usable line are counted as
+    skipped and not yielded.
+    """
+    if context is None:
+        features, context = _first_feature_context(features, layer_crs, use_ellipsoidal,
+                                                   distance_units, copy_attributes)
+        if context is None:
+            return
     
-    # Add all features at once (more efficient)
-    if all_point_features:
-        provider.addFeatures(all_point_features)
+    run_result = context.result
+    if workers > 1 and not context.meter_based:
+        run_result.workers = workers
+        yield from _iter_chainage_stations_parallel(
+            features, context, startpoint, endpoint, distance,
+            force_last, force_first_last, divide, reverse, engine,
+            feedback, feature_count, workers, batch_size
+        )
+        return
+    
+    timer = context.timer
+    features = iter(features)
+    current = 0
+    while True:
+        if feedback is not None and feedback.isCanceled():
+            return
+        start = perf_counter()
+        feature = next(features, None)
+        timer.add(PHASE_READ, perf_counter() - start)
+        if feature is None:
+            return
+        current += 1
+        
+        geom = feature.geometry()
+        if _is_line(geom):
+            stations = context.clip_stations(create_stations(
+                context, startpoint, endpoint, distance, geom,
+                force_last, force_first_last, divide, reverse, engine
+            ))
+            run_result.add_feature(len(stations))
+            yield feature, stations
+        else:
+            run_result.skip_feature()
+        
+        if feedback is not None and feature_count > 0:
+            feedback.setProgress(100.0 * current / feature_count)
+
+
+def _first_feature_context(features, layer_crs, use_ellipsoidal, distance_units,
+                           copy_attributes):
+    """Build the ChainageContext of a run from the fields of its first feature.
+    
+    Returns (features, context); context is None if there are no features.
+    """
+    features = iter(features)
+    first = next(features, None)
+    if first is None:
+        return features, None
+    context = ChainageContext(layer_crs, first.fields(), use_ellipsoidal,
+                              distance_units, copy_attributes)
+    return _chain_first(first, features), context
+
+
+def _chain_first(first, rest):
+    """Yield first, then every item of rest."""
+    yield first
+    yield from rest
+
+
+def create_chainage_features(features, layer_crs, startpoint, endpoint, distance,
+                             force_last=False, force_first_last=False, divide=0,
+                             use_ellipsoidal=True, distance_units=None,
+                             copy_attributes=None, reverse=False, engine=ENGINE_AUTO,
+                             feedback=None, feature_count=0, workers=1,
+                             batch_size=DEFAULT_BATCH_SIZE, context=None):
+    """Create chainage point features for an iterable of line features.
+    
+    Takes the same arguments as iter_chainage_features(). Returns the list of
+    point features, or None if feedback was canceled. Large runs should use
+    collect_chainage_stations() instead, which keeps the stations compact.
+    """
+    all_point_features = []
+    for point_features in iter_chainage_features(
+            features, layer_crs, startpoint, endpoint, distance,
+            force_last, force_first_last, divide, use_ellipsoidal, distance_units,
+            copy_attributes, reverse, engine, feedback, feature_count,
+            workers, batch_size, context):
+        all_point_features.extend(point_features)
+    
+    if feedback is not None and feedback.isCanceled():
+        return None
+    return all_point_features
+
+
+def collect_chainage_stations(features, layer_crs, startpoint, endpoint, distance,
+                              force_last=False, force_first_last=False, divide=0,
+                              use_ellipsoidal=True, distance_units=None,
+                              copy_attributes=None, reverse=False, engine=ENGINE_AUTO,
+                              feedback=None, feature_count=0, workers=1,
+                              batch_size=DEFAULT_BATCH_SIZE, context=None):
+    """Collect the chainage stations of an iterable of line features.
+    
+    Takes the same arguments as iter_chainage_features(). Returns a
+    StationBuffer of the stations (point features are created from it at
+    write time, see iter_buffered_features), or None if feedback was
+    canceled.
+    """
+    if context is None:
+        features, context = _first_feature_context(features, layer_crs, use_ellipsoidal,
+                                                   distance_units, copy_attributes)
+        if context is None:
+            return StationBuffer()
+    
+    stations = StationBuffer()
+    for source_feature, source_stations in iter_chainage_stations(
+            features, layer_crs, startpoint, endpoint, distance,
+            force_last, force_first_last, divide, use_ellipsoidal, distance_units,
+            copy_attributes, reverse, engine, feedback, feature_count,
+            workers, batch_size, context):
+        buffer_stations(stations, source_stations, source_feature, context)
+    
+    if feedback is not None and feedback.isCanceled():
+        return None
+    return stations
+
+
+def buffer_stations(buffer, stations, source_feature, context):
+    """Append the (dist, x, y) stations of a source feature to a StationBuffer.
+    
+    The copied attribute values of the source feature are stored once for
+    all of its stations.
+    """
+    if not stations:
+        return
+    fid = source_feature.id() if source_feature is not None else -1
+    source = buffer.add_source(
+        _attribute_values(context.station_fields, source_feature, context.attribute_map)
+    )
+    buffer.extend(stations, fid, source)
+
+
+def iter_buffered_features(buffer, fields, chunk_size=DEFAULT_CHUNK_SIZE, timer=None):
+    """Yield the point features of a StationBuffer in lists of chunk_size.
+    
+    Features are only created chunk by chunk, so at most chunk_size of them
+    exist at a time. Time is added to timer (a PhaseTimer) if given.
+    """
+    if timer is None:
+        timer = PhaseTimer()
+    for start, stop in buffer.chunks(chunk_size):
+        with timer.measure(PHASE_FEATURES):
+            features = []
+            for dist, x, y, _, attributes in buffer.rows(start, stop):
+                feature = QgsFeature(fields)
+                feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(x, y)))
+                attributes[DIST_FIELD_INDEX] = dist
+                feature.setAttributes(attributes)
+                features.append(feature)
+        yield features
+
+
+def _pool_context():
+    """Return a 'spawn' multiprocessing context whose workers run plain Python.
+    
+    Inside the QGIS application sys.executable points to the QGIS binary, so
+    the Python interpreter of the same installation is used for workers.
+    """
+    context = multiprocessing.get_context('spawn')
+    if os.path.basename(sys.executable).lower().startswith('python'):
+        return context
+    
+    for folder in (sys.exec_prefix, os.path.join(sys.exec_prefix, 'bin')):
+        for name in ('python3', 'python', 'python3.exe', 'python.exe'):
+            candidate = os.path.join(folder, name)
+            if os.path.isfile(candidate):
+                context.set_executable(candidate)
+                return context
+    return context
+
+
+def _iter_chainage_stations_parallel(features, context, startpoint, endpoint, distance,
+                                     force_last, force_first_last, divide,
+                                     reverse, engine, feedback, feature_count,
+                                     workers, batch_size):
+    """Yield (source feature, stations) computed by a pool of worker processes.
+    
+    Line geometries are sent to the workers as WKB in batches of batch_size
+    features and processed by the QGIS-free chainagekernel.chainage_batch().
+    The pool is started once per run and at most two batches per worker are
+    in flight, so memory stays bounded. Results are yielded in source feature
+    order, exactly like the serial path. Curved lines are processed in this
+    process with create_stations().
+    
+    Layers that need meter-based placement (see uses_meter_based_placement)
+    are handled by the serial path instead.
+    """
+    distance_area = context.distance_area
+    
+    if context.is_geographic:
+        length_mode = LENGTH_VERTEX_CHAIN
+    elif distance_area is not None:
+        length_mode = LENGTH_MEASURED
+    else:
+        length_mode = LENGTH_PLANAR
+    
+    # Curved lines are processed in this process with the unconverted values
+    user_distances = (startpoint, endpoint, distance)
+    
+    # Convert distance from user units to layer units once for the run
+    startpoint, endpoint, distance = context.to_layer_units(startpoint, endpoint, distance)
+    
+    params = {
+        'startpoint': startpoint,
+        'endpoint': endpoint,
+        'distance': distance,
+        'force_last': force_last,
+        'force_first_last': force_first_last,
+        'divide': divide,
+        'reverse': reverse,
+        'engine': engine,
+        'length_mode': length_mode,
+    }
+    
+    timer = context.timer
+    run_result = context.result
+    processed = 0
+    # Entries are (source features, future) for worker batches and
+    # (source feature, stations) for lines processed in this process
+    pending = deque()
+    batch_items = []
+    batch_sources = []
+    
+    def collect(entry):
+        """Return the (source, stations) pairs of a pending entry and report progress."""
+        nonlocal processed
+        sources, result = entry
+        if not isinstance(sources, list):
+            pairs = [(sources, result)]
+        else:
+            # Waiting for a worker counts as interpolation
+            start = perf_counter()
+            pairs = list(zip(sources, result.result()))
+            timer.add(PHASE_INTERPOLATION, perf_counter() - start)
+        if context.clip is not None:
+            pairs = [(source, context.clip_stations(stations))
+                     for source, stations in pairs]
+        for _, stations in pairs:
+            run_result.add_feature(len(stations))
+        processed += len(pairs)
+        if feedback is not None and feature_count > 0:
+            feedback.setProgress(100.0 * processed / feature_count)
+        return pairs
+    
+    with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context()) as executor:
+        def submit_batch():
+            if batch_items:
+                pending.append((list(batch_sources),
+                                executor.submit(chainagekernel.chainage_batch,
+                                                list(batch_items), params)))
+                batch_items.clear()
+                batch_sources.clear()
+        
+        features = iter(features)
+        while True:
+            if feedback is not None and feedback.isCanceled():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return
+            
+            start = perf_counter()
+            feature = next(features, None)
+            timer.add(PHASE_READ, perf_counter() - start)
+            if feature is None:
+                break
+            
+            geom = feature.geometry()
+            if not _is_line(geom):
+                run_result.skip_feature()
+                processed += 1
+                continue
+            
+            if QgsWkbTypes.isCurvedType(geom.wkbType()):
+                # Keep the output order: flush the current batch first
+                submit_batch()
+                pending.append((feature, create_stations(
+                    context, *user_distances, geom, force_last, force_first_last,
+                    divide, reverse, engine
+                )))
+            else:
+                measured_length = (distance_area.measureLength(geom)
+                                   if length_mode == LENGTH_MEASURED else None)
+                batch_items.append((bytes(geom.asWkb()), measured_length))
+                batch_sources.append(feature)
+                if len(batch_items) >= batch_size:
+                    submit_batch()
+            
+            while len(pending) > 2 * workers:
+                yield from collect(pending.popleft())
+        
+        submit_batch()
+        while pending:
+            if feedback is not None and feedback.isCanceled():
+                executor.shutdown(wait=False, cancel_futures=True)
+                return
+            yield from collect(pending.popleft())
+
+
+def _output_driver(path):
+    """Return the OGR driver name for an output file path."""
+    extension = os.path.splitext(path)[1].lower()
+    driver = OUTPUT_DRIVERS.get(extension) or QgsVectorFileWriter.driverForExtension(extension)
+    if not driver:
+        raise ValueError(f"Unsupported output file format: {path}")
+    return driver
+
+
+def _delete_output_file(path):
+    """Remove a (partially) written output file."""
+    if _output_driver(path) == 'ESRI Shapefile':
+        QgsVectorFileWriter.deleteShapeFile(path)
+    elif os.path.exists(path):
+        os.remove(path)
+
+
+def write_chainage_file(station_batches, path, layerout, context,
+                        chunk_size=DEFAULT_CHUNK_SIZE, feedback=None):
+    """Stream chainage points to a GeoPackage, FlatGeobuf or Shapefile.
+    
+    Stations are collected in a compact StationBuffer and turned into point
+    features only when chunk_size of them are handed to a
+    QgsVectorFileWriter, so memory use does not grow with the number of
+    stations. For GeoPackage the writer keeps all inserts in one OGR
+    transaction that is committed when the file is closed.
+    
+    Args:
+        station_batches: Iterable of (source feature, stations) pairs, e.g.
+            from iter_chainage_stations()
+        path: Output file path, the format follows the extension
+        layerout: Name of the output layer (used inside a GeoPackage)
+        context: ChainageContext of the run; provides the CRS and fields of
+            the output and receives the time spent writing, the number of
+            written points and the largest buffered chunk in its result
+        chunk_size: Number of features written at once
+        feedback: Optional object with isCanceled()
+        
+    Returns the number of features written, or None if canceled.
+    Raises OSError if the file cannot be written. A canceled or failed run
+    removes the partially written file.
+    """
+    result = context.result
+    timer = result.timer
+    
+    options = QgsVectorFileWriter.SaveVectorOptions()
+    options.driverName = _output_driver(path)
+    options.layerName = layerout
+    options.fileEncoding = "UTF-8"
+    
+    writer = QgsVectorFileWriter.create(
+        path, context.fields, QgsWkbTypes.Point, context.layer_crs,
+        QgsCoordinateTransformContext(), options
+    )
+    if writer.hasError() != QgsVectorFileWriter.NoError:
+        raise OSError(f"Cannot create {path}: {writer.errorMessage()}")
+    
+    written = 0
+    buffer = StationBuffer()
+    
+    def flush():
+        """Write the buffered stations and empty the buffer."""
+        result.buffered(len(buffer))
+        for features in iter_buffered_features(buffer, context.station_fields,
+                                               chunk_size, timer):
+            with timer.measure(PHASE_WRITE):
+                if not writer.addFeatures(features):
+                    raise OSError(f"Cannot write to {path}: {writer.errorMessage()}")
+        buffer.clear()
+    
+    completed = False
+    try:
+        for source_feature, stations in station_batches:
+            buffer_stations(buffer, stations, source_feature, context)
+            if len(buffer) >= chunk_size:
+                written += len(buffer)
+                flush()
+        
+        if len(buffer):
+            written += len(buffer)
+            flush()
+        completed = True
+    finally:
+        # Closing the writer flushes and commits the file
+        with timer.measure(PHASE_WRITE):
+            del writer
+        canceled = feedback is not None and feedback.isCanceled()
+        if canceled or not completed:
+            # A truncated file would look like a valid result
+            _delete_output_file(path)
+    
+    if canceled:
+        return None
+    result.points_written = written
+    return written
+
+
+def load_output_file(path, layerout):
+    """Load a written chainage file as a vector layer."""
+    uri = path
+    if _output_driver(path) == 'GPKG':
+        uri = f"{path}|layername={layerout}"
+    return QgsVectorLayer(uri, layerout, "ogr")
+
+
+def source_feature_request(layer, selected_only=True, copy_attributes=None,
+                           filter_expression=None, clip=None):
+    """Build the request used to read the source line features.
+    
+    layer may be a QgsVectorLayer or any feature source (e.g. in processing)
+    when selected_only is False.
+    
+    Only the geometry and the copied attributes are fetched, a selection is
+    passed as a feature id filter and filter_expression (if any) is handed
+    to the provider, which compiles it to SQL where it can (PostGIS,
+    GeoPackage, SpatiaLite). With a clip (a ChainageClip) the bounding box
+    of its region becomes the filter rectangle, so the provider's spatial
+    index skips features outside of it.
+    
+    Returns (request, feature_count). With a filter expression or a clip the
+    feature count is the layer (or selection) count, an upper bound used
+    for progress only.
+    """
+    request = QgsFeatureRequest()
+    request.setSubsetOfAttributes(list(copy_attributes or []), layer.fields())
+    
+    if selected_only:
+        selected_ids = layer.selectedFeatureIds()
+        request.setFilterFids(selected_ids)
+        feature_count = len(selected_ids)
+    else:
+        feature_count = layer.featureCount()
+    
+    if filter_expression:
+        request.setFilterExpression(filter_expression)
+    if clip is not None:
+        request.setFilterRect(clip.rect)
+    return request, feature_count
+
+
+def add_output_layer(virt_layer, stations, context, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Write buffered stations to the output layer and add it to the project.
+    
+    Point features are created from the StationBuffer and added to the
+    provider chunk by chunk (see iter_buffered_features). Time and the
+    number of written points are recorded in the result of context.
+    """
+    result = context.result
+    timer = result.timer
+    result.buffered(len(stations))
+    
+    provider = virt_layer.dataProvider()
+    for features in iter_buffered_features(stations, context.station_fields,
+                                           chunk_size, timer):
+        with timer.measure(PHASE_WRITE):
+            provider.addFeatures(features)
+    with timer.measure(PHASE_WRITE):
+        virt_layer.updateExtents()
+    result.points_written = len(stations)
+    
+    with timer.measure(PHASE_PROJECT):
+        QgsProject.instance().addMapLayers([virt_layer])
+        virt_layer.triggerRepaint()
+
+
+def log_result(layerout, result, profile_path=None):
+    """Log the counters and phase times of a run to the message log."""
+    QgsMessageLog.logMessage(f"Chainage {layerout}: {result.summary()}", "QChainage")
+    log_timings(layerout, result.timer, profile_path)
+
+
+def log_timings(layerout, timer, profile_path=None):
+    """Log the phase times of a run (and its profile file) to the message log."""
+    QgsMessageLog.logMessage(f"Timing for {layerout}: {timer.summary()}", "QChainage")
+    if profile_path:
+        QgsMessageLog.logMessage(f"Profile of {layerout} written to {profile_path}",
+                                 "QChainage")
+
+
+def points_along_line(layerout, startpoint, endpoint, distance, layer,
+                      selected_only=True, force_last=False, force_first_last=False,
+                      divide=0, use_ellipsoidal=True, distance_units=None, copy_attributes=None,
+                      reverse=False, engine=ENGINE_AUTO, feedback=None, workers=1,
+                      batch_size=DEFAULT_BATCH_SIZE, output_path=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE, filter_expression=None, cache=None,
+                      clip=None):
+    """Create a layer with points at specified intervals along line features.
+    
+    Args:
+        layerout: Name for the output layer
+        startpoint: Starting distance along line
+        endpoint: Ending distance along line
+        distance: Interval distance between points
+        layer: Source line layer
+        selected_only: Process only selected features
+        force_last: Force inclusion of endpoint
+        force_first_last: Create only start and end points
+        divide: Divide line into N equal parts
+        use_ellipsoidal: Use ellipsoidal (geodesic) distances
+        distance_units: Units for distance measurements
+        copy_attributes: List of attribute names to copy from source features (None = no copy)
+        reverse: Reverse the chainage direction (start from end)
+        engine: Station placement engine (ENGINE_AUTO, ENGINE_PYTHON or ENGINE_NUMPY)
+        feedback: Optional QgsFeedback for progress and cancellation
+        workers: Number of worker processes (1 = process features in this process)
+        batch_size: Number of features sent to a worker process at once
+        output_path: Optional .gpkg, .fgb or .shp file to stream the points
+            to (see write_chainage_file); by default a memory layer is created
+        chunk_size: Number of point features created and written at once
+        filter_expression: Optional QGIS expression limiting the source
+            features (see source_feature_request)
+        cache: Optional ChainageCache kept by the caller between runs; enables
+            the incremental mode (see _points_along_line_incremental). Not
+            supported together with output_path.
+        clip: Optional QgsRectangle or polygon QgsGeometry in the layer CRS
+            (e.g. from clip_region_from_extent or clip_region_from_layer);
+            only lines intersecting its bounding box are read and stations
+            outside of it are dropped (see ChainageClip)
+        
+    Counters and the time spent in each phase are logged to the message
+    log. If the QCHAINAGE_PROFILE environment variable is set the run is
+    profiled with cProfile (see chainagestats.profile_run).
+        
+    Returns a ChainageResult holding the output layer (None if the run was
+    canceled), the feature and point counters and the phase timings; use
+    its to_json() for monitoring.
+    """
+    if cache is not None and output_path:
+        raise ValueError("Incremental chainage updates a memory layer, "
+                         "output_path is not supported")
+    
+    with profile_run(layerout) as profile_path:
+        if cache is not None:
+            result = _points_along_line_incremental(
+                layerout, startpoint, endpoint, distance, layer, selected_only,
+                force_last, force_first_last, divide, use_ellipsoidal, distance_units,
+                copy_attributes, reverse, engine, feedback, chunk_size,
+                filter_expression, cache, clip
+            )
+        else:
+            result = _points_along_line(
+                layerout, startpoint, endpoint, distance, layer, selected_only,
+                force_last, force_first_last, divide, use_ellipsoidal, distance_units,
+                copy_attributes, reverse, engine, feedback, workers, batch_size,
+                output_path, chunk_size, filter_expression, clip
+            )
+    
+    if not result.canceled:
+        log_result(layerout, result, profile_path)
+    return result
+
+
+def _points_along_line(layerout, startpoint, endpoint, distance, layer, selected_only,
+                       force_last, force_first_last, divide, use_ellipsoidal,
+                       distance_units, copy_attributes, reverse, engine, feedback,
+                       workers, batch_size, output_path, chunk_size, filter_expression,
+                       clip):
+    """Run points_along_line() and return its ChainageResult."""
+    # If no distance units provided, use layer units
+    if distance_units is None:
+        distance_units = layer.crs().mapUnits()
+    
+    # Resolve units, distance calculator and fields once for the whole run
+    context = ChainageContext(layer.crs(), layer.fields(), use_ellipsoidal,
+                              distance_units, copy_attributes, clip=clip)
+    result = context.result
+    
+    # Process features, fetching only what is needed from the provider
+    request, feature_count = source_feature_request(layer, selected_only, copy_attributes,
+                                                    filter_expression, context.clip)
+    features_to_process = layer.getFeatures(request)
+    
+    args = (
+        features_to_process, layer.crs(), startpoint, endpoint, distance,
+        force_last, force_first_last, divide, use_ellipsoidal, distance_units,
+        copy_attributes, reverse, engine, feedback, feature_count,
+        workers, batch_size, context
+    )
+    
+    if output_path:
+        written = write_chainage_file(iter_chainage_stations(*args), output_path,
+                                      layerout, context, chunk_size, feedback)
+        if written is None:
+            result.canceled = True
+            return result
+        with context.timer.measure(PHASE_PROJECT):
+            result.layer = load_output_file(output_path, layerout)
+            QgsProject.instance().addMapLayers([result.layer])
+        return result
+    
+    # Create output layer
+    virt_layer = create_output_layer(layerout, layer.crs(), layer.fields(),
+                                     distance_units, copy_attributes)
+    stations = collect_chainage_stations(*args)
+    if stations is None:
+        result.canceled = True
+        return result
+    
+    add_output_layer(virt_layer, stations, context, chunk_size)
+    result.layer = virt_layer
+    return result
+
+
+def watch_layer(cache, layer, on_change=None):
+    """Invalidate entries of a ChainageCache from the edit signals of layer.
+    
+    Changed, added and deleted features are collected in cache.dirty, so
+    incremental runs over the whole layer only read those features instead
+    of comparing the keys of every feature. A rollback of the edit buffer
+    makes the next run compare all keys again. When edits are committed the
+    temporary (negative) ids of added features are invalidated, since the
+    features get new ids.
+    
+    Args:
+        cache: ChainageCache to invalidate
+        layer: Source QgsVectorLayer
+        on_change: Optional callable invoked without arguments after every
+            invalidation (e.g. to schedule an update)
+        
+    Returns a callable that disconnects the signals again.
+    """
+    def changed():
+        if on_change is not None:
+            on_change()
+    
+    def feature_changed(fid, *args):
+        cache.invalidate(fid)
+        changed()
+    
+    def features_committed(layer_id, features):
+        for fid in cache.fids():
+            if fid < 0:
+                cache.invalidate(fid)
+        for feature in features:
+            cache.invalidate(feature.id())
+        changed()
+    
+    def rolled_back():
+        cache.require_scan()
+        changed()
+    
+    connections = [
+        (layer.geometryChanged, feature_changed),
+        (layer.attributeValueChanged, feature_changed),
+        (layer.featureAdded, feature_changed),
+        (layer.featureDeleted, feature_changed),
+        (layer.committedFeaturesAdded, features_committed),
+        (layer.afterRollBack, rolled_back),
+    ]
+    for signal, slot in connections:
+        signal.connect(slot)
+    cache.watched = True
+    
+    def unwatch():
+        for signal, slot in connections:
+            signal.disconnect(slot)
+        cache.watched = False
+    
+    return unwatch
+
+
+def update_chainage_output(cache, out_layer, context, features, candidates, startpoint,
+                           endpoint, distance, force_last=False, force_first_last=False,
+                           divide=0, reverse=False, engine=ENGINE_AUTO,
+                           chunk_size=DEFAULT_CHUNK_SIZE, feedback=None, feature_count=0):
+    """Apply the changed source features to a cached chainage output layer.
+    
+    Every feature is keyed by a hash of its geometry and copied attributes
+    (see chainagecache.feature_key). Features whose key matches the cache
+    keep their points; new and changed features are recomputed. The points
+    of changed features and of candidates that are not among features
+    (deleted ones) are removed from the provider of out_layer in one
+    deleteFeatures() call, the new points are added in chunks.
+    
+    Args:
+        cache: ChainageCache of the output layer
+        out_layer: Output layer, updated in place
+        context: ChainageContext of the run
+        features: Iterable of the source features to check
+        candidates: Source feature ids expected among features; cached ids
+            that are missing are treated as deleted
+        feedback: Optional object with isCanceled() and setProgress()
+        feature_count: Number of features, used to report progress
+        
+    The station arguments are those of create_stations(). Returns False if
+    feedback was canceled (the output layer and cache are left unchanged),
+    True otherwise.
+    """
+    result = context.result
+    timer = context.timer
+    source_indexes = [source_index for _, source_index in context.attribute_map]
+    seen = set()
+    changed = []
+    features = iter(features)
+    current = 0
+    while True:
+        if feedback is not None and feedback.isCanceled():
+            return False
+        start = perf_counter()
+        feature = next(features, None)
+        timer.add(PHASE_READ, perf_counter() - start)
+        if feature is None:
+            break
+        current += 1
+        
+        fid = feature.id()
+        seen.add(fid)
+        geom = feature.geometry()
+        values = feature.attributes()
+        key = feature_key(geom.asWkb(), [values[i] for i in source_indexes])
+        if cache.is_current(fid, key):
+            result.reuse_feature()
+        elif _is_line(geom):
+            stations = context.clip_stations(create_stations(
+                context, startpoint, endpoint, distance, geom, force_last,
+                force_first_last, divide, reverse, engine
+            ))
+            result.add_feature(len(stations))
+            changed.append((fid, key, feature, stations))
+        else:
+            result.skip_feature()
+            changed.append((fid, key, feature, []))
+        
+        if feedback is not None and feature_count > 0:
+            feedback.setProgress(100.0 * current / feature_count)
+    
+    # Points of changed features and of features that no longer exist go away
+    stale_outputs = []
+    for fid, _, _, _ in changed:
+        stale_outputs.extend(cache.pop(fid))
+    for fid in set(candidates) - seen:
+        if fid in cache:
+            stale_outputs.extend(cache.pop(fid))
+            result.remove_feature()
+    
+    provider = out_layer.dataProvider()
+    if stale_outputs:
+        with timer.measure(PHASE_WRITE):
+            provider.deleteFeatures(stale_outputs)
+    
+    # Add the new points in chunks, remembering their ids per source feature
+    pending = []
+    chunk = []
+    
+    def flush():
+        added = []
+        if chunk:
+            result.buffered(len(chunk))
+            with timer.measure(PHASE_WRITE):
+                _, added = provider.addFeatures(chunk)
+        offset = 0
+        for fid, key, count in pending:
+            cache.store(fid, key, [f.id() for f in added[offset:offset + count]])
+            offset += count
+        result.points_written += len(chunk)
+        pending.clear()
+        chunk.clear()
+    
+    for fid, key, feature, stations in changed:
+        start = perf_counter()
+        point_features = _station_features(context.station_fields, stations, feature,
+                                           context.attribute_map)
+        timer.add(PHASE_FEATURES, perf_counter() - start)
+        pending.append((fid, key, len(point_features)))
+        chunk.extend(point_features)
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+    
+    with timer.measure(PHASE_WRITE):
+        out_layer.updateExtents()
+    cache.output_layer = out_layer
+    cache.mark_clean()
+    return True
+
+
+def _points_along_line_incremental(layerout, startpoint, endpoint, distance, layer,
+                                   selected_only, force_last, force_first_last, divide,
+                                   use_ellipsoidal, distance_units, copy_attributes,
+                                   reverse, engine, feedback, chunk_size,
+                                   filter_expression, cache, clip):
+    """Update the output layer of a previous run for the changed source features.
+    
+    New and changed features are recomputed and the points of changed and
+    deleted features are removed from the output layer, which is updated
+    in place (see update_chainage_output). With a watched cache (see
+    watch_layer) only the features reported by edit signals are read,
+    otherwise the keys of all source features are compared.
+    
+    A new output layer is created on the first run, when the parameters
+    differ from the cached ones or when the previous output layer was
+    removed from the project. Features are processed in this process.
+    
+    Returns the ChainageResult of the run; features_processed only counts
+    recomputed features.
+    """
+    if distance_units is None:
+        distance_units = layer.crs().mapUnits()
+    
+    context = ChainageContext(layer.crs(), layer.fields(), use_ellipsoidal,
+                              distance_units, copy_attributes, clip=clip)
+    result = context.result
+    params = (layer.id(), startpoint, endpoint, distance, force_last, force_first_last,
+              divide, use_ellipsoidal, distance_units, tuple(copy_attributes or ()),
+              reverse, selected_only, filter_expression,
+              context.clip.key() if context.clip is not None else None)
+    
+    project = QgsProject.instance()
+    out_layer = cache.output_layer
+    if out_layer is not None and project.mapLayer(out_layer.id()) is None:
+        out_layer = None
+    new_layer = out_layer is None or cache.params != params
+    if new_layer:
+        # Output fields follow the parameters, so start over with a new layer
+        if out_layer is not None:
+            project.removeMapLayer(out_layer.id())
+        out_layer = create_output_layer(layerout, layer.crs(), layer.fields(),
+                                        distance_units, copy_attributes)
+        cache.reset(params)
+    
+    request, feature_count = source_feature_request(layer, selected_only, copy_attributes,
+                                                    filter_expression, context.clip)
+    if (cache.watched and not cache.scan_required and
+            not selected_only and not filter_expression):
+        candidates = set(cache.dirty)
+        request.setFilterFids(list(candidates))
+        feature_count = len(candidates)
+    else:
+        candidates = cache.fids()
+    
+    if not update_chainage_output(cache, out_layer, context, layer.getFeatures(request),
+                                  candidates, startpoint, endpoint, distance, force_last,
+                                  force_first_last, divide, reverse, engine, chunk_size,
+                                  feedback, feature_count):
+        result.canceled = True
+        return result
+    
+    with context.timer.measure(PHASE_PROJECT):
+        if new_layer:
+            project.addMapLayers([out_layer])
+        out_layer.triggerRepaint()
+    result.layer = out_layer
+    return result
+
+
+class _SegmentBoxes(QgsAbstractFeatureIterator):
+    """Features holding the bounding boxes of the segments of a SegmentTable.
+    
+    The feature id is the segment index. Wrapped in a QgsFeatureIterator it
+    lets QgsSpatialIndex bulk load all segments at once.
+    """
+    
+    def __init__(self, table):
+        super().__init__(QgsFeatureRequest())
+        self._table = table
+        self._segment = 0
+    
+    def fetchFeature(self, f):
+        if self._segment >= len(self._table):
+            return False
+        segment = self._segment
+        self._segment += 1
+        f.setId(segment)
+        f.setValid(True)
+        f.setGeometry(QgsGeometry.fromRect(QgsRectangle(*self._table.bounds(segment))))
+        return True
+    
+    def rewind(self):
+        self._segment = 0
+        return True
+    
+    def close(self):
+        return True
+
+
+class SegmentIndex:
+    """Spatial index over the segments of line features, for locating points.
+    
+    The segments of all lines are kept in a chainagekernel.SegmentTable with
+    the measure at their start, and their bounding boxes in a
+    QgsSpatialIndex (an R-tree), so the nearest segment of a point is found
+    in O(log n) and its chainage follows without walking the line. Measures
+    are planar, in layer units, like calculate_cartesian_distance().
+    
+    The spatial index is bulk loaded from all segments on the first lookup
+    (and again after add_route), which builds a better packed tree much
+    faster than inserting the segments one by one.
+    
+    Args:
+        features: Iterable of line features (the routes)
+        route_field: Attribute identifying a route (None = feature id)
+        feedback: Optional object with isCanceled(); building stops early
+            when it is canceled
+    """
+    
+    def __init__(self, features=(), route_field=None, feedback=None):
+        self.table = SegmentTable()
+        self.route_ids = []
+        self._index = None
+        for feature in features:
+            if feedback is not None and feedback.isCanceled():
+                return
+            geom = feature.geometry()
+            if _is_line(geom):
+                self.add_route(_line_parts(geom),
+                               feature[route_field] if route_field else feature.id())
+    
+    def add_route(self, parts, route_id):
+        """Add the segments of a line given as parts (see _line_parts)."""
+        self.table.add_route(parts)
+        self.route_ids.append(route_id)
+        self._index = None
+    
+    @property
+    def index(self):
+        """The QgsSpatialIndex of the segment bounding boxes."""
+        if self._index is None:
+            self._index = QgsSpatialIndex(QgsFeatureIterator(_SegmentBoxes(self.table)))
+        return self._index
+    
+    def __len__(self):
+        return len(self.table)
+    
+    def _closest(self, segments, x, y, best=None):
+        """Return (distance, segment, measure, offset) of the closest of segments."""
+        for segment in segments:
+            measure, offset = self.table.locate(segment, x, y)
+            candidate = (abs(offset), segment, measure, offset)
+            if best is None or candidate < best:
+                best = candidate
+        return best
+    
+    def nearest_segment(self, x, y, max_distance=0):
+        """Return (segment, planar measure, offset) of the point (x, y).
+        
+        See locate(); returns None if there is no segment within
+        max_distance (0 = no limit).
+        """
+        nearest = self.index.nearestNeighbor(QgsPointXY(x, y), 1, max_distance)
+        if not nearest:
+            return None
+        best = self._closest(nearest, x, y)
+        
+        # The spatial index ranks bounding boxes; every segment closer than
+        # the best one so far has its box within that distance
+        distance = best[0]
+        if distance > 0:
+            best = self._closest(self.index.intersects(QgsRectangle(
+                x - distance, y - distance, x + distance, y + distance)), x, y, best)
+        distance, segment, measure, offset = best
+        if max_distance > 0 and distance > max_distance:
+            return None
+        return segment, measure, offset
+    
+    def locate(self, x, y, max_distance=0, reverse=False):
+        """Return (route id, chainage, offset) of the point (x, y).
+        
+        The point is projected onto the nearest segment: the chainage is the
+        distance along its route (from the end with reverse), the offset the
+        distance from the route, positive to the right of the chainage
+        direction. Returns None if there is no segment within max_distance
+        (0 = no limit).
+        """
+        nearest = self.nearest_segment(x, y, max_distance)
+        if nearest is None:
+            return None
+        segment, measure, offset = nearest
+        route = self.table.route[segment]
+        if reverse:
+            measure = self.table.lengths[route] - measure
+            offset = -offset
+        return self.route_ids[route], measure, offset
+
+
+def locate_fields(point_fields, line_fields=None, route_field=None, units=None):
+    """Build the fields of located points.
+    
+    The point fields followed by the route id (ROUTE_FIELD), the chainage
+    ('cng_<units>') and the signed offset (OFFSET_FIELD).
+    
+    Args:
+        point_fields: QgsFields of the point layer
+        line_fields: QgsFields of the line layer (for the route field type)
+        route_field: Attribute identifying a route (None = feature id)
+        units: Map units of the line layer (None = meters)
+    """
+    fields = QgsFields(point_fields)
+    route_type = QVariant.LongLong
+    if route_field and line_fields is not None:
+        route_type = line_fields.field(route_field).type()
+    fields.append(QgsField(ROUTE_FIELD, route_type))
+    unitname = QgsUnitTypes.toString(units if units is not None
+                                     else QgsUnitTypes.DistanceMeters)
+    fields.append(QgsField(f"cng_{unitname}", QVariant.Double))
+    fields.append(QgsField(OFFSET_FIELD, QVariant.Double))
+    return fields
+
+
+def locate_points(points, segment_index, fields, sink, max_distance=0, reverse=False,
+                  transform=None, feedback=None, feature_count=0,
+                  chunk_size=DEFAULT_CHUNK_SIZE):
+    """Locate point features along the routes of a SegmentIndex.
+    
+    Streams the points to sink with their attributes followed by the route
+    id, chainage and offset (see locate_fields and SegmentIndex.locate),
+    chunk_size features at a time. Points without a route within
+    max_distance are written with empty route fields.
+    
+    Args:
+        points: Iterable of point features
+        segment_index: SegmentIndex of the lines
+        fields: Output fields from locate_fields()
+        sink: Anything with addFeatures(), such as a QgsFeatureSink, a
+            QgsVectorFileWriter or a memory layer provider
+        transform: Optional QgsCoordinateTransform from the point CRS to the
+            line CRS; output geometries keep the point CRS
+        feedback: Optional object with isCanceled() and setProgress()
+        feature_count: Number of points, used to report progress
+        
+    Returns (located, unlocated) point counts, or None if canceled.
+    """
+    located = unlocated = 0
+    chunk = []
+    current = 0
+    for feature in points:
+        if feedback is not None and feedback.isCanceled():
+            return None
+        current += 1
+        
+        geom = feature.geometry()
+        location = None
+        if geom and not geom.isNull() and not geom.isEmpty():
+            point = geom.centroid().asPoint() if geom.isMultipart() else geom.asPoint()
+            if transform is not None:
+                point = transform.transform(point)
+            location = segment_index.locate(point.x(), point.y(), max_distance, reverse)
+        
+        out_feature = QgsFeature(fields)
+        out_feature.setGeometry(geom)
+        if location is None:
+            unlocated += 1
+            location = (None, None, None)
+        else:
+            located += 1
+        out_feature.setAttributes(feature.attributes() + list(location))
+        chunk.append(out_feature)
+        if len(chunk) >= chunk_size:
+            sink.addFeatures(chunk)
+            chunk = []
+        
+        if feedback is not None and feature_count > 0:
+            feedback.setProgress(100.0 * current / feature_count)
+    
+    if chunk:
+        sink.addFeatures(chunk)
+    return located, unlocated
+
+
+class RouteIndex:
+    """Measure and point lookups along one line, built once per route.
+    
+    The segments of the line are kept in a SegmentIndex, and the planar and
+    (with a distance calculator) geodesic lengths at the start and end of
+    every segment are accumulated once into array('d') columns. Queries find
+    their segment by bisection over these columns, or through the spatial
+    index for measure_at(), so no query walks the geometry again.
+    
+    Measures are geodesic meters when distance_area is given, otherwise
+    planar lengths in layer units (as in calculate_cartesian_distance).
+    Parts of a multi-line are chained without a connecting segment.
+    
+    Args:
+        geometry: Line QgsGeometry
+        distance_area: Optional QgsDistanceArea for geodesic measures (see
+            setup_distance_calculator)
+        
+    Raises ValueError if geometry is not a non-empty line.
+    """
+    
+    def __init__(self, geometry, distance_area=None):
+        if not _is_line(geometry):
+            raise ValueError("RouteIndex needs a non-empty line geometry")
+        self.distance_area = distance_area
+        self.segments = SegmentIndex()
+        self.segments.add_route(_line_parts(geometry), None)
+        table = self.segments.table
+        if not len(table):
+            raise ValueError("RouteIndex needs a line with at least one segment")
+        
+        self.planar_starts = table.start
+        self.planar_ends = array('d', (
+            table.start[i] + segment_length(table.x0[i], table.y0[i], table.x1[i], table.y1[i])
+            for i in range(len(table))
+        ))
+        self.geodesic_starts = None
+        self.geodesic_ends = None
+        if distance_area is not None:
+            self.geodesic_starts = array('d')
+            self.geodesic_ends = array('d')
+            meters = 0.0
+            for i in range(len(table)):
+                self.geodesic_starts.append(meters)
+                meters += distance_area.measureLine(QgsPointXY(table.x0[i], table.y0[i]),
+                                                    QgsPointXY(table.x1[i], table.y1[i]))
+                self.geodesic_ends.append(meters)
+            self.starts, self.ends = self.geodesic_starts, self.geodesic_ends
+        else:
+            self.starts, self.ends = self.planar_starts, self.planar_ends
+        self.length = self.ends[-1]
+        self._tolerance = NEAR_EPSILON * max(1.0, self.length)
+    
+    def _segment(self, measure, ending=False):
+        """Return the segment containing measure.
+        
+        On a vertex this is the segment starting there, or the one ending
+        there with ending set.
+        """
+        if ending:
+            segment = bisect_left(self.starts, measure) - 1
+        else:
+            segment = bisect_right(self.starts, measure) - 1
+        return min(max(segment, 0), len(self.starts) - 1)
+    
+    def _point(self, segment, measure):
+        """Return the QgsPointXY at measure on segment."""
+        table = self.segments.table
+        span = self.ends[segment] - self.starts[segment]
+        ratio = (measure - self.starts[segment]) / span if span > 0 else 0.0
+        ratio = min(max(ratio, 0.0), 1.0)
+        x0, y0 = table.x0[segment], table.y0[segment]
+        return QgsPointXY(x0 + (table.x1[segment] - x0) * ratio,
+                          y0 + (table.y1[segment] - y0) * ratio)
+    
+    def _in_range(self, measure):
+        return -self._tolerance <= measure <= self.length + self._tolerance
+    
+    def point_at(self, measure):
+        """Return the QgsPointXY at measure, or None outside of the line.
+        
+        Like create_points(), a measure on the joint of two parts resolves
+        to the end of the first part.
+        """
+        if not self._in_range(measure):
+            return None
+        return self._point(self._segment(measure, ending=True), measure)
+    
+    def bearing_at(self, measure):
+        """Return the bearing in degrees clockwise from north at measure.
+        
+        This is the direction of the segment containing measure (on a vertex
+        the segment starting there); it is geodesic with a distance
+        calculator, planar otherwise. Returns None outside of the line.
+        """
+        if not self._in_range(measure):
+            return None
+        table = self.segments.table
+        segment = self._segment(measure)
+        x0, y0 = table.x0[segment], table.y0[segment]
+        x1, y1 = table.x1[segment], table.y1[segment]
+        if self.distance_area is not None:
+            radians = self.distance_area.bearing(QgsPointXY(x0, y0), QgsPointXY(x1, y1))
+        else:
+            radians = math.atan2(x1 - x0, y1 - y0)
+        return math.degrees(radians) % 360.0
+    
+    def locate(self, point):
+        """Return (measure, offset) of point projected onto the line.
+        
+        The offset is the planar distance from the line in layer units,
+        positive to the right of the line direction (see SegmentIndex.locate).
+        """
+        segment, planar, offset = self.segments.nearest_segment(point.x(), point.y())
+        if self.geodesic_starts is None:
+            return planar, offset
+        span = self.planar_ends[segment] - self.planar_starts[segment]
+        ratio = (planar - self.planar_starts[segment]) / span if span > 0 else 0.0
+        measure = self.starts[segment] + ratio * (self.ends[segment] - self.starts[segment])
+        return measure, offset
+    
+    def measure_at(self, point):
+        """Return the measure of the point of the line closest to point."""
+        return self.locate(point)[0]
+    
+    def substring(self, start, end):
+        """Return the part of the line between two measures as a QgsGeometry.
+        
+        Measures are clamped to the line; with start > end the result runs
+        against the line direction. A substring spanning several parts of a
+        multi-line is a multi-line. Returns an empty geometry if the range
+        does not overlap the line.
+        """
+        backwards = start > end
+        if backwards:
+            start, end = end, start
+        start = max(start, 0.0)
+        end = min(end, self.length)
+        if start > end:
+            return QgsGeometry()
+        
+        table = self.segments.table
+        first = self._segment(start)
+        last = max(self._segment(end, ending=True), first)
+        parts = [[self._point(first, start)]]
+        for segment in range(first, last):
+            vertex = QgsPointXY(table.x1[segment], table.y1[segment])
+            parts[-1].append(vertex)
+            # Parts are chained without a connecting segment
+            following = QgsPointXY(table.x0[segment + 1], table.y0[segment + 1])
+            if following != vertex:
+                parts.append([following])
+        parts[-1].append(self._point(last, end))
+        parts = [part for part in parts if len(part) >= 2]
+        
+        if backwards:
+            parts = [part[::-1] for part in reversed(parts)]
+        if len(parts) == 1:
+            return QgsGeometry.fromPolylineXY(parts[0])
+        return QgsGeometry.fromMultiPolylineXY(parts)
+
+
+def event_stations(context, measures, geom, reverse=False, engine=ENGINE_AUTO):
+    """Return the (x, y) tuple (or None) at each chainage value along a line.
+    
+    Places arbitrary measures with the logic of create_stations(): in
+    distance units of the context, measured on the ellipsoid where the run
+    measures lengths that way and scaled to the geometry for placement.
+    The line is indexed once for all measures; sorted measures are resolved
+    in a single walk of the geometry. Measures outside the line are None.
+    
+    Args:
+        context: ChainageContext of the run
+        measures: Chainage values in context.distance_units
+        geom: Line geometry of the route
+        reverse: Measures count from the end of the line
+        engine: Station placement engine (ENGINE_AUTO, ENGINE_PYTHON or ENGINE_NUMPY)
+    """
+    if not _is_line(geom) or not measures:
+        return [None for _ in measures]
+    timer = context.timer
+    
+    if context.meter_based:
+        with timer.measure(PHASE_DISTANCE_MAP):
+            vertices, distance_map = build_distance_map(geom, context.distance_area)
+        length = distance_map.total_meters
+        targets = [measure * context.to_meters for measure in measures]
+        locate = _geodesic_locator(context.distance_area, vertices, distance_map)
+    else:
+        start = perf_counter()
+        index = _line_index(geom, engine)
+        if context.is_geographic or not (context.use_ellipsoidal and context.distance_area):
+            length = index.length
+        else:
+            length = context.distance_area.measureLength(geom)
+        timer.add(PHASE_LENGTH, perf_counter() - start)
+        factor = context.conversion_factor or 1.0
+        scale = index.length / length if length > 0 else 1.0
+        targets = [measure * factor for measure in measures]
+        
+        def locate(distances):
+            return index.points_at([min(distance * scale, index.length)
+                                    for distance in distances])
+    
+    # Keep the stations of create_points() at the line end, drop the rest
+    tolerance = NEAR_EPSILON * max(1.0, length)
+    inside = [i for i, target in enumerate(targets)
+              if -tolerance <= target <= length + tolerance]
+    along = [min(max(targets[i], 0.0), length) for i in inside]
+    if reverse:
+        # Measured from the end; reversed back so the walk stays ascending
+        inside.reverse()
+        along = [length - target for target in reversed(along)]
+    
+    start = perf_counter()
+    points = [None] * len(measures)
+    for i, point in zip(inside, locate(along)):
+        points[i] = point
+    timer.add(PHASE_INTERPOLATION, perf_counter() - start)
+    return points
+
+
+def _event_value(value):
+    """Return value, or None for a NULL attribute."""
+    return None if value is None or value == NULL else value
+
+
+def _event_feature(fields, attributes, point=None):
+    """Create an event feature, with a point geometry if it was placed."""
+    feature = QgsFeature(fields)
+    if point is not None:
+        feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(*point)))
+    feature.setAttributes(attributes)
+    return feature
+
+
+def group_events(events, fields, route_field, measure_field, feedback=None):
+    """Group the rows of an event table by route id.
+    
+    Returns (groups, invalid): a dict (the hash index of the join) mapping
+    every route id to its (measure, attributes) events sorted by measure,
+    and the attributes of events without a route id or a numeric measure.
+    Returns None if feedback is canceled.
+    
+    Args:
+        events: Iterable of event features (geometries are ignored)
+        fields: QgsFields of the event table
+        route_field: Name of the route id attribute
+        measure_field: Name of the chainage attribute
+        feedback: Optional object with isCanceled()
+        
+    Raises ValueError if fields has no route_field or measure_field.
+    """
+    route_index = fields.indexFromName(route_field)
+    measure_index = fields.indexFromName(measure_field)
+    for name, index in ((route_field, route_index), (measure_field, measure_index)):
+        if index < 0:
+            raise ValueError(f"The event table has no field '{name}'")
+    
+    groups = {}
+    invalid = []
+    for feature in events:
+        if feedback is not None and feedback.isCanceled():
+            return None
+        attributes = feature.attributes()
+        route = _event_value(attributes[route_index])
+        measure = _event_value(attributes[measure_index])
+        try:
+            measure = float(measure)
+        except (TypeError, ValueError):
+            measure = None
+        if route is None or measure is None:
+            invalid.append(attributes)
+            continue
+        groups.setdefault(route, []).append((measure, attributes))
+    
+    # Sorted once, so each route is placed in a single walk
+    for group in groups.values():
+        group.sort(key=itemgetter(0))
+    return groups, invalid
+
+
+def locate_events(events, lines, route_field, measure_field, context, fields, sink,
+                  line_route_field=None, reverse=False, engine=ENGINE_AUTO,
+                  feedback=None, feature_count=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Place the events of a table without geometry along routes (dynamic segmentation).
+    
+    The events are grouped per route id in a hash index (see group_events)
+    and joined to the line features by their route id. All events of a
+    route are placed with one event_stations() call, so its geometry is
+    indexed and walked once however many events it carries. Events are
+    streamed to sink chunk_size features at a time, with their attributes
+    and the point at their chainage; events without a route, without a
+    matching line or beyond its end are written without a geometry. When
+    several lines share a route id, the first one is used.
+    
+    Args:
+        events: Iterable of event features
+        lines: Iterable of line features (the routes)
+        route_field: Route id attribute of the events
+        measure_field: Chainage attribute of the events, in
+            context.distance_units
+        context: ChainageContext of the line layer
+        fields: Output fields (those of the events)
+        sink: Anything with addFeatures(), such as a QgsFeatureSink, a
+            QgsVectorFileWriter or a memory layer provider
+        line_route_field: Route id attribute of the lines (None = feature id)
+        reverse: Chainage counts from the end of the lines
+        engine: Station placement engine (ENGINE_AUTO, ENGINE_PYTHON or ENGINE_NUMPY)
+        feedback: Optional object with isCanceled() and setProgress()
+        feature_count: Number of events, used to report progress
+        
+    Returns (located, unlocated) event counts, or None if canceled. Raises
+    ValueError if fields has no route_field or measure_field.
+    """
+    start = perf_counter()
+    grouped = group_events(events, fields, route_field, measure_field, feedback)
+    if grouped is None:
+        return None
+    groups, invalid = grouped
+    context.timer.add(PHASE_READ, perf_counter() - start)
+    
+    located = unlocated = 0
+    chunk = []
+    
+    def emit(attributes, point=None):
+        nonlocal located, unlocated
+        chunk.append(_event_feature(fields, attributes, point))
+        if point is None:
+            unlocated += 1
+        else:
+            located += 1
+        if len(chunk) >= chunk_size:
+            flush()
+    
+    def flush():
+        with context.timer.measure(PHASE_WRITE):
+            sink.addFeatures(chunk)
+        chunk.clear()
+        if feedback is not None and feature_count > 0:
+            feedback.setProgress(100.0 * (located + unlocated) / feature_count)
+    
+    for attributes in invalid:
+        emit(attributes)
+    
+    for line in lines:
+        if not groups:
+            break
+        if feedback is not None and feedback.isCanceled():
+            return None
+        route = line[line_route_field] if line_route_field else line.id()
+        group = groups.pop(_event_value(route), None)
+        if group is None:
+            continue
+        points = event_stations(context, [measure for measure, _ in group],
+                                line.geometry(), reverse, engine)
+        for (_, attributes), point in zip(group, points):
+            emit(attributes, point)
     
-    virt_layer.updateExtents()
-    QgsProject.instance().addMapLayers([virt_layer])
-    virt_layer.triggerRepaint()
+    # Routes without a line
+    for group in groups.values():
+        for _, attributes in group:
+            emit(attributes)
+    if chunk:
+        flush()
+    return located, unlocated
@@ -0,0 +1,448 @@
+# -*- coding: utf-8 -*-
+"""
+QChainage Virtual Layer - Chainage computed on the fly for the requested extent.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import threading
+from urllib.parse import parse_qs, urlencode
+
+from qgis.core import (
+    QgsAbstractFeatureIterator,
+    QgsAbstractFeatureSource,
+    QgsCoordinateTransform,
+    QgsCsException,
+    QgsDataProvider,
+    QgsExpression,
+    QgsExpressionContext,
+    QgsFeature,
+    QgsFeatureIterator,
+    QgsFeatureRequest,
+    QgsGeometry,
+    QgsPointXY,
+    QgsProject,
+    QgsProviderMetadata,
+    QgsProviderRegistry,
+    QgsRectangle,
+    QgsUnitTypes,
+    QgsVectorDataProvider,
+    QgsVectorLayer,
+    QgsVectorLayerFeatureSource,
+    QgsWkbTypes,
+)
+
+try:
+    from .chainagecache import (
+        LruCache, split_station_id, station_id, tile_bounds, tile_keys, tile_level,
+    )
+    from .chainagetool import DIST_FIELD_INDEX, ENGINE_AUTO, ChainageContext, create_stations
+except ImportError:
+    # Loaded as a top-level module (e.g. from the test suite)
+    from chainagecache import (
+        LruCache, split_station_id, station_id, tile_bounds, tile_keys, tile_level,
+    )
+    from chainagetool import DIST_FIELD_INDEX, ENGINE_AUTO, ChainageContext, create_stations
+
+PROVIDER_KEY = 'qchainage'
+
+# Number of tiles and of source features whose stations are kept in memory
+DEFAULT_TILE_CACHE = 256
+DEFAULT_SOURCE_CACHE = 10000
+
+
+def virtual_layer_uri(layer, startpoint, endpoint, distance, force_last=False,
+                      force_first_last=False, divide=0, use_ellipsoidal=True,
+                      distance_units=None, copy_attributes=None, reverse=False,
+                      engine=ENGINE_AUTO):
+    """Return the data source URI of a virtual chainage layer for layer.
+
+    Takes the arguments of points_along_line(); the source layer is referenced
+    by its id, so it has to be part of the project.
+    """
+    if distance_units is None:
+        distance_units = layer.crs().mapUnits()
+    return urlencode({
+        'source': layer.id(),
+        'start': repr(float(startpoint)),
+        'end': repr(float(endpoint)),
+        'distance': repr(float(distance)),
+        'force_last': int(bool(force_last)),
+        'force_first_last': int(bool(force_first_last)),
+        'divide': int(divide),
+        'ellipsoidal': int(bool(use_ellipsoidal)),
+        'units': QgsUnitTypes.encodeUnit(distance_units),
+        'attributes': ','.join(copy_attributes or []),
+        'reverse': int(bool(reverse)),
+        'engine': engine,
+    })
+
+
+def parse_virtual_layer_uri(uri):
+    """Return the chainage parameters of a virtual layer URI as a dict."""
+    values = {key: items[0] for key, items in parse_qs(uri).items()}
+    distance_units, ok = QgsUnitTypes.decodeDistanceUnit(values.get('units', ''))
+    attributes = values.get('attributes', '')
+    return {
+        'source': values.get('source', ''),
+        'startpoint': float(values.get('start', 0)),
+        'endpoint': float(values.get('end', 0)),
+        'distance': float(values.get('distance', 0)),
+        'force_last': values.get('force_last') == '1',
+        'force_first_last': values.get('force_first_last') == '1',
+        'divide': int(values.get('divide', 0)),
+        'use_ellipsoidal': values.get('ellipsoidal', '1') == '1',
+        'distance_units': distance_units if ok else None,
+        'copy_attributes': attributes.split(',') if attributes else [],
+        'reverse': values.get('reverse') == '1',
+        'engine': values.get('engine', ENGINE_AUTO),
+    }
+
+
+class ChainageTiles:
+    """Stations of a virtual chainage layer, computed per tile and cached.
+
+    A tile (see chainagecache.tile_level) reads the source features whose
+    bounding box intersects it, using the spatial index of the source
+    provider, and keeps the stations that fall inside it. Stations of a
+    source feature are cached as well, since a long line crosses many tiles.
+    Feature sources used by render threads share one instance, so every
+    computation holds its lock.
+    """
+
+    def __init__(self, params, context, tile_cache=DEFAULT_TILE_CACHE,
+                 source_cache=DEFAULT_SOURCE_CACHE):
+        self.params = params
+        self.context = context
+        self.tiles = LruCache(tile_cache)
+        self.sources = LruCache(source_cache)
+        self._lock = threading.Lock()
+
+    def clear(self):
+        """Drop all cached stations (e.g. after the source layer changed)."""
+        with self._lock:
+            self.tiles.clear()
+            self.sources.clear()
+
+    def _source_request(self, source_fields):
+        request = QgsFeatureRequest()
+        request.setSubsetOfAttributes(self.params['copy_attributes'], source_fields)
+        return request
+
+    def _source_stations(self, feature):
+        """Return (stations, attributes) of a source feature, cached by its id."""
+        entry = self.sources.get(feature.id())
+        if entry is not None:
+            return entry
+        params = self.params
+        context = self.context
+        stations = create_stations(
+            context, params['startpoint'], params['endpoint'], params['distance'],
+            feature.geometry(), params['force_last'], params['force_first_last'],
+            params['divide'], params['reverse'], params['engine']
+        )
+        context.result.add_feature(len(stations))
+
+        # attribute_map indexes the station fields (see ChainageContext)
+        attributes = [None] * context.station_fields.count()
+        values = feature.attributes()
+        for output_index, source_index in context.attribute_map:
+            attributes[output_index] = values[source_index]
+        entry = (stations, attributes)
+        self.sources.put(feature.id(), entry)
+        return entry
+
+    def _tile(self, source, source_fields, key):
+        """Return the (fid, dist, x, y, attributes) rows of a tile."""
+        rows = self.tiles.get(key)
+        if rows is not None:
+            return rows
+        xmin, ymin, xmax, ymax = tile_bounds(key)
+        request = self._source_request(source_fields)
+        request.setFilterRect(QgsRectangle(xmin, ymin, xmax, ymax))
+
+        rows = []
+        for feature in source.getFeatures(request):
+            stations, attributes = self._source_stations(feature)
+            for index, (dist, x, y) in enumerate(stations):
+                # Tiles are half-open, so a station belongs to exactly one tile
+                if xmin <= x < xmax and ymin <= y < ymax:
+                    rows.append((station_id(feature.id(), index), dist, x, y, attributes))
+        self.tiles.put(key, rows)
+        return rows
+
+    def stations_in_rect(self, source, source_fields, rect):
+        """Return the rows of all stations inside rect (a QgsRectangle)."""
+        level = tile_level(rect.width(), rect.height())
+        keys = tile_keys(rect.xMinimum(), rect.yMinimum(),
+                         rect.xMaximum(), rect.yMaximum(), level)
+        rows = []
+        with self._lock:
+            for key in keys:
+                rows.extend(row for row in self._tile(source, source_fields, key)
+                            if rect.contains(QgsPointXY(row[2], row[3])))
+        return rows
+
+    def stations_by_id(self, source, source_fields, fids):
+        """Return the rows of the stations with the given feature ids."""
+        wanted = {}
+        for fid in fids:
+            source_fid, index = split_station_id(fid)
+            wanted.setdefault(source_fid, []).append(index)
+        request = self._source_request(source_fields)
+        request.setFilterFids(list(wanted))
+
+        rows = []
+        with self._lock:
+            for feature in source.getFeatures(request):
+                stations, attributes = self._source_stations(feature)
+                for index in wanted[feature.id()]:
+                    if index < len(stations):
+                        dist, x, y = stations[index]
+                        rows.append((station_id(feature.id(), index), dist, x, y,
+                                     attributes))
+        return rows
+
+
+class ChainageFeatureSource(QgsAbstractFeatureSource):
+    """Snapshot of a virtual chainage layer for one feature request.
+
+    Created on the main thread; the source layer is captured as a
+    QgsVectorLayerFeatureSource, so iterators may run in render threads.
+    """
+
+    def __init__(self, provider):
+        super().__init__()
+        self.tiles = provider.tiles
+        self.fields = provider.fields()
+        self.crs = provider.crs()
+        self.extent = provider.extent()
+        self.source = None
+        self.source_fields = None
+        if provider.source_layer is not None:
+            self.source = QgsVectorLayerFeatureSource(provider.source_layer)
+            self.source_fields = provider.source_layer.fields()
+
+    def getFeatures(self, request=QgsFeatureRequest()):
+        return QgsFeatureIterator(ChainageFeatureIterator(self, request))
+
+
+class ChainageFeatureIterator(QgsAbstractFeatureIterator):
+    """Iterator over the stations of a ChainageFeatureSource.
+
+    The stations are computed when the first feature is fetched: by id for
+    fid requests, otherwise for the tiles covering the filter rectangle (or
+    the whole layer).
+    """
+
+    def __init__(self, source, request):
+        super().__init__(request)
+        self._source = source
+        self._request = QgsFeatureRequest(request)
+        self._rows = None
+        self._index = 0
+        self._closed = source.source is None
+
+        self._transform = QgsCoordinateTransform()
+        destination = self._request.destinationCrs()
+        if destination.isValid() and destination != source.crs:
+            self._transform = QgsCoordinateTransform(source.crs, destination,
+                                                     self._request.transformContext())
+        try:
+            self._filter_rect = self.filterRectToSourceCrs(self._transform)
+        except QgsCsException:
+            self._closed = True
+
+        self._expression = None
+        if self._request.filterType() == QgsFeatureRequest.FilterExpression:
+            self._expression = QgsExpression(self._request.filterExpression())
+            self._expression_context = QgsExpressionContext()
+            self._expression_context.setFields(source.fields)
+            self._expression.prepare(self._expression_context)
+
+    def _load_rows(self):
+        source = self._source
+        request = self._request
+        if request.filterType() == QgsFeatureRequest.FilterFid:
+            return source.tiles.stations_by_id(source.source, source.source_fields,
+                                               [request.filterFid()])
+        if request.filterType() == QgsFeatureRequest.FilterFids:
+            return source.tiles.stations_by_id(source.source, source.source_fields,
+                                               request.filterFids())
+        rect = self._filter_rect if not self._filter_rect.isNull() else source.extent
+        return source.tiles.stations_in_rect(source.source, source.source_fields, rect)
+
+    def fetchFeature(self, f):
+        """Fill f with the next station; return False when exhausted."""
+        if self._closed:
+            return False
+        if self._rows is None:
+            self._rows = self._load_rows()
+
+        while self._index < len(self._rows):
+            fid, dist, x, y, attributes = self._rows[self._index]
+            self._index += 1
+
+            f.setFields(self._source.fields, True)
+            f.setId(fid)
+            f.setValid(True)
+            attributes = list(attributes)
+            attributes[DIST_FIELD_INDEX] = dist
+            f.setAttributes(attributes)
+            if self._request.flags() & QgsFeatureRequest.NoGeometry:
+                f.clearGeometry()
+            else:
+                f.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(x, y)))
+                self.geometryToDestinationCrs(f, self._transform)
+
+            if self._expression is not None:
+                self._expression_context.setFeature(f)
+                if not self._expression.evaluate(self._expression_context):
+                    continue
+            return True
+        return False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        feature = QgsFeature()
+        if not self.nextFeature(feature):
+            raise StopIteration
+        return feature
+
+    def rewind(self):
+        if self._closed:
+            return False
+        self._index = 0
+        return True
+
+    def close(self):
+        self._closed = True
+        return True
+
+
+class ChainageProvider(QgsVectorDataProvider):
+    """Read-only point provider of a virtual chainage layer.
+
+    Nothing is materialized: stations are computed when features are
+    requested, only for the source features within the requested extent,
+    and cached per tile (see ChainageTiles). Edits of the source layer drop
+    the cache.
+    """
+
+    @classmethod
+    def providerKey(cls):
+        return PROVIDER_KEY
+
+    @classmethod
+    def description(cls):
+        return 'QChainage virtual chainage layer'
+
+    @classmethod
+    def createProvider(cls, uri, providerOptions, flags=QgsDataProvider.ReadFlags()):
+        return ChainageProvider(uri, providerOptions, flags)
+
+    def __init__(self, uri='', providerOptions=QgsDataProvider.ProviderOptions(),
+                 flags=QgsDataProvider.ReadFlags()):
+        super().__init__(uri)
+        self._uri = uri
+        self.params = parse_virtual_layer_uri(uri)
+        self.source_layer = QgsProject.instance().mapLayer(self.params['source'])
+        self.tiles = None
+        self._fields = None
+        self._crs = None
+
+        if self.source_layer is None:
+            return
+        layer = self.source_layer
+        context = ChainageContext(layer.crs(), layer.fields(),
+                                  self.params['use_ellipsoidal'],
+                                  self.params['distance_units'],
+                                  self.params['copy_attributes'])
+        self.tiles = ChainageTiles(self.params, context)
+        self._fields = context.fields
+        self._crs = layer.crs()
+
+        layer.dataChanged.connect(self._source_changed)
+        layer.willBeDeleted.connect(self._source_deleted)
+
+    def _source_changed(self):
+        self.tiles.clear()
+        self.dataChanged.emit()
+
+    def _source_deleted(self):
+        self.source_layer = None
+        self.tiles.clear()
+
+    def featureSource(self):
+        return ChainageFeatureSource(self)
+
+    def getFeatures(self, request=QgsFeatureRequest()):
+        return QgsFeatureIterator(ChainageFeatureIterator(self.featureSource(), request))
+
+    def dataSourceUri(self, expandAuthConfig=True):
+        return self._uri
+
+    def storageType(self):
+        return 'Computed on the fly'
+
+    def wkbType(self):
+        return QgsWkbTypes.Point
+
+    def featureCount(self):
+        # Counting would mean computing every station
+        return QgsVectorDataProvider.UnknownCount
+
+    def fields(self):
+        return self._fields
+
+    def extent(self):
+        if self.source_layer is None:
+            return QgsRectangle()
+        return self.source_layer.extent()
+
+    def updateExtents(self):
+        pass
+
+    def isValid(self):
+        return self.tiles is not None
+
+    def crs(self):
+        return self._crs
+
+    def capabilities(self):
+        return QgsVectorDataProvider.NoCapabilities
+
+    def name(self):
+        return self.providerKey()
+
+
+def register_provider():
+    """Register the virtual chainage provider with QGIS (once)."""
+    registry = QgsProviderRegistry.instance()
+    if registry.providerMetadata(PROVIDER_KEY) is not None:
+        return
+    metadata = QgsProviderMetadata(ChainageProvider.providerKey(),
+                                   ChainageProvider.description(),
+                                   ChainageProvider.createProvider)
+    registry.registerProvider(metadata)
+
+
+def create_virtual_layer(layerout, startpoint, endpoint, distance, layer,
+                         force_last=False, force_first_last=False, divide=0,
+                         use_ellipsoidal=True, distance_units=None,
+                         copy_attributes=None, reverse=False, engine=ENGINE_AUTO):
+    """Create a point layer whose chainage is computed for the visible extent.
+
+    Unlike points_along_line() no station is created up front; rendering,
+    identifying or exporting the layer computes the stations of the source
+    features that are requested. The source layer has to be part of the
+    project. Returns the layer (not added to the project).
+    """
+    register_provider()
+    uri = virtual_layer_uri(layer, startpoint, endpoint, distance, force_last,
+                            force_first_last, divide, use_ellipsoidal, distance_units,
+                            copy_attributes, reverse, engine)
+    return QgsVectorLayer(uri, layerout, PROVIDER_KEY)
@@ -11,7 +11,10 @@ import os
 from qgis.PyQt.QtCore import QFileInfo, QSettings, QTranslator, QCoreApplication, qVersion
 from qgis.PyQt.QtGui import QIcon
 from qgis.PyQt.QtWidgets import QAction
-from qgis.core import Qgis, QgsMapLayer, QgsWkbTypes
+from qgis.core import Qgis, QgsApplication, QgsMapLayer, QgsWkbTypes
+from .chainagelive import LiveChainage
+from .chainageprovider import QChainageProvider
+from .chainagevirtual import register_provider
 from .qchainagedialog import QChainageDialog
 
 
@@ -22,6 +25,7 @@ class Qchainage:
         self.iface = iface
         self.plugin_dir = os.path.dirname(__file__)
         self.action = None
+        self.provider = None
         self._setup_translation()
 
     def _setup_translation(self):
@@ -36,8 +40,17 @@ class Qchainage:
             if qVersion() > '4.3.3':
                 QCoreApplication.installTranslator(self.translator)
 
+    def initProcessing(self):
+        """Register the processing provider (also used without a GUI)."""
+        self.provider = QChainageProvider()
+        QgsApplication.processingRegistry().addProvider(self.provider)
+        # Data provider of virtual chainage layers, also needed to load projects
+        register_provider()
+
     def initGui(self):
         """Initialize the plugin GUI."""
+        self.initProcessing()
+        
         # Create action with icon
         icon_path = os.path.join(self.plugin_dir, 'img/qchainage.svg')
         self.action = QAction(
@@ -53,9 +66,13 @@ class Qchainage:
 
     def unload(self):
         """Unload the plugin."""
+        LiveChainage.stop_all()
         if self.action:
             self.iface.removePluginVectorMenu("&QChainage", self.action)
             self.iface.removeToolBarIcon(self.action)
+        if self.provider:
+            QgsApplication.processingRegistry().removeProvider(self.provider)
+            self.provider = None
 
     def _has_line_layers(self):
         """Check if any line layers are available."""
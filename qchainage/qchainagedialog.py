@@ -8,12 +8,19 @@ Licensed under GNU GPL v3.0
 """
 
 import os
-from .chainagetool import points_along_line
+from .chainagelive import LiveChainage
+from .chainagetask import ChainageTask
+from .chainagetool import clip_region_from_extent, clip_region_from_layer
+from .chainagevirtual import create_virtual_layer
 from .qt_compat import uic, QSettings, QDialog, DialogButtonBox_Ok
 from qgis.core import (
     QgsMapLayer, QgsWkbTypes, QgsUnitTypes, QgsDistanceArea,
     QgsProject, QgsMessageLog
 )
+from qgis.gui import QgsFileWidget
+
+# Clip combo box entry for the current map extent (other entries hold a layer)
+CLIP_MAP_EXTENT = 'map_extent'
 
 # Load UI file with error handling
 try:
@@ -44,6 +51,8 @@ class QChainageDialog(QDialog, FORM_CLASS):
         # Initialize UI components
         self._setup_units_combo()
         self._setup_layer_combo()
+        self._setup_output_file_widget()
+        self._setup_clip_combo()
         
         # Connect signals
         self.UnitsComboBox.currentIndexChanged.connect(self._on_units_changed)
@@ -57,6 +66,10 @@ class QChainageDialog(QDialog, FORM_CLASS):
         self.checkBoxStartFrom.toggled.connect(self._on_start_checkbox_toggled)
         self.checkBoxEndAt.toggled.connect(self._on_end_checkbox_toggled)
         
+        # Live linked and on-the-fly outputs always cover all features
+        self.liveLinkCheckBox.toggled.connect(self._on_output_mode_toggled)
+        self.onTheFlyCheckBox.toggled.connect(self._on_output_mode_toggled)
+        
         # Connect attribute selection controls
         self.selectAllAttributesBtn.clicked.connect(self._select_all_attributes)
         self.deselectAllAttributesBtn.clicked.connect(self._deselect_all_attributes)
@@ -104,6 +117,46 @@ class QChainageDialog(QDialog, FORM_CLASS):
         if selected_index >= 0:
             self.selectLayerComboBox.setCurrentIndex(selected_index)
 
+    def _setup_output_file_widget(self):
+        """Configure the optional output file selector."""
+        self.outputFileWidget.setStorageMode(QgsFileWidget.SaveFile)
+        self.outputFileWidget.setFilter(
+            "GeoPackage (*.gpkg);;FlatGeobuf (*.fgb);;ESRI Shapefile (*.shp)"
+        )
+
+    def _setup_clip_combo(self):
+        """Populate the clip combo box with the map extent and polygon layers."""
+        self.clipComboBox.addItem("Whole layer", None)
+        self.clipComboBox.addItem("Current map extent", CLIP_MAP_EXTENT)
+        for layer in self.iface.mapCanvas().layers():
+            if (layer.type() == QgsMapLayer.VectorLayer and
+                layer.geometryType() == QgsWkbTypes.PolygonGeometry):
+                self.clipComboBox.addItem(f"Polygons of {layer.name()}", layer)
+
+    def _get_clip_region(self, layer):
+        """Return the selected clip region in the CRS of layer (None = whole layer)."""
+        clip = self.clipComboBox.currentData()
+        if clip is None:
+            return None
+        if clip == CLIP_MAP_EXTENT:
+            canvas = self.iface.mapCanvas()
+            return clip_region_from_extent(canvas.extent(),
+                                           canvas.mapSettings().destinationCrs(),
+                                           layer.crs())
+        return clip_region_from_layer(clip, layer.crs())
+
+    def _on_output_mode_toggled(self, checked=False):
+        """Disable the options live linked and on-the-fly outputs do not support."""
+        live = self.liveLinkCheckBox.isChecked()
+        on_the_fly = self.onTheFlyCheckBox.isChecked()
+        self.liveLinkCheckBox.setEnabled(not on_the_fly)
+        self.onTheFlyCheckBox.setEnabled(not live)
+        self.outputFileWidget.setEnabled(not (live or on_the_fly))
+        layer = self._get_current_layer()
+        has_selection = bool(layer) and layer.selectedFeatureCount() > 0
+        self.selectOnlyRadioBtn.setEnabled(has_selection and not (live or on_the_fly))
+        self.clipComboBox.setEnabled(not (live or on_the_fly))
+
     def _get_current_layer(self):
         """Get the currently selected layer."""
         index = self.selectLayerComboBox.currentIndex()
@@ -151,6 +204,9 @@ class QChainageDialog(QDialog, FORM_CLASS):
             self.selectOnlyRadioBtn.setChecked(True)
             self.selectOnlyRadioBtn.setEnabled(True)
             self.ok_button.setEnabled(True)
+        
+        # Linked and on-the-fly outputs always use all features
+        self._on_output_mode_toggled()
 
     def _on_units_changed(self):
         """Handle units change and convert distance value."""
@@ -282,6 +338,7 @@ class QChainageDialog(QDialog, FORM_CLASS):
         divide = self.divideSpinBox.value()
         use_ellipsoidal = self.rBEllipsoidal.isChecked()
         reverse = self.checkBoxReverse.isChecked()
+        output_path = self.outputFileWidget.filePath() or None
         
         # Get selected attributes to copy
         copy_attributes = self._get_selected_attributes()
@@ -294,20 +351,43 @@ class QChainageDialog(QDialog, FORM_CLASS):
             )
             return
         
-        # Temporarily set projection behavior
-        projection_key = "Projections/defaultBehaviour"
-        old_setting = self.qgis_settings.value(projection_key)
-        self.qgis_settings.setValue(projection_key, "useGlobal")
+        if self.liveLinkCheckBox.isChecked():
+            # Build the output now and keep updating it while the layer is edited
+            LiveChainage(
+                layer_name, startpoint, endpoint, distance, layer,
+                force_last, force_first_last, divide, use_ellipsoidal,
+                distance_units, copy_attributes, reverse
+            ).start()
+            super().accept()
+            return
         
-        try:
-            # Create chainage points
-            points_along_line(
+        if self.onTheFlyCheckBox.isChecked():
+            # Nothing is computed until the layer is drawn
+            QgsProject.instance().addMapLayer(create_virtual_layer(
                 layer_name, startpoint, endpoint, distance, layer,
-                selected_only, force_last, force_first_last, divide,
-                use_ellipsoidal, distance_units, copy_attributes, reverse
+                force_last, force_first_last, divide, use_ellipsoidal,
+                distance_units, copy_attributes, reverse
+            ))
+            super().accept()
+            return
+        
+        # Stations outside the clip region are dropped before features are built
+        clip = self._get_clip_region(layer)
+        if self.clipComboBox.currentData() is not None and clip is None:
+            QgsMessageLog.logMessage(
+                "Warning: The clip layer has no polygons. Cannot create chainage points.",
+                "QChainage"
             )
-        finally:
-            # Restore original projection setting
-            self.qgis_settings.setValue(projection_key, old_setting)
+            return
+        
+        # Create chainage points in the background; the output layer is
+        # added to the project when the task finishes
+        task = ChainageTask(
+            layer_name, startpoint, endpoint, distance, layer,
+            selected_only, force_last, force_first_last, divide,
+            use_ellipsoidal, distance_units, copy_attributes, reverse,
+            output_path=output_path, clip=clip
+        )
+        task.start()
         
         super().accept()
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the chainage engines.
+
+Times station placement on reproducible synthetic lines from 10 to 1M
+vertices, for several interval/vertex ratios, projected and geographic
+CRS, ellipsoidal and cartesian distances, divide and reverse modes and
+attribute copying. Kernel benchmarks run with plain Python; the
+create_points, create_points_by_distance and points_along_line benchmarks
+run when the QGIS Python bindings are available.
+
+Every benchmark is run several times and its median time is recorded;
+with --rounds the whole suite is repeated and the fastest round counts.
+Results are written as JSON and can be compared against a baseline.
+Timings only compare on the same machine, so no baseline is shipped: record
+one locally (benchmark_baseline.json is ignored by git) before changing the
+code, then compare against it:
+
+    python3 benchmark_chainage.py --kernel-only --rounds 3 --output benchmark_baseline.json
+    python3 benchmark_chainage.py --kernel-only --rounds 3 --baseline benchmark_baseline.json
+
+The comparison exits with status 1 if any benchmark got slower than the
+baseline by more than the tolerance (default: twice as slow, well above the
+run-to-run noise of a shared machine) and by at least
+MIN_REGRESSION_SECONDS.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import struct
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add plugin path to Python path
+plugin_path = Path(__file__).parent.parent / 'qchainage'
+sys.path.insert(0, str(plugin_path))
+
+from chainagekernel import (
+    ENGINE_NUMPY, ENGINE_PYTHON, HAS_NUMPY, ReversedIndex, chainage_batch,
+    decode_wkb_arrays, decode_wkb_lines, make_line_index, place_stations,
+)
+
+VERTEX_COUNTS = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+# Stations per vertex: few long intervals up to many stations per segment
+STATION_RATIOS = [0.1, 1, 10]
+
+# Number of attributes copied in the attribute benchmarks
+COPIED_ATTRIBUTES = 10
+
+# Runs per benchmark; the median time counts
+DEFAULT_REPEAT = 5
+
+# Allowed slowdown against the baseline; run-to-run noise reaches 1.5x
+DEFAULT_TOLERANCE = 1.0
+
+# Slowdowns smaller than this many seconds are timer noise, not regressions
+MIN_REGRESSION_SECONDS = 0.01
+
+# Start of the synthetic lines in UTM 33N (meters) and WGS84 (degrees)
+PROJECTED_ORIGIN = (500000.0, 5000000.0)
+GEOGRAPHIC_ORIGIN = (10.0, 45.0)
+
+
+def generate_line(vertices, geographic=False, seed=0):
+    """Return a reproducible random-walk line as a list of (x, y) tuples.
+
+    Segments are about 10 m long (about 1e-4 degrees on a geographic line)
+    and turn by at most 30 degrees, like a digitized road.
+    """
+    rng = random.Random(seed * 1_000_003 + vertices)
+    x, y = GEOGRAPHIC_ORIGIN if geographic else PROJECTED_ORIGIN
+    step = 1e-4 if geographic else 10.0
+    heading = rng.uniform(0, 2 * math.pi)
+    coords = [(x, y)]
+    for _ in range(vertices - 1):
+        heading += rng.uniform(-math.pi / 6, math.pi / 6)
+        length = step * rng.uniform(0.5, 1.5)
+        x += length * math.cos(heading)
+        y += length * math.sin(heading)
+        coords.append((x, y))
+    return coords
+
+
+def linestring_wkb(coords):
+    """Encode a 2D LineString as little-endian WKB."""
+    return struct.pack('<BII', 1, 2, len(coords)) + struct.pack(
+        f'<{2 * len(coords)}d', *(value for xy in coords for value in xy)
+    )
+
+
+def time_call(func, repeat):
+    """Return (median wall time in seconds, result of the last call)."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def record(results, name, params, seconds, points):
+    """Append one benchmark result and print it."""
+    results.append({'name': name, 'params': params,
+                    'seconds': round(seconds, 6), 'points': points})
+    print(f"{name:28s} {json.dumps(params, sort_keys=True):90s} "
+          f"{seconds * 1000:10.2f} ms {points:9d} pts")
+
+
+def kernel_benchmarks(vertex_counts, repeat, results):
+    """Benchmark the QGIS-free station placement engines."""
+    engines = [ENGINE_PYTHON] + ([ENGINE_NUMPY] if HAS_NUMPY else [])
+    for vertices in vertex_counts:
+        parts = [generate_line(vertices)]
+        for engine in engines:
+            index = make_line_index(parts, engine)
+            for ratio in STATION_RATIOS:
+                distance = index.length / max(1, int(vertices * ratio))
+                params = {'vertices': vertices, 'ratio': ratio, 'engine': engine}
+
+                seconds, stations = time_call(
+                    lambda: place_stations(index, index.length, 0, 0, distance,
+                                           force_last=True), repeat)
+                record(results, 'kernel.interval', params, seconds, len(stations))
+
+                seconds, stations = time_call(
+                    lambda: place_stations(ReversedIndex(index), index.length, 0, 0,
+                                           distance, force_last=True), repeat)
+                record(results, 'kernel.reverse', params, seconds, len(stations))
+
+            divide = max(1, vertices // 10)
+            seconds, stations = time_call(
+                lambda: place_stations(index, index.length, 0, 0, 0, divide=divide),
+                repeat)
+            record(results, 'kernel.divide', {'vertices': vertices, 'engine': engine},
+                   seconds, len(stations))
+
+        # Full worker batch: WKB decoding, index build and placement
+        items = [(linestring_wkb(parts[0]), None)]
+        batch_params = {'startpoint': 0, 'endpoint': 0,
+                        'distance': index.length / vertices,
+                        'force_last': True, 'force_first_last': False, 'divide': 0}
+        seconds, stations = time_call(lambda: chainage_batch(items, batch_params), repeat)
+        record(results, 'kernel.chainage_batch', {'vertices': vertices},
+               seconds, len(stations[0]))
+
+        # WKB decoding alone: tuple lists versus NumPy views on the buffer
+        wkb = items[0][0]
+        decoders = [('tuples', decode_wkb_lines)]
+        if HAS_NUMPY:
+            decoders.append(('numpy', decode_wkb_arrays))
+        for decoder, decode in decoders:
+            seconds, decoded = time_call(lambda: decode(wkb), repeat)
+            record(results, 'kernel.decode_wkb', {'vertices': vertices, 'decoder': decoder},
+                   seconds, len(decoded[0]))
+
+
+def start_qgis():
+    """Start a QgsApplication without GUI, or return None without QGIS bindings.
+
+    QGIS can only be initialized once per process, so the application is
+    shared by all rounds and exited by the caller.
+    """
+    try:
+        from qgis.core import QgsApplication
+    except ImportError as e:
+        print(f"Skipping QGIS benchmarks: {e}")
+        return None
+    QgsApplication.setPrefixPath(os.environ.get('QGIS_PREFIX_PATH', '/usr'), True)
+    qgs = QgsApplication([], False)
+    qgs.initQgis()
+    return qgs
+
+
+def qgis_benchmarks(vertex_counts, repeat, results):
+    """Benchmark the QGIS code paths; QGIS must be initialized (see start_qgis)."""
+    from qgis.core import (
+        QgsCoordinateReferenceSystem, QgsFeature, QgsField, QgsGeometry, QgsPointXY,
+        QgsProject, QgsUnitTypes, QgsVectorLayer,
+    )
+    from qgis.PyQt.QtCore import QVariant
+    from chainagetool import (
+        create_points, create_points_by_distance, points_along_line,
+        setup_distance_calculator,
+    )
+
+    projected = QgsCoordinateReferenceSystem("EPSG:32633")
+    geographic = QgsCoordinateReferenceSystem("EPSG:4326")
+    meters = QgsUnitTypes.DistanceMeters
+
+    for vertices in vertex_counts:
+        proj_geom = QgsGeometry.fromPolylineXY(
+            [QgsPointXY(x, y) for x, y in generate_line(vertices)])
+        geo_geom = QgsGeometry.fromPolylineXY(
+            [QgsPointXY(x, y) for x, y in generate_line(vertices, geographic=True)])
+        length = proj_geom.length()
+
+        for ratio in STATION_RATIOS:
+            distance = length / max(1, int(vertices * ratio))
+            for use_ellipsoidal in (False, True):
+                for reverse in (False, True):
+                    params = {'vertices': vertices, 'ratio': ratio, 'crs': 'projected',
+                              'ellipsoidal': use_ellipsoidal, 'reverse': reverse}
+                    seconds, features = time_call(lambda: create_points(
+                        0, 0, distance, proj_geom, True, False, 0, projected,
+                        use_ellipsoidal, meters, reverse=reverse), repeat)
+                    record(results, 'create_points', params, seconds, len(features))
+
+            # Geographic layer with meter distances: geodesic placement
+            distance_area = setup_distance_calculator(geographic, True)
+            for reverse in (False, True):
+                params = {'vertices': vertices, 'ratio': ratio, 'crs': 'geographic',
+                          'reverse': reverse}
+                seconds, features = time_call(lambda: create_points_by_distance(
+                    0, 0, distance, geo_geom, True, False, 0, distance_area, meters,
+                    reverse=reverse), repeat)
+                record(results, 'create_points_by_distance', params, seconds,
+                       len(features))
+
+        params = {'vertices': vertices, 'divide': 100, 'crs': 'projected'}
+        seconds, features = time_call(lambda: create_points(
+            0, 0, 0, proj_geom, False, False, 100, projected, True, meters), repeat)
+        record(results, 'create_points.divide', params, seconds, len(features))
+
+    # Whole runs on a layer of many short lines, with and without copied attributes
+    for feature_count in [n for n in (100, 1_000, 10_000) if n <= max(vertex_counts)]:
+        layer = QgsVectorLayer("LineString?crs=EPSG:32633", "bench", "memory")
+        provider = layer.dataProvider()
+        provider.addAttributes([QgsField(f"attr{i}", QVariant.Int)
+                                for i in range(COPIED_ATTRIBUTES)])
+        layer.updateFields()
+        features = []
+        for i in range(feature_count):
+            feature = QgsFeature(layer.fields())
+            feature.setGeometry(QgsGeometry.fromPolylineXY(
+                [QgsPointXY(x, y) for x, y in generate_line(50, seed=i)]))
+            feature.setAttributes(list(range(COPIED_ATTRIBUTES)))
+            features.append(feature)
+        provider.addFeatures(features)
+
+        for copy in (False, True):
+            copy_attributes = layer.fields().names() if copy else None
+            params = {'features': feature_count, 'vertices': 50,
+                      'copy_attributes': copy}
+            seconds, run_result = time_call(lambda: points_along_line(
+                "bench_out", 0, 0, 25, layer, selected_only=False, force_last=True,
+                distance_units=meters, copy_attributes=copy_attributes), repeat)
+            record(results, 'points_along_line', params, seconds,
+                   run_result.points_written)
+            QgsProject.instance().removeAllMapLayers()
+
+
+def merge_rounds(rounds):
+    """Merge the results of several rounds into one result per benchmark.
+
+    Each benchmark keeps its fastest round, in the order of the first round:
+    machine load only ever slows a round down, while a real regression slows
+    down every round.
+    """
+    times = {}
+    for results in rounds:
+        for result in results:
+            times.setdefault(result_key(result), []).append(result['seconds'])
+    return [dict(result, seconds=min(times[result_key(result)]))
+            for result in rounds[0]]
+
+
+def result_key(result):
+    """Return the key matching a result with its baseline entry."""
+    return f"{result['name']} {json.dumps(result['params'], sort_keys=True)}"
+
+
+def compare(results, baseline, tolerance):
+    """Return (key, baseline seconds, seconds) of results slower than baseline.
+
+    A result counts as slower when it takes more than (1 + tolerance) times
+    the baseline time and at least MIN_REGRESSION_SECONDS longer. Results
+    without baseline entry are ignored.
+    """
+    reference = {result_key(result): result['seconds'] for result in baseline['results']}
+    regressions = []
+    for result in results:
+        old = reference.get(result_key(result))
+        if old is None:
+            continue
+        new = result['seconds']
+        if new > old * (1 + tolerance) and new - old >= MIN_REGRESSION_SECONDS:
+            regressions.append((result_key(result), old, new))
+    return regressions
+
+
+def environment():
+    """Describe the machine and library versions of a benchmark run."""
+    info = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': None,
+        'qgis': None,
+    }
+    if HAS_NUMPY:
+        import numpy
+        info['numpy'] = numpy.__version__
+    try:
+        from qgis.core import Qgis
+        info['qgis'] = Qgis.QGIS_VERSION
+    except ImportError:
+        pass
+    return info
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the chainage engines.')
+    parser.add_argument('--output', default='benchmark_results.json',
+                        help='JSON file for the results (default: benchmark_results.json)')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed slowdown against the baseline, as a fraction '
+                        f'(default: {DEFAULT_TOLERANCE})')
+    parser.add_argument('--max-vertices', type=int, default=VERTEX_COUNTS[-1],
+                        help='largest synthetic line (default: 1000000)')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT,
+                        help=f'runs per benchmark, the median counts (default: {DEFAULT_REPEAT})')
+    parser.add_argument('--rounds', type=int, default=1,
+                        help='runs of the whole suite, the fastest round counts '
+                        '(default: 1)')
+    parser.add_argument('--quick', action='store_true',
+                        help='only lines up to 10000 vertices, three runs each')
+    parser.add_argument('--kernel-only', action='store_true',
+                        help='skip the benchmarks that need QGIS')
+    args = parser.parse_args(argv)
+
+    max_vertices = min(args.max_vertices, 10_000) if args.quick else args.max_vertices
+    repeat = min(args.repeat, 3) if args.quick else args.repeat
+    vertex_counts = [n for n in VERTEX_COUNTS if n <= max_vertices]
+
+    # Rounds spread the runs of a benchmark over time, so a burst of machine
+    # load does not slow down all of them
+    qgs = None if args.kernel_only else start_qgis()
+    rounds = []
+    try:
+        for _ in range(max(1, args.rounds)):
+            results = []
+            kernel_benchmarks(vertex_counts, repeat, results)
+            if qgs is not None:
+                qgis_benchmarks(vertex_counts, repeat, results)
+            rounds.append(results)
+    finally:
+        if qgs is not None:
+            qgs.exitQgis()
+    results = merge_rounds(rounds)
+
+    with open(args.output, 'w') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for key, old, new in regressions:
+            print(f"SLOWER: {key}: {old * 1000:.2f} ms -> {new * 1000:.2f} ms "
+                  f"({new / old:.2f}x)")
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) slower than the baseline")
+            return 1
+        print("No benchmark slower than the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the result caches of incremental and on-the-fly chainage.
+
+These tests do not need a QGIS installation and can be run with plain
+Python or pytest.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import struct
+import sys
+import unittest
+from pathlib import Path
+
+# Add plugin path to Python path
+plugin_path = Path(__file__).parent.parent / 'qchainage'
+sys.path.insert(0, str(plugin_path))
+
+from chainagecache import (
+    SOURCE_ID_BITS, STATION_ID_BITS, ChainageCache, LruCache, feature_key,
+    split_station_id, station_id, tile_bounds, tile_keys, tile_level,
+)
+
+
+def linestring_wkb(coords):
+    """Encode a 2D LineString as little endian WKB."""
+    data = struct.pack('<BII', 1, 2, len(coords))
+    for x, y in coords:
+        data += struct.pack('<dd', x, y)
+    return data
+
+
+class TestFeatureKey(unittest.TestCase):
+    """Test the cache key of source features."""
+
+    def test_geometry_and_attributes(self):
+        wkb = linestring_wkb([(0, 0), (10, 0)])
+        key = feature_key(wkb, ['A1'])
+        self.assertEqual(len(key), 16)
+        self.assertEqual(key, feature_key(bytearray(wkb), ['A1']))
+        self.assertNotEqual(key, feature_key(wkb, ['A2']))
+        self.assertNotEqual(key, feature_key(linestring_wkb([(0, 0), (10, 1)]), ['A1']))
+        self.assertNotEqual(feature_key(wkb), key)
+
+
+class TestChainageCache(unittest.TestCase):
+    """Test storing, invalidating and dropping cached results."""
+
+    def test_store_and_invalidate(self):
+        cache = ChainageCache()
+        cache.reset(('params',))
+        cache.store(1, b'a', [10, 11])
+        cache.store(2, b'b', [12])
+
+        self.assertTrue(cache.is_current(1, b'a'))
+        self.assertFalse(cache.is_current(1, b'changed'))
+        self.assertFalse(cache.is_current(3, b'a'))
+
+        cache.invalidate(1)
+        self.assertEqual(cache.dirty, {1})
+        self.assertTrue(cache.is_current(1, b'a'))
+        self.assertEqual(list(cache.pop(1)), [10, 11])
+        self.assertEqual(list(cache.pop(1)), [])
+        self.assertEqual(cache.fids(), [2])
+
+        cache.mark_clean()
+        self.assertEqual(cache.dirty, set())
+        self.assertFalse(cache.scan_required)
+
+    def test_reset(self):
+        cache = ChainageCache()
+        cache.reset(('old',))
+        cache.store(1, b'a', [10, 11])
+        cache.store(2, b'b', [12])
+        cache.mark_clean()
+
+        self.assertEqual(sorted(cache.reset(('new',))), [10, 11, 12])
+        self.assertEqual(cache.params, ('new',))
+        self.assertEqual(len(cache), 0)
+        self.assertTrue(cache.scan_required)
+
+
+class TestTiles(unittest.TestCase):
+    """Test the tile grid and station ids of virtual chainage layers."""
+
+    def test_tile_level(self):
+        # 1000 units wide in about 4 tiles -> 256 unit tiles
+        self.assertEqual(tile_level(1000, 400), 8)
+        self.assertEqual(tile_level(0, 0), 0)
+        self.assertEqual(tile_level(0.01, 0.01), -8)
+
+    def test_tile_keys_cover_extent(self):
+        keys = tile_keys(-10, 0, 300, 100, 8)
+        self.assertEqual(keys, [(8, -1, 0), (8, 0, 0), (8, 1, 0)])
+        self.assertEqual(tile_bounds((8, -1, 0)), (-256.0, 0.0, 0.0, 256.0))
+
+    def test_station_id(self):
+        for source_fid, index in ((0, 0), (7, 3), (123456, 999), (-1, 5)):
+            fid = station_id(source_fid, index)
+            self.assertEqual(split_station_id(fid), (source_fid, index))
+        self.assertNotEqual(station_id(1, 0), station_id(0, 1))
+
+    def test_station_id_boundary(self):
+        # Stations of a 2000 km line at 1 m spacing stay below the next feature
+        last = (1 << STATION_ID_BITS) - 1
+        self.assertLess(station_id(0, 2_000_001), station_id(1, 0))
+        self.assertEqual(split_station_id(station_id(7, last)), (7, last))
+        self.assertEqual(station_id(7, last) + 1, station_id(8, 0))
+        self.assertLess(station_id((1 << SOURCE_ID_BITS) - 1, last), 1 << 63)
+        self.assertGreaterEqual(station_id(-(1 << SOURCE_ID_BITS), 0), -(1 << 63))
+        for source_fid, index in ((7, last + 1), (7, -1), (1 << SOURCE_ID_BITS, 0)):
+            with self.assertRaises(ValueError):
+                station_id(source_fid, index)
+
+
+class TestLruCache(unittest.TestCase):
+    """Test eviction of least recently used entries."""
+
+    def test_eviction(self):
+        cache = LruCache(2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.get('b', 'missing'), 'missing')
+        self.assertEqual(len(cache), 2)
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
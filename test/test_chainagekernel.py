@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the QGIS-free chainage kernel.
+
+These tests do not need a QGIS installation and can be run with plain
+Python or pytest.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import random
+import struct
+import sys
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Add plugin path to Python path
+plugin_path = Path(__file__).parent.parent / 'qchainage'
+sys.path.insert(0, str(plugin_path))
+
+from chainagekernel import (
+    HAS_NUMPY, DistanceMap, LineWalker, NumpyLine, ReversedIndex, SegmentTable,
+    StationBuffer, chain_length,
+    chainage_batch, decode_wkb_arrays, decode_wkb_lines, locate_on_segment,
+    make_line_index, place_stations, polyline_length,
+)
+
+
+def linestring_wkb(coords, wkb_type=2, byte_order='<'):
+    """Encode a LineString as WKB (ISO type codes, any dimension)."""
+    flag = 1 if byte_order == '<' else 0
+    data = struct.pack(byte_order + 'BII', flag, wkb_type, len(coords))
+    for coord in coords:
+        data += struct.pack(byte_order + 'd' * len(coord), *coord)
+    return data
+
+
+def reference_point_at(parts, distance):
+    """Locate a point by walking from the first vertex (old behaviour)."""
+    if distance < 0:
+        return None
+    for part in parts:
+        part_length = polyline_length(part)
+        if part_length >= distance:
+            for i in range(1, len(part)):
+                seg = polyline_length(part[i - 1:i + 1])
+                if distance <= seg:
+                    (x0, y0), (x1, y1) = part[i - 1], part[i]
+                    ratio = distance / seg if seg > 0 else 0.0
+                    return x0 + (x1 - x0) * ratio, y0 + (y1 - y0) * ratio
+                distance -= seg
+        distance -= part_length
+    return None
+
+
+class TestLineWalker(unittest.TestCase):
+    """Test single-pass station placement."""
+
+    def assertPointAlmostEqual(self, actual, expected):
+        self.assertIsNotNone(actual)
+        self.assertAlmostEqual(actual[0], expected[0], places=9)
+        self.assertAlmostEqual(actual[1], expected[1], places=9)
+
+    def test_length(self):
+        walker = LineWalker([[(0, 0), (30, 40), (30, 50)]])
+        self.assertAlmostEqual(walker.length, 60.0)
+
+    def test_stations_match_reference(self):
+        parts = [[(0, 0), (10, 0), (10, 10), (25, 30)]]
+        walker = LineWalker(parts)
+        distance = 0.0
+        while distance <= walker.length:
+            self.assertPointAlmostEqual(walker.point_at(distance),
+                                        reference_point_at(parts, distance))
+            distance += 0.7
+
+    def test_end_of_line(self):
+        walker = LineWalker([[(0, 0), (100, 0)]])
+        self.assertPointAlmostEqual(walker.point_at(100), (100, 0))
+        self.assertIsNone(walker.point_at(100.5))
+        self.assertIsNone(walker.point_at(-1))
+
+    def test_multipart_has_no_gap_segment(self):
+        parts = [[(0, 0), (10, 0)], [(100, 0), (100, 10)]]
+        walker = LineWalker(parts)
+        self.assertAlmostEqual(walker.length, 20.0)
+        self.assertPointAlmostEqual(walker.point_at(10), (10, 0))
+        self.assertPointAlmostEqual(walker.point_at(15), (100, 5))
+
+    def test_multipart_end_of_line(self):
+        parts = [[(173.0, 548.8), (703.0, 674.5), (374.7, 439.0)],
+                 [(508.4, 778.4), (520.9, 393.3), (489.7, 29.6)]]
+        walker = LineWalker(parts)
+        stations = place_stations(walker, walker.length, 0, 0, 0, divide=2)
+        self.assertEqual(len(stations), 3)
+        self.assertPointAlmostEqual(stations[-1][1:], (489.7, 29.6))
+
+    def test_rewind_on_smaller_distance(self):
+        walker = LineWalker([[(0, 0), (10, 0), (20, 0)]])
+        self.assertPointAlmostEqual(walker.point_at(15), (15, 0))
+        self.assertPointAlmostEqual(walker.point_at(5), (5, 0))
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+class TestNumpyLine(unittest.TestCase):
+    """Test the vectorized engine against the single-pass walker."""
+
+    def test_matches_walker(self):
+        parts = [[(0, 0), (10, 0), (10, 10), (25, 30)], [(50, 50), (60, 50)]]
+        walker = LineWalker(parts)
+        line = NumpyLine(parts)
+        self.assertAlmostEqual(line.length, walker.length)
+
+        distances = [i * 0.37 for i in range(int(walker.length / 0.37) + 1)]
+        distances.append(walker.length)
+        for expected, actual in zip(walker.points_at(distances), line.points_at(distances)):
+            self.assertAlmostEqual(actual[0], expected[0], places=9)
+            self.assertAlmostEqual(actual[1], expected[1], places=9)
+
+    def test_multipart_end_of_line_matches_walker(self):
+        rng = random.Random(1)
+        for _ in range(500):
+            parts = [[(rng.uniform(0, 1000), rng.uniform(0, 1000)) for _ in range(3)]
+                     for _ in range(rng.randint(2, 4))]
+            walker = LineWalker(parts)
+            line = NumpyLine(parts)
+            expected = place_stations(walker, walker.length, 0, 0, 0, divide=3)
+            actual = place_stations(line, line.length, 0, 0, 0, divide=3)
+            self.assertEqual(len(actual), len(expected))
+            self.assertEqual(len(expected), 4)
+            for (_, x0, y0), (_, x1, y1) in zip(expected, actual):
+                self.assertAlmostEqual(x0, x1, places=9)
+                self.assertAlmostEqual(y0, y1, places=9)
+
+    def test_outside_line(self):
+        line = NumpyLine([[(0, 0), (100, 0)]])
+        self.assertEqual(line.points_at([-1, 100.5]), [None, None])
+        self.assertEqual(line.points_at([100]), [(100.0, 0.0)])
+
+    def test_zero_length_segment(self):
+        line = NumpyLine([[(0, 0), (0, 0), (10, 0)]])
+        self.assertEqual(line.points_at([0, 5]), [(0.0, 0.0), (5.0, 0.0)])
+
+    def test_empty_line(self):
+        self.assertEqual(NumpyLine([[(1, 1)]]).points_at([0]), [None])
+
+
+class TestDistanceMap(unittest.TestCase):
+    """Test bisection lookups on the parallel-array distance map."""
+
+    def setUp(self):
+        # Two parts chained with a zero-length gap between (20, 2) entries
+        self.distance_map = DistanceMap.from_pairs([
+            (0.0, 0.0), (10.0, 1.0), (20.0, 2.0), (20.0, 2.0), (40.0, 3.0)
+        ])
+
+    def test_segment_indices(self):
+        indices = self.distance_map.segment_indices([0, 5, 10, 15, 20, 30, 40])
+        self.assertEqual(indices, [0, 0, 0, 1, 1, 3, 3])
+
+    def test_unsorted_targets(self):
+        indices = self.distance_map.segment_indices([30, 5, 15])
+        self.assertEqual(indices, [3, 0, 1])
+
+    def test_interpolate_many(self):
+        self.assertEqual(self.distance_map.interpolate_many([0, 5, 20, 30, 50]),
+                         [0.0, 0.5, 2.0, 2.5, 3.0])
+        self.assertEqual(self.distance_map.total_meters, 40.0)
+
+    def test_empty_map(self):
+        self.assertEqual(DistanceMap().interpolate_many([1.0]), [None])
+        self.assertEqual(DistanceMap().total_meters, 0.0)
+
+
+class TestPlaceStations(unittest.TestCase):
+    """Test station planning for the different chainage modes."""
+
+    def setUp(self):
+        self.index = LineWalker([[(0, 0), (95, 0)]])
+
+    def distances(self, **kwargs):
+        params = dict(startpoint=0, endpoint=0, distance=30)
+        params.update(kwargs)
+        return [dist for dist, _, _ in place_stations(self.index, 95.0, **params)]
+
+    def test_interval(self):
+        self.assertEqual(self.distances(), [0, 30, 60, 90])
+
+    def test_force_last(self):
+        self.assertEqual(self.distances(force_last=True), [0, 30, 60, 90, 95])
+
+    def test_force_first_last(self):
+        self.assertEqual(self.distances(force_first_last=True), [0, 95])
+
+    def test_divide(self):
+        distances = self.distances(divide=5, startpoint=20, endpoint=70)
+        self.assertEqual(len(distances), 6)
+        self.assertAlmostEqual(distances[1], 30)
+        self.assertEqual(distances[-1], 70)
+
+    def test_measured_length_is_scaled(self):
+        # A line measured twice as long places stations at half the distance
+        stations = place_stations(self.index, 190.0, 0, 0, 95)
+        self.assertEqual([(dist, x) for dist, x, _ in stations], [(0, 0), (95, 47.5), (190, 95)])
+
+
+class TestReversedIndex(unittest.TestCase):
+    """Test reverse chainage on the original (not reversed) line."""
+
+    def test_matches_reversed_line(self):
+        parts = [[(0, 0), (10, 0), (10, 10), (25, 30)]]
+        index = ReversedIndex(LineWalker(parts))
+        reversed_line = LineWalker([parts[0][::-1]])
+        distances = [i * 0.9 for i in range(int(index.length / 0.9) + 1)]
+        for expected, actual in zip(reversed_line.points_at(distances),
+                                    index.points_at(distances)):
+            self.assertAlmostEqual(actual[0], expected[0], places=9)
+            self.assertAlmostEqual(actual[1], expected[1], places=9)
+
+    def test_multipart_has_no_gap_segment(self):
+        index = ReversedIndex(LineWalker([[(0, 0), (10, 0)], [(100, 0), (100, 10)]]))
+        self.assertEqual(index.points_at([0, 5, 15, 20]),
+                         [(100.0, 10.0), (100.0, 5.0), (5.0, 0.0), (0.0, 0.0)])
+
+    def test_outside_line(self):
+        index = ReversedIndex(LineWalker([[(0, 0), (100, 0)]]))
+        self.assertEqual(index.points_at([-1, 100.5]), [None, None])
+
+
+class TestStationBuffer(unittest.TestCase):
+    """Test the columnar station buffer."""
+
+    def test_extend_and_rows(self):
+        buffer = StationBuffer()
+        first = buffer.add_source(['a'])
+        buffer.extend([(0.0, 1.0, 2.0), (5.0, 3.0, 4.0)], 7, first)
+        buffer.extend([], 8, first)
+        # Equal consecutive sources share one entry
+        self.assertEqual(buffer.add_source(['a']), first)
+        second = buffer.add_source(['b'])
+        buffer.extend([(0.0, 9.0, 9.0)], 9, second)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.nbytes, 3 * 5 * 8)
+        self.assertEqual(list(buffer.rows()), [
+            (0.0, 1.0, 2.0, 7, ['a']),
+            (5.0, 3.0, 4.0, 7, ['a']),
+            (0.0, 9.0, 9.0, 9, ['b']),
+        ])
+        self.assertEqual(list(buffer.rows(2)), [(0.0, 9.0, 9.0, 9, ['b'])])
+
+    def test_chunks_and_clear(self):
+        buffer = StationBuffer()
+        buffer.extend([(float(i), 0.0, 0.0) for i in range(5)])
+        self.assertEqual(list(buffer.chunks(2)), [(0, 2), (2, 4), (4, 5)])
+        buffer.clear()
+        self.assertEqual(len(buffer), 0)
+        self.assertEqual(list(buffer.chunks(2)), [])
+
+
+class TestSegmentTable(unittest.TestCase):
+    """Test locating points on the segments of routes."""
+
+    def test_locate_on_segment(self):
+        # Offsets are positive to the right of the direction of travel
+        self.assertEqual(locate_on_segment(4, -3, 0, 0, 10, 0), (4.0, 3.0))
+        self.assertEqual(locate_on_segment(4, 3, 0, 0, 10, 0), (4.0, -3.0))
+        # Beyond the ends the closest point is the end vertex
+        self.assertEqual(locate_on_segment(13, -4, 0, 0, 10, 0), (10.0, 5.0))
+        self.assertEqual(locate_on_segment(-1, 0, 0, 0, 0, 0), (0.0, 1.0))
+
+    def test_measures(self):
+        table = SegmentTable()
+        self.assertEqual(table.add_route([[(0, 0), (10, 0)], [(20, 0), (20, 10)]]), 0)
+        self.assertEqual(table.add_route([[(0, 0), (3, 4)]]), 1)
+        self.assertEqual(len(table), 3)
+        # Parts are chained without a connecting segment
+        self.assertEqual(list(table.start), [0.0, 10.0, 0.0])
+        self.assertEqual(list(table.route), [0, 0, 1])
+        self.assertEqual(list(table.lengths), [20.0, 5.0])
+        self.assertEqual(table.bounds(1), (20.0, 0.0, 20.0, 10.0))
+        self.assertEqual(table.locate(1, 25, 5), (15.0, 5.0))
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy not installed")
+    def test_arrays_match_lists(self):
+        coords = [(0.0, 0.0), (3.0, 4.0), (3.0, 10.0), (-2.0, 10.0)]
+        from_lists = SegmentTable()
+        from_lists.add_route([coords])
+        from_arrays = SegmentTable()
+        from_arrays.add_route(decode_wkb_arrays(linestring_wkb(coords)))
+        for name in ('x0', 'y0', 'x1', 'y1', 'start', 'route', 'lengths'):
+            self.assertEqual(list(getattr(from_arrays, name)),
+                             list(getattr(from_lists, name)), name)
+
+
+class TestWkbDecoding(unittest.TestCase):
+    """Test decoding line WKB for the parallel chainage mode."""
+
+    def test_linestring(self):
+        wkb = linestring_wkb([(0, 0), (10, 5)])
+        self.assertEqual(decode_wkb_lines(wkb), [[(0.0, 0.0), (10.0, 5.0)]])
+
+    def test_big_endian_zm(self):
+        wkb = linestring_wkb([(0, 0, 1, 2), (10, 5, 3, 4)], 3002, '>')
+        self.assertEqual(decode_wkb_lines(wkb), [[(0.0, 0.0), (10.0, 5.0)]])
+
+    def test_multilinestring(self):
+        wkb = struct.pack('<BII', 1, 1005, 2)
+        wkb += linestring_wkb([(0, 0, 9), (1, 0, 9)], 1002)
+        wkb += linestring_wkb([(5, 5, 9), (5, 6, 9)], 1002)
+        self.assertEqual(decode_wkb_lines(wkb),
+                         [[(0.0, 0.0), (1.0, 0.0)], [(5.0, 5.0), (5.0, 6.0)]])
+
+    def test_unsupported_type(self):
+        with self.assertRaises(ValueError):
+            decode_wkb_lines(struct.pack('<BIdd', 1, 1, 0.0, 0.0))
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy not installed")
+    def test_arrays(self):
+        wkb = struct.pack('<BII', 1, 1005, 2)
+        wkb += linestring_wkb([(0, 0, 9), (1, 0, 9)], 1002)
+        wkb += linestring_wkb([(5, 5, 9), (5, 6, 9)], 1002, '>')
+        first, second = decode_wkb_arrays(wkb)
+        self.assertEqual(first.shape, (2, 3))
+        self.assertEqual(second.tolist(), [[5.0, 5.0, 9.0], [5.0, 6.0, 9.0]])
+        # Views on the WKB buffer, not copies
+        self.assertFalse(first.flags.writeable)
+        self.assertFalse(first.flags.owndata)
+
+    @unittest.skipUnless(HAS_NUMPY, "NumPy not installed")
+    def test_arrays_zm(self):
+        wkb = linestring_wkb([(0, 0, 1, 2), (3, 4, 3, 4)], 3002, '>')
+        (coords,) = decode_wkb_arrays(wkb)
+        self.assertEqual(coords.shape, (2, 4))
+        self.assertEqual(chain_length([coords]), 5.0)
+        self.assertEqual(make_line_index([coords], 'python').points_at([2.5]),
+                         [(1.5, 2.0)])
+        self.assertEqual(NumpyLine([coords]).points_at([2.5]), [(1.5, 2.0)])
+
+    def test_chain_length(self):
+        # Parts are joined by the segment (1, 0) - (1, 3)
+        self.assertEqual(chain_length([[(0, 0), (1, 0)], [(1, 3), (1, 4)]]), 5.0)
+
+
+class TestChainageBatch(unittest.TestCase):
+    """Test the process pool entry point of the parallel mode."""
+
+    params = dict(startpoint=0, endpoint=0, distance=25, force_last=True,
+                  force_first_last=False, divide=0)
+
+    def test_batch(self):
+        items = [(linestring_wkb([(0, 0), (100, 0)]), None),
+                 (linestring_wkb([(0, 0), (0, 60)]), None)]
+        results = chainage_batch(items, self.params)
+        self.assertEqual([dist for dist, _, _ in results[0]], [0, 25, 50, 75, 100])
+        self.assertEqual(results[1][-1], (60, 0.0, 60.0))
+
+    def test_reverse(self):
+        items = [(linestring_wkb([(0, 0), (100, 0)]), None)]
+        params = dict(self.params, reverse=True)
+        self.assertEqual(chainage_batch(items, params)[0][1], (25, 75.0, 0.0))
+
+    def test_process_pool(self):
+        items = [(linestring_wkb([(0, 0), (100, 0)]), None)]
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            result = executor.submit(chainage_batch, items, self.params).result()
+        self.assertEqual(result, chainage_batch(items, self.params))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests for the run statistics of chainage runs.
+
+These tests do not need a QGIS installation and can be run with plain
+Python or pytest.
+
+Copyright (c) 2025 Werner Macho
+Licensed under GNU GPL v3.0
+"""
+
+import json
+import os
+import pstats
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Add plugin path to Python path
+plugin_path = Path(__file__).parent.parent / 'qchainage'
+sys.path.insert(0, str(plugin_path))
+
+from chainagestats import (
+    PHASE_READ, PHASE_WRITE, PHASES, PLACEMENT_METER_BASED, PROFILE_ENV,
+    ChainageResult, PhaseTimer, profile_run,
+)
+
+
+class TestPhaseTimer(unittest.TestCase):
+    """Test accumulating wall time per phase."""
+
+    def test_add(self):
+        timer = PhaseTimer()
+        timer.add(PHASE_READ, 0.25)
+        timer.add(PHASE_READ, 0.5)
+        timer.add(PHASE_WRITE, 1.0)
+        self.assertEqual(timer.seconds[PHASE_READ], 0.75)
+        self.assertEqual(timer.total, 1.75)
+        self.assertEqual(list(timer.seconds), list(PHASES))
+
+    def test_measure(self):
+        timer = PhaseTimer()
+        with timer.measure(PHASE_WRITE):
+            sum(range(1000))
+        self.assertGreater(timer.seconds[PHASE_WRITE], 0.0)
+        self.assertIn("write", timer.summary())
+
+
+class TestChainageResult(unittest.TestCase):
+    """Test the counters of a chainage run."""
+
+    def test_counters(self):
+        result = ChainageResult(PLACEMENT_METER_BASED)
+        result.add_feature(3)
+        result.add_feature(0)
+        result.add_feature(5)
+        result.skip_feature()
+        result.buffered(8)
+        result.buffered(2)
+        self.assertEqual(result.features_processed, 4)
+        self.assertEqual(result.features_skipped, 1)
+        self.assertEqual(result.features_without_stations, 1)
+        self.assertEqual(result.points_created, 8)
+        self.assertEqual(result.peak_points_per_feature, 5)
+        self.assertEqual(result.peak_points_buffered, 8)
+
+    def test_clipped_points(self):
+        result = ChainageResult()
+        result.add_feature(2)
+        self.assertNotIn("clip", result.summary())
+        result.clip_points(3)
+        result.clip_points(0)
+        self.assertEqual(result.points_clipped, 3)
+        self.assertEqual(result.to_dict()['points_clipped'], 3)
+        self.assertIn("3 points outside the clip region", result.summary())
+
+    def test_to_json(self):
+        result = ChainageResult(workers=2)
+        result.add_feature(4)
+        result.points_written = 4
+        result.timer.add(PHASE_WRITE, 0.5)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'stats.json')
+            text = result.to_json(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), text)
+        stats = json.loads(text)
+        self.assertIsNone(stats['layer_id'])
+        self.assertEqual(stats['workers'], 2)
+        self.assertEqual(stats['points_written'], 4)
+        self.assertEqual(stats['timings'][PHASE_WRITE], 0.5)
+        self.assertEqual(stats['total_seconds'], 0.5)
+
+
+class TestProfileRun(unittest.TestCase):
+    """Test the optional cProfile hook."""
+
+    def test_disabled(self):
+        with mock.patch.dict(os.environ, {PROFILE_ENV: ''}):
+            with profile_run() as path:
+                self.assertIsNone(path)
+
+    def test_profile_into_directory(self):
+        with tempfile.TemporaryDirectory() as folder:
+            with mock.patch.dict(os.environ, {PROFILE_ENV: folder}):
+                with profile_run('chain_test') as path:
+                    sum(range(1000))
+            self.assertTrue(os.path.basename(path).startswith('chain_test_'))
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
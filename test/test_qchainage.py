@@ -17,6 +17,7 @@ Licensed under GNU GPL v3.0
 
 import sys
 import os
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -24,7 +25,9 @@ from pathlib import Path
 plugin_path = Path(__file__).parent.parent / 'qchainage'
 sys.path.insert(0, str(plugin_path))
 
+from qgis.PyQt.QtCore import QVariant
 from qgis.core import (
+    NULL,
     QgsApplication,
     QgsVectorLayer,
     QgsFeature,
@@ -33,9 +36,27 @@ from qgis.core import (
     QgsProject,
     QgsCoordinateReferenceSystem,
     QgsUnitTypes,
+    QgsProcessingContext,
+    QgsProcessingFeedback,
+    QgsFeatureRequest,
+    QgsField,
+    QgsFields,
+    QgsRectangle,
+    QgsWkbTypes,
 )
 
-from chainagetool import points_along_line, create_points
+from chainagealgorithm import (
+    QChainageAlgorithm, QChainageEventsAlgorithm, QChainageLocateAlgorithm,
+)
+from chainagetool import (
+    ChainageContext, RouteIndex, event_stations, points_along_line, create_points,
+    create_feature_with_point,
+    setup_distance_calculator, collect_chainage_stations, iter_buffered_features,
+    write_chainage_file,
+)
+from chainagecache import ChainageCache
+from chainagelive import LiveChainage
+from chainagevirtual import create_virtual_layer
 
 
 class TestQChainageSetup(unittest.TestCase):
@@ -348,6 +369,62 @@ class TestDistanceUnits(TestQChainageSetup):
         
         # Clean up
         QgsProject.instance().removeAllMapLayers()
+    
+    def test_context_resolved_once(self):
+        """Test the per-run context converts units and maps copied attributes."""
+        layer = QgsVectorLayer("LineString?crs=EPSG:32633&field=name:string&field=code:integer",
+                               "ctx_test", "memory")
+        context = ChainageContext(layer.crs(), layer.fields(), False,
+                                  QgsUnitTypes.DistanceKilometers, ["code", "missing"])
+        
+        self.assertEqual(context.to_layer_units(1, 0, 0.5), (1000, 0, 500))
+        self.assertEqual(context.attribute_map, [(1, 1)])
+        self.assertEqual(context.fields.names(), ["cng_kilometers", "code"])
+        
+        geom = QgsGeometry.fromPolylineXY([QgsPointXY(500000, 6000000),
+                                           QgsPointXY(500000, 6001000)])
+        features = create_points(0, 0, 0.25, geom, False, False, 0, context=context)
+        self.assertEqual([f['dist'] for f in features], [0, 250, 500, 750, 1000])
+    
+    def test_copied_attributes(self):
+        """Test copied attributes are set on every station feature."""
+        layer = QgsVectorLayer("LineString?crs=EPSG:32633&field=name:string&field=code:integer",
+                               "copy_test", "memory")
+        source = QgsFeature(layer.fields())
+        source.setAttributes(["main road", 7])
+        geom = QgsGeometry.fromPolylineXY([QgsPointXY(500000, 6000000),
+                                           QgsPointXY(500100, 6000000)])
+        
+        features = create_points(0, 0, 50, geom, False, False, 0, layer.crs(), False,
+                                 source_feature=source, copy_attributes=["code", "name"])
+        
+        self.assertEqual(len(features), 3)
+        for feature in features:
+            self.assertEqual(feature.attributes()[1:], [7, "main road"])
+    
+    def test_feature_needs_dist_field(self):
+        """Test a missing 'dist' field is an error, not another attribute."""
+        fields = QgsFields()
+        fields.append(QgsField("name", QVariant.String))
+        point = QgsGeometry.fromPointXY(QgsPointXY(500000, 6000000))
+        with self.assertRaises(KeyError):
+            create_feature_with_point(fields, point, 10.0)
+    
+    def test_failed_file_output_is_removed(self):
+        """Test a run failing while writing leaves no truncated output file."""
+        context = ChainageContext(QgsCoordinateReferenceSystem("EPSG:32633"),
+                                  use_ellipsoidal=False)
+        
+        def station_batches():
+            yield None, [(0.0, 500000.0, 6000000.0), (10.0, 500010.0, 6000000.0)]
+            raise RuntimeError("source layer went away")
+        
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stations.gpkg")
+            with self.assertRaises(RuntimeError):
+                write_chainage_file(station_batches(), path, "stations", context,
+                                    chunk_size=1)
+            self.assertFalse(os.path.exists(path))
 
 
 class TestProjectionModes(TestQChainageSetup):
@@ -432,6 +509,29 @@ class TestProjectionModes(TestQChainageSetup):
         
         # Clean up
         QgsProject.instance().removeAllMapLayers()
+    
+    def test_geographic_station_spacing(self):
+        """Test geographic stations are exact geodesic distances apart."""
+        crs = QgsCoordinateReferenceSystem("EPSG:4326")
+        geom = QgsGeometry.fromPolylineXY([
+            QgsPointXY(10, 45), QgsPointXY(10.5, 45.3), QgsPointXY(11, 45.1)
+        ])
+        
+        features = create_points(
+            startpoint=0, endpoint=0, distance=5000, geom=geom,
+            force_last=False, force_first_last=False, divide=0,
+            layer_crs=crs, use_ellipsoidal=True,
+            distance_units=QgsUnitTypes.DistanceMeters
+        )
+        
+        distance_area = setup_distance_calculator(crs, True)
+        self.assertGreater(len(features), 2)
+        for previous, current in zip(features, features[1:]):
+            self.assertAlmostEqual(current['dist'] - previous['dist'], 5000, places=6)
+        # Stations on the first segment are exactly one interval apart
+        first = features[0].geometry().asPoint()
+        second = features[1].geometry().asPoint()
+        self.assertAlmostEqual(distance_area.measureLine(first, second), 5000, delta=0.01)
 
 
 class TestStartEndPoints(TestQChainageSetup):
@@ -525,6 +625,456 @@ class TestMultipleFeatures(TestQChainageSetup):
         
         # Clean up
         QgsProject.instance().removeAllMapLayers()
+    
+    def test_filter_expression(self):
+        """Test only features matching the filter expression are processed."""
+        layer = self.create_line_layer(32633, "utm_test")
+        
+        # Add three 50m lines, the first and last lie west of 500150
+        self.add_line_feature(layer, [(500000, 6000000), (500050, 6000000)])
+        self.add_line_feature(layer, [(500200, 6000000), (500250, 6000000)])
+        self.add_line_feature(layer, [(500100, 6000000), (500150, 6000000)])
+        
+        points_along_line(
+            layerout="test_filter",
+            startpoint=0,
+            endpoint=0,
+            distance=25,
+            layer=layer,
+            selected_only=False,
+            force_last=True,
+            use_ellipsoidal=False,
+            distance_units=QgsUnitTypes.DistanceMeters,
+            filter_expression="x_max($geometry) <= 500150"
+        )
+        
+        # Two lines: 0, 25, 50 = 3 points × 2 lines = 6 points
+        count = self.count_points_in_layer("test_filter")
+        self.assertEqual(count, 6, f"Expected 6 points from 2 lines, got {count}")
+        
+        # Clean up
+        QgsProject.instance().removeAllMapLayers()
+    
+    def test_clip_region(self):
+        """Test only lines and stations inside the clip region are kept."""
+        layer = self.create_line_layer(32633, "utm_test")
+        
+        # A 100m line crossing the region and one far outside of it
+        self.add_line_feature(layer, [(500000, 6000000), (500100, 6000000)])
+        self.add_line_feature(layer, [(600000, 6000000), (600100, 6000000)])
+        
+        region = QgsRectangle(500040, 5999990, 500200, 6000010)
+        common = dict(startpoint=0, endpoint=0, distance=25, layer=layer,
+                      selected_only=False, force_last=True, use_ellipsoidal=False,
+                      distance_units=QgsUnitTypes.DistanceMeters)
+        result = points_along_line(layerout="test_clip", clip=region, **common)
+        
+        # Stations 50, 75 and 100 of the first line; the second is never read
+        self.assertEqual(sorted(f['cng_meters'] for f in result.layer.getFeatures()),
+                         [50.0, 75.0, 100.0])
+        self.assertEqual(result.features_processed, 1)
+        self.assertEqual(result.points_clipped, 2)
+        
+        # A polygon region drops the stations outside the polygon itself:
+        # same bounding box, but station 50 lies in a notch
+        notched = QgsGeometry.fromPolygonXY([[
+            QgsPointXY(500040, 5999990), QgsPointXY(500200, 5999990),
+            QgsPointXY(500200, 6000010), QgsPointXY(500055, 6000010),
+            QgsPointXY(500055, 5999995), QgsPointXY(500045, 5999995),
+            QgsPointXY(500045, 6000010), QgsPointXY(500040, 6000010),
+            QgsPointXY(500040, 5999990)]])
+        result = points_along_line(layerout="test_clip_polygon", clip=notched, **common)
+        self.assertEqual(sorted(f['cng_meters'] for f in result.layer.getFeatures()),
+                         [75.0, 100.0])
+        
+        # Clean up
+        QgsProject.instance().removeAllMapLayers()
+    
+    def test_run_result(self):
+        """Test points_along_line returns the counters of the run."""
+        layer = self.create_line_layer(32633, "utm_test")
+        
+        self.add_line_feature(layer, [(500000, 6000000), (500050, 6000000)])
+        self.add_line_feature(layer, [(500000, 6000100), (500100, 6000100)])
+        
+        result = points_along_line(
+            layerout="test_result",
+            startpoint=0,
+            endpoint=0,
+            distance=25,
+            layer=layer,
+            selected_only=False,
+            force_last=True,
+            use_ellipsoidal=False,
+            distance_units=QgsUnitTypes.DistanceMeters
+        )
+        
+        # 3 + 5 points from two lines
+        self.assertFalse(result.canceled)
+        self.assertEqual(result.features_processed, 2)
+        self.assertEqual(result.points_written, 8)
+        self.assertEqual(result.peak_points_per_feature, 5)
+        self.assertEqual(result.layer.featureCount(), 8)
+        self.assertEqual(result.to_dict()['layer_id'], result.layer.id())
+        
+        # Clean up
+        QgsProject.instance().removeAllMapLayers()
+    
+    def test_collect_stations(self):
+        """Test stations are buffered per source feature and built in chunks."""
+        layer = self.create_line_layer(32633, "utm_test")
+        
+        self.add_line_feature(layer, [(500000, 6000000), (500050, 6000000)])
+        self.add_line_feature(layer, [(500000, 6000100), (500100, 6000100)])
+        
+        context = ChainageContext(layer.crs(), layer.fields(), False,
+                                  QgsUnitTypes.DistanceMeters)
+        stations = collect_chainage_stations(
+            layer.getFeatures(), layer.crs(), 0, 0, 25, force_last=True,
+            context=context
+        )
+        
+        # 3 + 5 stations, attributes stored once for both features
+        self.assertEqual(len(stations), 8)
+        self.assertEqual(len(stations.sources), 1)
+        self.assertEqual(sorted(set(stations.fid)), sorted(layer.allFeatureIds()))
+        
+        chunks = list(iter_buffered_features(stations, context.station_fields, 3))
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 2])
+        self.assertEqual([f['dist'] for f in chunks[1]], [50.0, 0.0, 25.0])
+    
+    def test_incremental_update(self):
+        """Test an incremental re-run only recomputes changed features."""
+        layer = self.create_line_layer(32633, "utm_test")
+        
+        self.add_line_feature(layer, [(500000, 6000000), (500050, 6000000)])
+        self.add_line_feature(layer, [(500000, 6000100), (500100, 6000100)])
+        self.add_line_feature(layer, [(500000, 6000200), (500050, 6000200)])
+        first, _, third = sorted(layer.allFeatureIds())
+        
+        cache = ChainageCache()
+        
+        def run():
+            return points_along_line(
+                layerout="test_incremental",
+                startpoint=0,
+                endpoint=0,
+                distance=25,
+                layer=layer,
+                selected_only=False,
+                force_last=True,
+                use_ellipsoidal=False,
+                distance_units=QgsUnitTypes.DistanceMeters,
+                cache=cache
+            )
+        
+        # 3 + 5 + 3 points
+        result = run()
+        self.assertEqual(result.points_written, 11)
+        out_layer = result.layer
+        
+        # Lengthen the first line to 100m and delete the third one
+        layer.dataProvider().changeGeometryValues({first: QgsGeometry.fromPolylineXY(
+            [QgsPointXY(500000, 6000000), QgsPointXY(500100, 6000000)])})
+        layer.dataProvider().deleteFeatures([third])
+        
+        result = run()
+        self.assertIs(result.layer, out_layer)
+        self.assertEqual(result.features_processed, 1)
+        self.assertEqual(result.features_reused, 1)
+        self.assertEqual(result.features_removed, 1)
+        self.assertEqual(result.points_written, 5)
+        self.assertEqual(out_layer.featureCount(), 10)
+        self.assertEqual(len(QgsProject.instance().mapLayersByName("test_incremental")), 1)
+        
+        # Nothing changed: every feature is reused
+        result = run()
+        self.assertEqual(result.features_reused, 2)
+        self.assertEqual(result.points_written, 0)
+        self.assertEqual(out_layer.featureCount(), 10)
+        
+        # Clean up
+        QgsProject.instance().removeAllMapLayers()
+
+
+class TestProcessingAlgorithm(TestQChainageSetup):
+    """Test the headless processing algorithm."""
+    
+    def test_algorithm_output(self):
+        """Test the algorithm writes the stations to its feature sink."""
+        layer = self.create_line_layer(32633, "utm_test")
+        self.add_line_feature(layer, [(500000, 6000000), (500100, 6000000)])
+        
+        algorithm = QChainageAlgorithm()
+        algorithm.initAlgorithm()
+        context = QgsProcessingContext()
+        results, ok = algorithm.run({
+            'INPUT': layer,
+            'DISTANCE': 25,
+            'ELLIPSOIDAL': False,
+            'FORCE_LAST': True,
+            'OUTPUT': 'memory:',
+        }, context, QgsProcessingFeedback())
+        
+        self.assertTrue(ok)
+        output = context.getMapLayer(results['OUTPUT'])
+        self.assertEqual([f.attributes()[0] for f in output.getFeatures()],
+                         [0, 25, 50, 75, 100])
+    
+    def test_locate_algorithm(self):
+        """Test points get the route id, chainage and signed offset of the nearest line."""
+        lines = self.create_line_layer(32633, "routes")
+        lines.dataProvider().addAttributes([QgsField("route", QVariant.String)])
+        lines.updateFields()
+        for route, coords in (("A", [(500000, 6000000), (500100, 6000000)]),
+                              ("B", [(500000, 6000050), (500000, 6000150)])):
+            feature = QgsFeature(lines.fields())
+            feature.setGeometry(QgsGeometry.fromPolylineXY(
+                [QgsPointXY(x, y) for x, y in coords]))
+            feature.setAttributes([route])
+            lines.dataProvider().addFeatures([feature])
+        
+        points = QgsVectorLayer("Point?crs=EPSG:32633&field=name:string", "obs", "memory")
+        for name, x, y in (("left of A", 500030, 6000004), ("right of B", 500002, 6000120),
+                           ("far away", 510000, 6100000)):
+            feature = QgsFeature(points.fields())
+            feature.setGeometry(QgsGeometry.fromPointXY(QgsPointXY(x, y)))
+            feature.setAttributes([name])
+            points.dataProvider().addFeatures([feature])
+        
+        algorithm = QChainageLocateAlgorithm()
+        algorithm.initAlgorithm()
+        context = QgsProcessingContext()
+        results, ok = algorithm.run({
+            'INPUT': points,
+            'LINES': lines,
+            'ROUTE_FIELD': 'route',
+            'MAX_DISTANCE': 50,
+            'OUTPUT': 'memory:',
+        }, context, QgsProcessingFeedback())
+        
+        self.assertTrue(ok)
+        output = context.getMapLayer(results['OUTPUT'])
+        located = {f['name']: (f['route_id'], f['cng_meters'], f['offset'])
+                   for f in output.getFeatures()}
+        self.assertEqual(located["left of A"], ("A", 30.0, -4.0))
+        self.assertEqual(located["right of B"], ("B", 70.0, 2.0))
+        self.assertEqual(located["far away"], (NULL, NULL, NULL))
+    
+    def test_events_algorithm(self):
+        """Test events of a table are placed on the line with their route id."""
+        lines = self.create_line_layer(32633, "routes")
+        lines.dataProvider().addAttributes([QgsField("route", QVariant.String)])
+        lines.updateFields()
+        for route, coords in (("A", [(500000, 6000000), (500100, 6000000)]),
+                              ("B", [(500000, 6000050), (500000, 6000150)])):
+            feature = QgsFeature(lines.fields())
+            feature.setGeometry(QgsGeometry.fromPolylineXY(
+                [QgsPointXY(x, y) for x, y in coords]))
+            feature.setAttributes([route])
+            lines.dataProvider().addFeatures([feature])
+        
+        events = QgsVectorLayer("None?field=route:string&field=km:double&field=name:string",
+                                "events", "memory")
+        for route, km, name in (("B", 0.07, "sign"), ("A", 0.03, "gate"),
+                                ("A", 0.01, "drain"), ("A", 0.5, "beyond"),
+                                ("C", 0.01, "no route")):
+            feature = QgsFeature(events.fields())
+            feature.setAttributes([route, km, name])
+            events.dataProvider().addFeatures([feature])
+        
+        algorithm = QChainageEventsAlgorithm()
+        algorithm.initAlgorithm()
+        context = QgsProcessingContext()
+        results, ok = algorithm.run({
+            'INPUT': events,
+            'ROUTE_FIELD': 'route',
+            'MEASURE_FIELD': 'km',
+            'LINES': lines,
+            'LINE_ROUTE_FIELD': 'route',
+            'UNITS': 2,  # kilometers
+            'ELLIPSOIDAL': False,
+            'OUTPUT': 'memory:',
+        }, context, QgsProcessingFeedback())
+        
+        self.assertTrue(ok)
+        output = context.getMapLayer(results['OUTPUT'])
+        self.assertEqual(output.featureCount(), 5)
+        placed = {f['name']: f.geometry() for f in output.getFeatures()}
+        for name, x, y in (("sign", 500000, 6000120), ("gate", 500030, 6000000),
+                           ("drain", 500010, 6000000)):
+            point = placed[name].asPoint()
+            self.assertAlmostEqual(point.x(), x, places=6)
+            self.assertAlmostEqual(point.y(), y, places=6)
+        self.assertTrue(placed["beyond"].isNull())
+        self.assertTrue(placed["no route"].isNull())
+        
+        # A missing field is an error, not the last column
+        results, ok = algorithm.run({
+            'INPUT': events,
+            'ROUTE_FIELD': 'route',
+            'MEASURE_FIELD': 'chainage',
+            'LINES': lines,
+            'OUTPUT': 'memory:',
+        }, QgsProcessingContext(), QgsProcessingFeedback())
+        self.assertFalse(ok)
+
+
+class TestLiveChainage(TestQChainageSetup):
+    """Test the output layer linked to edits of its source layer."""
+    
+    def test_edit_updates_output(self):
+        """Test editing a line only regenerates the stations of that line."""
+        layer = self.create_line_layer(32633, "utm_test")
+        QgsProject.instance().addMapLayer(layer)
+        
+        self.add_line_feature(layer, [(500000, 6000000), (500050, 6000000)])
+        self.add_line_feature(layer, [(500000, 6000100), (500100, 6000100)])
+        first, second = sorted(layer.allFeatureIds())
+        
+        live = LiveChainage("test_live", 0, 0, 25, layer, force_last=True,
+                            use_ellipsoidal=False,
+                            distance_units=QgsUnitTypes.DistanceMeters)
+        live.start()
+        out_layer = live.output_layer
+        self.assertEqual(out_layer.featureCount(), 8)
+        second_points = sorted(f.id() for f in out_layer.getFeatures()
+                               if f.geometry().asPoint().y() > 6000050)
+        
+        # Lengthen the first line to 100m in the edit buffer
+        layer.startEditing()
+        layer.changeGeometry(first, QgsGeometry.fromPolylineXY(
+            [QgsPointXY(500000, 6000000), QgsPointXY(500100, 6000000)]))
+        self.assertEqual(live.cache.dirty, {first})
+        
+        # Applied by the debounce timer; call it directly without an event loop
+        live.update()
+        self.assertEqual(out_layer.featureCount(), 10)
+        self.assertEqual(live.cache.dirty, set())
+        # The points of the untouched line are kept
+        self.assertEqual(sorted(f.id() for f in out_layer.getFeatures()
+                                if f.geometry().asPoint().y() > 6000050), second_points)
+        
+        # Deleting the second line removes its points
+        layer.deleteFeature(second)
+        live.update()
+        self.assertEqual(out_layer.featureCount(), 5)
+        
+        layer.rollBack()
+        live.stop()
+        self.assertFalse(live.active)
+        
+        # Clean up
+        QgsProject.instance().removeAllMapLayers()
+
+
+class TestVirtualChainage(TestQChainageSetup):
+    """Test the chainage layer computed on the fly per extent."""
+    
+    def test_stations_in_extent(self):
+        """Test only the stations inside the requested rectangle are returned."""
+        layer = self.create_line_layer(32633, "utm_test")
+        QgsProject.instance().addMapLayer(layer)
+        
+        self.add_line_feature(layer, [(500000, 6000000), (500100, 6000000)])
+        self.add_line_feature(layer, [(500000, 6001000), (500100, 6001000)])
+        
+        virtual = create_virtual_layer("test_virtual", 0, 0, 25, layer,
+                                       force_last=True, use_ellipsoidal=False,
+                                       distance_units=QgsUnitTypes.DistanceMeters)
+        self.assertTrue(virtual.isValid())
+        self.assertEqual(virtual.wkbType(), QgsWkbTypes.Point)
+        
+        # All stations of both lines without a filter
+        self.assertEqual(len(list(virtual.getFeatures())), 10)
+        
+        # Only the stations of the first line, between 20 and 60 m
+        request = QgsFeatureRequest().setFilterRect(
+            QgsRectangle(500020, 5999990, 500060, 6000010))
+        features = list(virtual.getFeatures(request))
+        self.assertEqual(sorted(f['cng_meters'] for f in features), [25.0, 50.0])
+        
+        # Station ids are stable, so a feature can be fetched again by id
+        fid = features[0].id()
+        again = next(virtual.getFeatures(QgsFeatureRequest(fid)))
+        self.assertEqual(again['cng_meters'], features[0]['cng_meters'])
+        
+        # Editing the source layer drops the cached stations
+        layer.startEditing()
+        layer.changeGeometry(min(layer.allFeatureIds()), QgsGeometry.fromPolylineXY(
+            [QgsPointXY(500000, 6000000), QgsPointXY(500200, 6000000)]))
+        self.assertEqual(len(list(virtual.getFeatures())), 14)
+        layer.rollBack()
+        
+        # Clean up
+        QgsProject.instance().removeAllMapLayers()
+
+
+class TestRouteIndex(TestQChainageSetup):
+    """Test measure and point lookups along a route."""
+    
+    def setUp(self):
+        # 100m east, then 50m north
+        self.geometry = QgsGeometry.fromPolylineXY([
+            QgsPointXY(500000, 6000000), QgsPointXY(500100, 6000000),
+            QgsPointXY(500100, 6000050)])
+        self.route = RouteIndex(self.geometry)
+    
+    def test_point_at(self):
+        """Test points match the stations of create_points."""
+        self.assertEqual(self.route.length, 150)
+        self.assertEqual(self.route.point_at(125), QgsPointXY(500100, 6000025))
+        self.assertIsNone(self.route.point_at(151))
+        
+        context = ChainageContext(self.geometry_crs(), use_ellipsoidal=False)
+        for feature in create_points(0, 0, 30, self.geometry, False, False, 0,
+                                     context=context):
+            point = self.route.point_at(feature.attributes()[0])
+            station = feature.geometry().asPoint()
+            self.assertAlmostEqual(point.x(), station.x())
+            self.assertAlmostEqual(point.y(), station.y())
+    
+    def test_measure_and_bearing(self):
+        """Test measure, offset and bearing of the route."""
+        measure, offset = self.route.locate(QgsPointXY(500103, 6000020))
+        self.assertAlmostEqual(measure, 120)
+        self.assertAlmostEqual(offset, 3)
+        self.assertAlmostEqual(self.route.measure_at(QgsPointXY(500040, 6000010)), 40)
+        self.assertAlmostEqual(self.route.bearing_at(50), 90)
+        self.assertAlmostEqual(self.route.bearing_at(120), 0)
+    
+    def test_substring(self):
+        """Test substrings between two measures, in both directions."""
+        self.assertEqual(self.route.substring(50, 125).asWkt(),
+                         "LineString (500050 6000000, 500100 6000000, 500100 6000025)")
+        self.assertEqual(self.route.substring(125, 50).asWkt(),
+                         "LineString (500100 6000025, 500100 6000000, 500050 6000000)")
+        self.assertTrue(self.route.substring(200, 300).isEmpty())
+    
+    def test_geodesic_measures(self):
+        """Test measures follow the ellipsoid with a distance calculator."""
+        distance_area = setup_distance_calculator(self.geometry_crs(), True)
+        route = RouteIndex(self.geometry, distance_area)
+        self.assertAlmostEqual(route.length, distance_area.measureLength(self.geometry),
+                               places=6)
+        self.assertAlmostEqual(route.measure_at(route.point_at(70)), 70, places=6)
+    
+    def test_event_stations(self):
+        """Test events are placed like the stations of create_points."""
+        context = ChainageContext(self.geometry_crs(), use_ellipsoidal=False)
+        stations = create_points(0, 0, 40, self.geometry, True, False, 0,
+                                 reverse=True, context=context)
+        measures = [feature.attributes()[0] for feature in stations]
+        points = event_stations(context, measures + [151], self.geometry, reverse=True)
+        
+        self.assertIsNone(points[-1])
+        for feature, (x, y) in zip(stations, points):
+            station = feature.geometry().asPoint()
+            self.assertAlmostEqual(x, station.x())
+            self.assertAlmostEqual(y, station.y())
+    
+    def geometry_crs(self):
+        return QgsCoordinateReferenceSystem("EPSG:32633")
 
 
 def run_tests():
@@ -540,6 +1090,10 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestProjectionModes))
     suite.addTests(loader.loadTestsFromTestCase(TestStartEndPoints))
     suite.addTests(loader.loadTestsFromTestCase(TestMultipleFeatures))
+    suite.addTests(loader.loadTestsFromTestCase(TestProcessingAlgorithm))
+    suite.addTests(loader.loadTestsFromTestCase(TestLiveChainage))
+    suite.addTests(loader.loadTestsFromTestCase(TestVirtualChainage))
+    suite.addTests(loader.loadTestsFromTestCase(TestRouteIndex))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)